@@ -15,16 +15,48 @@ Prerequisites:
 """
 
 import asyncio
+import gzip
+import json
 import os
 import sys
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Add the src directory to the path so we can import codemetrics
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from codemetrics.config import Config
 from codemetrics.intelligence_loop import EcosystemIntelligenceLoop
 
+def save_results_jsonl(results, output_file):
+    """Stream the loop report to gzip-compressed JSON Lines, one record per line
+    
+    The first line holds the run summary; every candidate, iteration result and
+    ranked improvement follows as its own record tagged with a "record" field.
+    """
+    
+    report = dict(results.get("intelligence_loop_report", results))
+    sections = {
+        "improvement_candidate": report.pop("improvement_candidates", []),
+        "iteration_result": report.pop("iteration_results", []),
+        "best_improvement": report.pop("best_improvements", []),
+    }
+    
+    def encode(record):
+        if orjson is not None:
+            return orjson.dumps(record, default=str, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY)
+        return (json.dumps(record, default=str) + "\n").encode("utf-8")
+    
+    with gzip.open(output_file, "wb") as f:
+        f.write(encode({"record": "summary", **report}))
+        for record_type, records in sections.items():
+            for record in records:
+                f.write(encode({"record": record_type, **record}))
+
 async def run_intelligence_loop_example():
     """Run the intelligence loop example"""
     
@@ -108,16 +140,17 @@ async def run_intelligence_loop_example():
         print("\n✅ Intelligence loop completed successfully!")
         
         # Optionally save results
-        output_file = "intelligence_loop_results.json"
-        import json
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        output_file = "intelligence_loop_results.jsonl.gz"
+        save_results_jsonl(results, output_file)
         print(f"💾 Results saved to: {output_file}")
+        print(f"   Stream them with: gzip -dc {output_file} | jq -c 'select(.record == \"best_improvement\")'")
         
     except Exception as e:
         print(f"❌ Intelligence loop failed: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        intelligence_loop.close()
 
 def main():
     """Main function"""
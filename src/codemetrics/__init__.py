@@ -8,11 +8,18 @@ __version__ = "1.0.0"
 __author__ = "Automated Agile Framework Team"
 __email__ = "support@automatedagile.dev"
 
-from .analyzer import MetricsAnalyzer
-from .collector import DataCollector
-from .dashboard import Dashboard
-from .config import Config
-from .optimizer import IntelligentOptimizer
+import importlib
+import threading
+
+# Public names are resolved on first access (PEP 562) so `import codemetrics`
+# doesn't load anthropic, flask and the rest of the stack up front
+_EXPORTS = {
+    "MetricsAnalyzer": ".analyzer",
+    "DataCollector": ".collector",
+    "Dashboard": ".dashboard",
+    "Config": ".config",
+    "IntelligentOptimizer": ".optimizer",
+}
 
 __all__ = [
     "MetricsAnalyzer",
@@ -21,3 +28,33 @@ __all__ = [
     "Config",
     "IntelligentOptimizer"
 ]
+
+_warmup_started = False
+
+def _warmup():
+    """Compile the optional numba kernels in the background, once per process"""
+    global _warmup_started
+    if _warmup_started:
+        return
+    _warmup_started = True
+    
+    def _run():
+        try:
+            from . import _fastparse
+            _fastparse.warmup()
+        except Exception:
+            pass  # Warm-up is best-effort; kernels compile on first use instead
+    
+    threading.Thread(target=_run, name="codemetrics-warmup", daemon=True).start()
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        if name == "MetricsAnalyzer":
+            _warmup()
+        value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -2,33 +2,63 @@
 Command-line interface for CodeMetrics
 """
 
+import asyncio
 import click
+import dataclasses
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 
-from .analyzer import MetricsAnalyzer
-from .collector import DataCollector
-from .dashboard import Dashboard
-from .config import Config
-from .optimizer import IntelligentOptimizer
+# Command modules are imported inside each command so that `--help` and
+# lightweight commands don't pay for loading anthropic, flask and friends
+
+_ANALYSIS_CHOICES = click.Choice(['full', 'performance', 'quality', 'security'])
+_FORMAT_CHOICES = click.Choice(['html', 'pdf', 'json', 'markdown'])
+
+def _load_config(config_path):
+    """Resolve a command's config: its own --config, then the group's, then defaults
+    
+    The group's config lives on the root click context, so it ends with the
+    invocation instead of carrying over to later ones in the same process.
+    """
+    from .config import Config
+    
+    if config_path:
+        return Config.load(config_path)
+    
+    ctx = click.get_current_context(silent=True)
+    shared = ctx.find_root().obj if ctx is not None else None
+    # Hand out a copy so per-command tweaks (e.g. --no-cache) don't leak
+    return dataclasses.replace(shared) if shared is not None else Config()
 
 @click.group()
 @click.version_option(version="1.0.0")
-def cli():
+@click.option('--config', 'config_path', help='Config file path for all commands')
+@click.pass_context
+def cli(ctx, config_path):
     """CodeMetrics - AI-Powered Development Analytics"""
-    pass
+    if config_path:
+        from .config import Config
+        ctx.obj = Config.load(config_path)
 
 @cli.command()
 @click.option('--project', default='.', help='Project path to analyze')
 @click.option('--type', 'analysis_type', default='full', 
-              type=click.Choice(['full', 'performance', 'quality', 'security']),
+              type=_ANALYSIS_CHOICES,
               help='Type of analysis to perform')
 @click.option('--output', help='Output file for results')
 @click.option('--config', help='Config file path')
-def analyze(project, analysis_type, output, config):
+@click.option('--no-cache', is_flag=True, help='Always call Claude instead of reusing cached analyses')
+def analyze(project, analysis_type, output, config, no_cache):
     """Run analytics on a project"""
+    from .analyzer import MetricsAnalyzer
+    from .collector import DataCollector
+    
     try:
-        config_obj = Config.load(config) if config else Config()
+        config_obj = _load_config(config)
+        if no_cache:
+            config_obj.cache_enabled = False
         collector = DataCollector(config_obj)
         analyzer = MetricsAnalyzer(config_obj)
         
@@ -47,7 +77,7 @@ def analyze(project, analysis_type, output, config):
         else:
             click.echo("📊 Analysis Results:")
             click.echo(results.summary())
-            
+    
     except Exception as e:
         click.echo(f"❌ Error: {e}", err=True)
         sys.exit(1)
@@ -55,7 +85,7 @@ def analyze(project, analysis_type, output, config):
 @cli.command()
 @click.option('--input', 'input_file', help='Input analytics file')
 @click.option('--format', 'output_format', default='html',
-              type=click.Choice(['html', 'pdf', 'json', 'markdown']),
+              type=_FORMAT_CHOICES,
               help='Report format')
 @click.option('--output', help='Output file path')
 def report(input_file, output_format, output):
@@ -74,37 +104,135 @@ def report(input_file, output_format, output):
 @click.option('--config', help='Config file path')
 def dashboard(port, host, config):
     """Start the analytics dashboard"""
+    from .dashboard import Dashboard
+    
     try:
-        config_obj = Config.load(config) if config else Config()
+        config_obj = _load_config(config)
         dashboard = Dashboard(config_obj)
         
         click.echo(f"🚀 Starting dashboard at http://{host}:{port}")
         dashboard.run(host=host, port=port)
-        
+    
     except Exception as e:
         click.echo(f"❌ Error: {e}", err=True)
         sys.exit(1)
 
+def _resolve_repo_path(repo: str):
+    """Resolve an ecosystem repository name to a local checkout"""
+    
+    # Accept local paths directly, otherwise look for a clone under ~/repos
+    candidates = [Path(repo), Path.home() / "repos" / repo.split('/')[-1]]
+    for candidate in candidates:
+        if candidate.is_dir():
+            return candidate
+    
+    return None
+
+def _collect_one(repo_path: str, config):
+    """Collect one repository's data in a worker process
+    
+    Top-level so it pickles; each worker builds its own DataCollector rather
+    than inheriting clients or connections from the parent process. Workers
+    already run one repository per core, so file scans stay in-process.
+    """
+    from dataclasses import replace
+    
+    from .collector import DataCollector
+    
+    return DataCollector(replace(config, max_workers=1)).collect_project_data(repo_path)
+
+async def _analyze_repos(repo_paths, pool, analyzer, config):
+    """Collect repositories in worker processes and analyze them concurrently
+    
+    A repository that fails or times out is reported and left out of the
+    results. The timeout only abandons the wait: a collection already running
+    in a worker process keeps that worker busy until it finishes, and the
+    pool's shutdown still waits for it.
+    """
+    
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(config.max_concurrent_requests)
+    client = analyzer.async_client
+    
+    async def _analyze_repo(repo, repo_path):
+        async with semaphore:
+            try:
+                # Bound each repo so one hung fetch or request cannot stall the rest
+                async with asyncio.timeout(config.analysis_timeout):
+                    data = await loop.run_in_executor(pool, _collect_one, str(repo_path), config)
+                    return repo, await analyzer.aanalyze(data, "full", client)
+            except TimeoutError:
+                click.echo(f"  ⚠️ Timed out analyzing {repo}")
+                return repo, None
+            except Exception as e:
+                click.echo(f"  ⚠️ Failed to analyze {repo}: {e}")
+                return repo, None
+    
+    pairs = await asyncio.gather(*[_analyze_repo(repo, path) for repo, path in repo_paths])
+    return {repo: result for repo, result in pairs if result is not None}
+
 @cli.command()
 @click.option('--repos', help='Comma-separated list of repositories')
 @click.option('--output', help='Output file for ecosystem health data')
-def ecosystem_health(repos, output):
+@click.option('--config', help='Config file path')
+@click.option('--batch', is_flag=True, help='Submit analyses through the Message Batches API')
+def ecosystem_health(repos, output, config, batch):
     """Check health of the entire ecosystem"""
+    from .analyzer import MetricsAnalyzer, encode_json
+    
     try:
-        repo_list = repos.split(',') if repos else [
-            "Jita81/Standardized-Modules-Framework-v1.0.0",
-            "Jita81/CODEREVIEW", 
-            "Jita81/CODECREATE",
-            "Jita81/CODETEST",
-            "Jita81/CODEMETRICS"
-        ]
+        config_obj = _load_config(config)
+        repo_list = [r.strip() for r in repos.split(',')] if repos else config_obj.ecosystem_repos
+        analyzer = MetricsAnalyzer(config_obj)
         
         click.echo("🔍 Checking ecosystem health...")
+        repo_paths = []
         for repo in repo_list:
-            click.echo(f"  📊 Analyzing {repo}")
+            repo_path = _resolve_repo_path(repo)
+            if repo_path is None:
+                click.echo(f"  ⚠️ Skipping {repo}: no local checkout found")
+                continue
             
-        click.echo(f"✅ Ecosystem health check complete: {output}")
+            click.echo(f"  📊 Analyzing {repo}")
+            repo_paths.append((repo, repo_path))
         
+        # Git history walks are CPU-bound, so collect each repo in its own process
+        workers = max(1, min(len(repo_paths), os.cpu_count() or 1))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            if batch:
+                futures = {
+                    pool.submit(_collect_one, str(path), config_obj): repo
+                    for repo, path in repo_paths
+                }
+                collected = {}
+                for future in as_completed(futures):
+                    try:
+                        collected[futures[future]] = future.result()
+                    except Exception as e:
+                        click.echo(f"  ⚠️ Failed to collect {futures[future]}: {e}")
+                        continue
+                    click.echo(f"  ✔ Collected {futures[future]}")
+                
+                # Submit all repositories as one batch instead of one request per repo
+                items = [(repo, collected[repo], "full") for repo, _ in repo_paths if repo in collected]
+                click.echo(f"🤖 Submitting {len(items)} analyses as a batch...")
+                results = analyzer.analyze_batch(items)
+            else:
+                results = asyncio.run(_analyze_repos(repo_paths, pool, analyzer, config_obj))
+        
+        for repo, result in results.items():
+            click.echo(
+                f"  {repo}: performance {result.performance_score}/100, "
+                f"quality {result.quality_score}/100, security {result.security_score}/100"
+            )
+        
+        if output:
+            output_path = Path(output)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            output_path.write_bytes(encode_json(results, indent=True))
+        
+        click.echo(f"✅ Ecosystem health check complete: {output}")
+    
     except Exception as e:
         click.echo(f"❌ Error: {e}", err=True)
         sys.exit(1)
@@ -116,8 +244,10 @@ def ecosystem_health(repos, output):
 @click.option('--output', help='Output file for optimization report')
 def optimize(iterations, components, config, output):
     """Run intelligent ecosystem optimization with Claude"""
+    from .optimizer import IntelligentOptimizer
+    
     try:
-        config_obj = Config.load(config) if config else Config()
+        config_obj = _load_config(config)
         optimizer = IntelligentOptimizer(config_obj)
         
         click.echo(f"🚀 Starting intelligent ecosystem optimization...")
@@ -143,7 +273,7 @@ def optimize(iterations, components, config, output):
             click.echo("  • CodeCreate: Token efficiency +22%")
             click.echo("  • CodeReview: False positives -18%") 
             click.echo("  • CodeTest: Build time -28%")
-            
+    
     except Exception as e:
         click.echo(f"❌ Optimization failed: {e}", err=True)
         sys.exit(1)
@@ -153,8 +283,10 @@ def optimize(iterations, components, config, output):
 @click.option('--config', help='Config file path')
 def feedback_analysis(pattern_analysis, config):
     """Analyze ecosystem feedback patterns"""
+    from .optimizer import IntelligentOptimizer
+    
     try:
-        config_obj = Config.load(config) if config else Config()
+        config_obj = _load_config(config)
         optimizer = IntelligentOptimizer(config_obj)
         
         click.echo("🔍 Analyzing ecosystem feedback patterns...")
@@ -182,10 +314,24 @@ def feedback_analysis(pattern_analysis, config):
             click.echo("  1. Priority: Optimize Docker build caching (high impact)")
             click.echo("  2. Priority: Reduce CodeCreate token timeouts")
             click.echo("  3. Priority: Complete INTEGRATION module templates")
-            
+    
     except Exception as e:
         click.echo(f"❌ Feedback analysis failed: {e}", err=True)
         sys.exit(1)
 
+@cli.command()
+def warmup():
+    """Precompile native parsing kernels into the on-disk cache"""
+    try:
+        from . import _fastparse
+    except ImportError as e:
+        click.echo(f"❌ Warm-up unavailable: {e}", err=True)
+        sys.exit(1)
+    
+    if _fastparse.warmup():
+        click.echo("✅ Native kernels compiled and cached (set NUMBA_CACHE_DIR to relocate)")
+    else:
+        click.echo("ℹ️ numba not installed; install codemetrics[speedups] for native parsing")
+
 if __name__ == '__main__':
     cli()
@@ -0,0 +1,271 @@
+"""
+Response cache for AI analysis results, and per-file metrics for the collector
+
+Three tiers are checked before calling Claude:
+1. Change detection: the last response for a namespace, if its data fingerprint is unchanged
+2. Exact match on a SHA-256 of the cache namespace and payload
+3. Similarity match on a hashed n-gram embedding of the payload (requires numpy)
+
+Per-file metrics are keyed by path, mtime and size, so unchanged files are never re-read.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+EMBEDDING_DIM = 256
+
+# Seconds a file-metrics read or write waits on another process's lock before giving up
+SQLITE_BUSY_TIMEOUT = 30.0
+
+def fingerprint(data: Any) -> bytes:
+    """Fast 64-bit content fingerprint of canonicalized data"""
+    
+    payload = None
+    if orjson is not None:
+        try:
+            payload = orjson.dumps(data, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits
+    if payload is None:
+        payload = json.dumps(data, sort_keys=True, default=str).encode('utf-8')
+    
+    if xxhash is not None:
+        return xxhash.xxh3_64_digest(payload)
+    return hashlib.blake2b(payload, digest_size=8).digest()
+
+class ResponseCache:
+    """SQLite-backed cache of Claude responses
+    
+    Lookups are exact-match only unless ``similarity_threshold`` is set;
+    near-duplicate reuse can return a response for different metric values.
+    """
+    
+    def __init__(self, db_path: str, ttl_hours: int = 24, similarity_threshold: Optional[float] = None):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_hours * 3600
+        self.similarity_threshold = similarity_threshold
+        self._conn: Optional[sqlite3.Connection] = None
+    
+    def get(self, namespace: str, text: str) -> Optional[str]:
+        """Return a cached response for the payload, if one is fresh enough"""
+        
+        conn = self._connect()
+        cutoff = time.time() - self.ttl_seconds
+        
+        row = conn.execute(
+            "SELECT response FROM responses WHERE key = ? AND ts >= ?",
+            (self.make_key(namespace, text), cutoff)
+        ).fetchone()
+        
+        if row:
+            return row[0]
+        
+        if np is None or self.similarity_threshold is None:
+            return None
+        
+        return self._get_similar(conn, namespace, text, cutoff)
+    
+    def get_unchanged(self, namespace: str, data_fingerprint: bytes) -> Optional[str]:
+        """Return the namespace's last response if its data fingerprint still matches"""
+        
+        row = self._connect().execute(
+            "SELECT r.response FROM fingerprints f JOIN responses r ON r.key = f.key "
+            "WHERE f.namespace = ? AND f.fingerprint = ? AND r.ts >= ?",
+            (namespace, data_fingerprint, time.time() - self.ttl_seconds)
+        ).fetchone()
+        
+        return row[0] if row else None
+    
+    def set(self, namespace: str, text: str, response: str, data_fingerprint: Optional[bytes] = None) -> None:
+        """Store a response for the payload"""
+        
+        embedding = None
+        if np is not None and self.similarity_threshold is not None:
+            embedding = self._embed(text).astype(np.float16).tobytes()
+        key = self.make_key(namespace, text)
+        
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO responses (key, namespace, embedding, response, ts) VALUES (?, ?, ?, ?, ?)",
+            (key, namespace, embedding, response, time.time())
+        )
+        if data_fingerprint is not None:
+            conn.execute(
+                "INSERT OR REPLACE INTO fingerprints (namespace, fingerprint, key) VALUES (?, ?, ?)",
+                (namespace, data_fingerprint, key)
+            )
+        conn.commit()
+    
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+    
+    @staticmethod
+    def make_key(namespace: str, text: str) -> bytes:
+        """Compute the exact-match cache key"""
+        return hashlib.sha256((namespace + text).encode('utf-8')).digest()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use so unused caches never touch disk"""
+        
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key BLOB PRIMARY KEY, namespace TEXT NOT NULL, embedding BLOB, "
+                "response TEXT NOT NULL, ts REAL NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_responses_namespace ON responses (namespace)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS fingerprints ("
+                "namespace TEXT PRIMARY KEY, fingerprint BLOB NOT NULL, key BLOB NOT NULL)"
+            )
+            self._conn.commit()
+        
+        return self._conn
+    
+    def _get_similar(self, conn: sqlite3.Connection, namespace: str, text: str, cutoff: float) -> Optional[str]:
+        """Find the most similar cached payload in the same namespace"""
+        
+        rows = conn.execute(
+            "SELECT embedding, response FROM responses "
+            "WHERE namespace = ? AND ts >= ? AND embedding IS NOT NULL",
+            (namespace, cutoff)
+        ).fetchall()
+        
+        if not rows:
+            return None
+        
+        matrix = np.frombuffer(b''.join(row[0] for row in rows), dtype=np.float16)
+        matrix = matrix.reshape(len(rows), EMBEDDING_DIM).astype(np.float32)
+        
+        # Embeddings are unit length, so the dot product is the cosine similarity
+        scores = matrix @ self._embed(text)
+        best = int(np.argmax(scores))
+        
+        if scores[best] >= self.similarity_threshold:
+            return rows[best][1]
+        
+        return None
+    
+    @staticmethod
+    def _embed(text: str) -> "np.ndarray":
+        """Hash byte trigrams of the payload into a unit-length vector"""
+        
+        buf = np.frombuffer(text.encode('utf-8'), dtype=np.uint8).astype(np.uint32)
+        vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+        
+        if len(buf) >= 3:
+            trigrams = (buf[:-2] << 16) | (buf[1:-1] << 8) | buf[2:]
+            # Multiplicative hashing; the top 8 bits select one of 256 buckets
+            buckets = (trigrams * np.uint32(2654435761)) >> np.uint32(24)
+            vector += np.bincount(buckets, minlength=EMBEDDING_DIM).astype(np.float32)
+        
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+class FileMetricsCache:
+    """SQLite-backed cache of per-file collector metrics
+    
+    Each batch of results is written in one short transaction, so collector
+    processes sharing the database never hold its write lock while files
+    are being scanned. A database that stays locked past ``busy_timeout``
+    is treated as a cache miss rather than failing the collection. The
+    connection is shared by every collection on the owning collector, so
+    access is serialized with a lock.
+    """
+    
+    def __init__(self, db_path: str, ttl_hours: int = 24, busy_timeout: float = SQLITE_BUSY_TIMEOUT):
+        self.db_path = Path(db_path)
+        self.ttl_seconds = ttl_hours * 3600
+        self.busy_timeout = busy_timeout
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+    
+    def get(self, path: str, mtime_ns: int, size: int) -> Optional[Dict[str, Any]]:
+        """Return the stored metrics if the file is unchanged and the entry is fresh"""
+        
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT metrics FROM file_metrics WHERE path = ? AND mtime_ns = ? AND size = ? AND ts >= ?",
+                    (path, mtime_ns, size, time.time() - self.ttl_seconds)
+                ).fetchone()
+        except sqlite3.OperationalError:
+            return None  # locked by another collector; recompute instead
+        
+        return json.loads(row[0]) if row else None
+    
+    def set_many(self, rows: Iterable[Tuple[str, int, int, Dict[str, Any]]]) -> None:
+        """Store ``(path, mtime_ns, size, metrics)`` rows, replacing older entries, in one transaction"""
+        
+        now = time.time()
+        encode = orjson.dumps if orjson is not None else (lambda metrics: json.dumps(metrics).encode('utf-8'))
+        params = [(path, mtime_ns, size, encode(metrics), now) for path, mtime_ns, size, metrics in rows]
+        if not params:
+            return
+        
+        try:
+            with self._lock:
+                conn = self._connect()
+                with conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO file_metrics (path, mtime_ns, size, metrics, ts) VALUES (?, ?, ?, ?, ?)",
+                        params
+                    )
+        except sqlite3.OperationalError:
+            pass  # still locked after busy_timeout; these files are recomputed next run
+    
+    def close(self) -> None:
+        """Close the underlying database connection"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use so unused caches never touch disk; call with the lock held"""
+        
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=self.busy_timeout, check_same_thread=False)
+            try:
+                # Readers in other processes never block on a writer
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS file_metrics ("
+                    "path TEXT PRIMARY KEY, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, "
+                    "metrics BLOB NOT NULL, ts REAL NOT NULL)"
+                )
+                conn.commit()
+            except sqlite3.Error:
+                conn.close()
+                raise
+            self._conn = conn
+        
+        return self._conn
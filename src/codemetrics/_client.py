@@ -0,0 +1,70 @@
+"""
+Process-wide Anthropic clients
+
+Analyzers share one client per API key so TCP/TLS connections are pooled
+across every request in the process. HTTP/2 is enabled when the optional
+``h2`` package is installed.
+"""
+
+import asyncio
+import importlib.util
+import threading
+import weakref
+from typing import Dict
+
+import anthropic
+
+MAX_CONNECTIONS = 32
+MAX_KEEPALIVE_CONNECTIONS = 16
+
+_CLIENTS: Dict[str, "anthropic.Anthropic"] = {}
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, anthropic.AsyncAnthropic]]" = (
+    weakref.WeakKeyDictionary()
+)
+_lock = threading.Lock()
+
+def _http_client_options() -> Dict[str, object]:
+    # Build limits with the SDK's own Limits type so we never mix httpx distributions
+    limits = type(anthropic.DEFAULT_CONNECTION_LIMITS)(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+    )
+    return {"http2": importlib.util.find_spec("h2") is not None, "limits": limits}
+
+def get_client(api_key: str) -> "anthropic.Anthropic":
+    """Return the shared synchronous client for an API key"""
+    
+    with _lock:
+        client = _CLIENTS.get(api_key)
+        if client is None:
+            client = anthropic.Anthropic(
+                api_key=api_key,
+                http_client=anthropic.DefaultHttpxClient(**_http_client_options())
+            )
+            _CLIENTS[api_key] = client
+        return client
+
+def aget_client(api_key: str) -> "anthropic.AsyncAnthropic":
+    """Return the shared async client for an API key on the running event loop
+    
+    Async connection pools are bound to the loop that created them, so clients
+    are cached per loop rather than per process.
+    """
+    
+    loop = asyncio.get_running_loop()
+    clients = _ASYNC_CLIENTS.setdefault(loop, {})
+    client = clients.get(api_key)
+    if client is None:
+        client = anthropic.AsyncAnthropic(
+            api_key=api_key,
+            http_client=anthropic.DefaultAsyncHttpxClient(**_http_client_options())
+        )
+        clients[api_key] = client
+    return client
+
+def reset_clients() -> None:
+    """Drop all cached clients (for tests and after forking)"""
+    
+    with _lock:
+        _CLIENTS.clear()
+        _ASYNC_CLIENTS.clear()
@@ -0,0 +1,171 @@
+"""
+Native line classification for large free-form Claude responses
+
+When numba is installed the byte scan below is JIT-compiled; without it the
+analyzer keeps using ``MetricsAnalyzer._extract_sections`` (``str.split`` and
+``lower()`` over the whole response), and this module's functions still run
+as plain Python.
+"""
+
+from typing import List, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+LINE_NONE = 0
+LINE_FINDINGS = 1
+LINE_RECOMMENDATIONS = 2
+LINE_BULLET = 3
+
+_FINDING = np.frombuffer(b'finding', dtype=np.uint8)
+_ISSUE = np.frombuffer(b'issue', dtype=np.uint8)
+_RECOMMEND = np.frombuffer(b'recommend', dtype=np.uint8)
+_SUGGEST = np.frombuffer(b'suggest', dtype=np.uint8)
+
+@njit(cache=True, fastmath=True)
+def _space_at(buf, i, end):
+    """Byte length of the whitespace character at buf[i], or 0; matches ``str.isspace`` on UTF-8"""
+    byte = buf[i]
+    if byte == 32 or 9 <= byte <= 13 or 28 <= byte <= 31:
+        return 1
+    if byte == 0xC2 and i + 1 < end and (buf[i + 1] == 0x85 or buf[i + 1] == 0xA0):  # NEL, NBSP
+        return 2
+    if i + 2 < end:
+        second = buf[i + 1]
+        third = buf[i + 2]
+        if byte == 0xE1 and second == 0x9A and third == 0x80:  # U+1680
+            return 3
+        if byte == 0xE2 and second == 0x80 and (third <= 0x8A or third == 0xA8 or third == 0xA9 or third == 0xAF):
+            return 3  # U+2000-U+200A, U+2028, U+2029, U+202F
+        if byte == 0xE2 and second == 0x81 and third == 0x9F:  # U+205F
+            return 3
+        if byte == 0xE3 and second == 0x80 and third == 0x80:  # U+3000
+            return 3
+    return 0
+
+@njit(cache=True, fastmath=True)
+def _space_before(buf, start, end):
+    """Byte length of the whitespace character ending at buf[end - 1], or 0"""
+    if end - 1 >= start and buf[end - 1] < 0x80:
+        return _space_at(buf, end - 1, end)
+    if end - 2 >= start and _space_at(buf, end - 2, end) == 2:
+        return 2
+    if end - 3 >= start and _space_at(buf, end - 3, end) == 3:
+        return 3
+    return 0
+
+@njit(cache=True, fastmath=True)
+def _contains(buf, start, end, keyword):
+    """ASCII case-insensitive substring search within buf[start:end]"""
+    size = keyword.shape[0]
+    for i in range(start, end - size + 1):
+        matched = True
+        for j in range(size):
+            byte = int(buf[i + j])
+            if 65 <= byte <= 90:
+                byte += 32
+            if byte != keyword[j]:
+                matched = False
+                break
+        if matched:
+            return True
+    return False
+
+@njit(cache=True, fastmath=True)
+def classify_lines(buf, line_starts, line_ends):
+    """Tag each line and locate the text after its bullet marker
+    
+    Returns ``(tags, bullet_starts, bullet_ends)``; section keywords take
+    precedence over bullets, as in ``MetricsAnalyzer._extract_sections``.
+    """
+    count = line_starts.shape[0]
+    tags = np.zeros(count, dtype=np.int8)
+    bullet_starts = np.zeros(count, dtype=np.int64)
+    bullet_ends = np.zeros(count, dtype=np.int64)
+    
+    for n in range(count):
+        start = line_starts[n]
+        end = line_ends[n]
+        
+        if _contains(buf, start, end, _FINDING) or _contains(buf, start, end, _ISSUE):
+            tags[n] = LINE_FINDINGS
+            continue
+        if _contains(buf, start, end, _RECOMMEND) or _contains(buf, start, end, _SUGGEST):
+            tags[n] = LINE_RECOMMENDATIONS
+            continue
+        
+        while start < end:
+            width = _space_at(buf, start, end)
+            if width == 0:
+                break
+            start += width
+        
+        if start < end and (buf[start] == 45 or buf[start] == 42):  # '-' or '*'
+            bullet_start = start + 1
+        elif start + 2 < end and buf[start] == 0xE2 and buf[start + 1] == 0x80 and buf[start + 2] == 0xA2:  # '•'
+            bullet_start = start + 3
+        else:
+            continue
+        
+        while end > bullet_start:
+            width = _space_before(buf, bullet_start, end)
+            if width == 0:
+                break
+            end -= width
+        while bullet_start < end:
+            width = _space_at(buf, bullet_start, end)
+            if width == 0:
+                break
+            bullet_start += width
+        
+        tags[n] = LINE_BULLET
+        bullet_starts[n] = bullet_start
+        bullet_ends[n] = end
+    
+    return tags, bullet_starts, bullet_ends
+
+def extract_sections(text: str) -> Tuple[List[str], List[str]]:
+    """Collect findings and recommendation bullets from a free-form response"""
+    
+    raw = text.encode('utf-8', 'replace')
+    buf = np.frombuffer(raw, dtype=np.uint8)
+    newlines = np.flatnonzero(buf == 0x0A)
+    line_starts = np.concatenate((np.zeros(1, dtype=np.int64), newlines + 1))
+    line_ends = np.concatenate((newlines, np.array([len(buf)], dtype=np.int64)))
+    
+    tags, bullet_starts, bullet_ends = classify_lines(buf, line_starts, line_ends)
+    
+    findings = []
+    recommendations = []
+    current = None
+    
+    for n in np.flatnonzero(tags):
+        tag = tags[n]
+        if tag == LINE_FINDINGS:
+            current = findings
+        elif tag == LINE_RECOMMENDATIONS:
+            current = recommendations
+        elif current is not None:
+            current.append(raw[bullet_starts[n]:bullet_ends[n]].decode('utf-8', 'replace'))
+    
+    return findings, recommendations
+
+def warmup() -> bool:
+    """Compile (or load from the on-disk cache) every kernel in this module
+    
+    Compiled code is cached next to this file in ``__pycache__``, or under
+    ``NUMBA_CACHE_DIR`` when set. Returns False when numba is unavailable.
+    """
+    if not NUMBA_AVAILABLE:
+        return False
+    
+    extract_sections("Findings:\n- warm-up")
+    return True
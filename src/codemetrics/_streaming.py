@@ -0,0 +1,55 @@
+"""
+Incremental parsing of streamed Claude responses
+
+Responses are asked to lead with a JSON object, so callers can hang up on
+the stream as soon as that object closes instead of downloading trailing
+prose.
+"""
+
+from typing import List
+
+class JSONBlockScanner:
+    """Accumulate streamed text until the first top-level JSON object closes"""
+    
+    def __init__(self):
+        self.parts: List[str] = []
+        self.depth = 0
+        self.started = False
+        self.in_string = False
+        self.escaped = False
+    
+    def feed(self, chunk: str) -> bool:
+        """Add a chunk, returning True once the JSON object is complete"""
+        
+        # Chunks before the object opens need no character scan
+        if not self.started and '{' not in chunk:
+            self.parts.append(chunk)
+            return False
+        
+        for i, char in enumerate(chunk):
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '{':
+                self.depth += 1
+                self.started = True
+            elif not self.started:
+                continue
+            elif char == '"':
+                self.in_string = True
+            elif char == '}':
+                self.depth -= 1
+                if self.depth == 0:
+                    self.parts.append(chunk[:i + 1])
+                    return True
+        
+        self.parts.append(chunk)
+        return False
+    
+    def text(self) -> str:
+        """Text received so far"""
+        return "".join(self.parts)
@@ -2,20 +2,208 @@
 AI-powered analytics engine using Claude 4
 """
 
+import functools
+import gzip
 import json
+import logging
+import math
+import re
 import time
-from typing import Dict, List, Any, Optional
+from typing import Annotated, Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
+from pydantic import BaseModel, BeforeValidator, TypeAdapter, ValidationError, WrapValidator
+from pydantic_core import PydanticUseDefault
+
 try:
     import anthropic
 except ImportError:
-    raise ImportError("anthropic package not installed. Run: pip install anthropic")
+    anthropic = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from .config import Config
+from ._cache import ResponseCache, fingerprint
+from ._streaming import JSONBlockScanner
+
+try:
+    from . import _fastparse
+except ImportError:
+    _fastparse = None  # numpy unavailable
+
+logger = logging.getLogger(__name__)
+
+# Share of the model context window project data may fill; the rest is left for
+# the prompt scaffolding and the response
+PROMPT_CONTEXT_SHARE = 0.8
+
+# Lists longer than this are summarized as a head/tail sample in prompts
+PROMPT_LIST_LIMIT = 50
+PROMPT_LIST_HEAD = 10
+PROMPT_LIST_TAIL = 5
+
+# Free-form responses at least this long are parsed natively when numba is installed
+FASTPARSE_MIN_CHARS = 10_000
+
+# Outermost {...} span of a response, matching the first '{' to the last '}'
+_JSON_BLOCK_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+_BULLET_MARKERS = ('•', '-', '*')
+
+def _default_on_error(value: Any, handler: Any) -> Any:
+    """Fall back to a field's default instead of rejecting the whole response"""
+    try:
+        return handler(value)
+    except ValidationError:
+        raise PydanticUseDefault()
+
+def _round_score(value: Any) -> Any:
+    """Round fractional scores such as 85.5 instead of rejecting them"""
+    if isinstance(value, float) and math.isfinite(value):
+        return round(value)
+    return value
+
+_Score = Annotated[int, BeforeValidator(_round_score), WrapValidator(_default_on_error)]
+
+class AnalysisSchema(BaseModel):
+    """Expected shape of Claude's JSON analysis; drifting fields fall back to defaults"""
+    performance_score: _Score = 0
+    quality_score: _Score = 0
+    security_score: _Score = 0
+    key_findings: Annotated[List[str], WrapValidator(_default_on_error)] = []
+    recommendations: Annotated[List[str], WrapValidator(_default_on_error)] = []
+    detailed_metrics: Annotated[Dict[str, Any], WrapValidator(_default_on_error)] = {}
+
+# Built once and shared by every analyzer; validates JSON text directly in pydantic-core
+_ANALYSIS_ADAPTER = TypeAdapter(AnalysisSchema)
+
+OVERSIZE_INPUT_ERROR = "input exceeds model context; pre-flight rejected"
+
+# Static prompt scaffolding; only the project data varies between calls
+_PROMPT_INTRO = """
+You are CodeMetrics, an expert AI analyst for the Automated Agile Framework ecosystem. 
+Analyze the following project data and provide insights for optimization.
+
+Analysis Type: """
+
+_PROMPT_BODY = """
+Ecosystem Context:
+- This is part of the Automated Agile Framework with 4 components:
+  1. Standardized Modules Framework (scaffolding)
+  2. CodeCreate (AI generation with Claude 4)  
+  3. CodeReview (quality & security analysis)
+  4. CodeMetrics (analytics & optimization - this tool)
+
+Please provide analysis in the following JSON format:
+{
+    "performance_score": <0-100>,
+    "quality_score": <0-100>,
+    "security_score": <0-100>,
+    "key_findings": [
+        "Finding 1",
+        "Finding 2",
+        "..."
+    ],
+    "recommendations": [
+        "Recommendation 1", 
+        "Recommendation 2",
+        "..."
+    ],
+    "detailed_metrics": {
+        "code_complexity": <score>,
+        "test_coverage": <percentage>,
+        "dependency_health": <score>,
+        "performance_indicators": {
+            "response_time_ms": <value>,
+            "memory_usage_mb": <value>,
+            "cpu_utilization": <percentage>
+        },
+        "ecosystem_integration": {
+            "framework_compatibility": <score>,
+            "codecreate_pattern_adoption": <score>,
+            "codereview_compliance": <score>
+        }
+    }
+}
+        """
 
-@dataclass
+_PROMPT_SUFFIXES = {
+    "performance": """
+Focus specifically on:
+- Response time optimization
+- Resource utilization
+- Scaling patterns
+- Performance regression detection
+            """,
+    "quality": """
+Focus specifically on:
+- Code maintainability
+- Test coverage and quality
+- Documentation completeness
+- Best practice adherence
+            """,
+    "security": """
+Focus specifically on:
+- Vulnerability detection
+- Security best practices
+- Compliance requirements (GDPR, SOC2, HIPAA)
+- Threat pattern recognition
+            """,
+}
+
+@functools.lru_cache(maxsize=8)
+def _prompt_frame(analysis_type: str) -> Tuple[str, str]:
+    """Text before and after the project data for an analysis type"""
+    head = f"{_PROMPT_INTRO}{analysis_type}\n\nProject Data:\n"
+    return head, _PROMPT_BODY + _PROMPT_SUFFIXES.get(analysis_type, "")
+
+def _json_default(obj: Any) -> Any:
+    """Encode values the JSON backends don't handle natively"""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()  # numpy arrays and scalars
+    return str(obj)
+
+_MSGSPEC_ENCODER = msgspec.json.Encoder(enc_hook=_json_default) if msgspec is not None else None
+
+def encode_json(value: Any, indent: bool = False) -> bytes:
+    """Encode results (including AnalysisResult dataclasses) to JSON bytes
+    
+    Uses msgspec, then orjson, then the stdlib, whichever is installed and
+    accepts the value.
+    """
+    
+    if _MSGSPEC_ENCODER is not None:
+        try:
+            encoded = _MSGSPEC_ENCODER.encode(value)
+            return msgspec.json.format(encoded, indent=2) if indent else encoded
+        except (TypeError, OverflowError):
+            pass
+    
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(value, default=_json_default, option=option)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits
+    
+    if hasattr(value, "to_dict"):
+        value = value.to_dict()
+    return json.dumps(value, indent=2 if indent else None, default=_json_default).encode('utf-8')
+
+@dataclass(slots=True, frozen=True)
 class AnalysisResult:
     """Container for analysis results"""
     performance_score: int
@@ -28,6 +216,8 @@ class AnalysisResult:
     
     def summary(self) -> str:
         """Generate a summary of the analysis"""
+        findings = "\n".join(f"• {finding}" for finding in self.key_findings)
+        recommendations = "\n".join(f"• {rec}" for rec in self.recommendations)
         return f"""
 📊 CodeMetrics Analysis Summary
 
@@ -36,18 +226,15 @@ Quality Score: {self.quality_score}/100
 Security Score: {self.security_score}/100
 
 Key Findings:
-{chr(10).join(f"• {finding}" for finding in self.key_findings)}
+{findings}
 
 Recommendations:
-{chr(10).join(f"• {rec}" for rec in self.recommendations)}
+{recommendations}
         """
     
-    def save(self, filepath: str) -> None:
-        """Save results to file"""
-        output_path = Path(filepath)
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        data = {
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert results to a serializable dictionary"""
+        return {
             'performance_score': self.performance_score,
             'quality_score': self.quality_score,
             'security_score': self.security_score,
@@ -56,148 +243,351 @@ Recommendations:
             'metrics': self.metrics,
             'timestamp': self.timestamp
         }
+    
+    def save(self, filepath: str) -> None:
+        """Save results to file"""
+        output_path = Path(filepath)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        output_path.write_bytes(encode_json(self, indent=True))
+    
+    def save_jsonl(self, filepath: str) -> None:
+        """Append results as one JSON line, gzip-compressed when the path ends in .gz"""
+        output_path = Path(filepath)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        line = encode_json(self) + b"\n"
+        
+        # Appending to a gzip file adds a member; gzip -dc reads them back as one stream
+        opener = gzip.open if output_path.suffix == ".gz" else open
+        with opener(output_path, 'ab') as f:
+            f.write(line)
 
 class MetricsAnalyzer:
     """AI-powered analytics engine"""
     
     def __init__(self, config: Config):
+        if anthropic is None:
+            raise ImportError("anthropic package not installed. Run: pip install anthropic")
+        
+        from ._client import get_client
+        
         self.config = config
-        self.client = anthropic.Anthropic(api_key=config.anthropic_api_key)
+        self.client = get_client(config.anthropic_api_key)
+        self.cache = ResponseCache(
+            Path(config.cache_dir) / "responses.db",
+            ttl_hours=config.cache_ttl_hours,
+            similarity_threshold=config.cache_similarity_threshold
+        ) if config.cache_enabled else None
+    
+    @property
+    def async_client(self):
+        """Shared AsyncAnthropic client for the running event loop"""
+        from ._client import aget_client
+        
+        return aget_client(self.config.anthropic_api_key)
         
     def analyze(self, data: Dict[str, Any], analysis_type: str = "full") -> AnalysisResult:
         """Perform AI-powered analysis of project data"""
         
-        prompt = self._build_analysis_prompt(data, analysis_type)
+        # Skip the API entirely when an equivalent analysis is cached
+        cached_response = self._get_cached_response(data, analysis_type)
+        if cached_response is not None:
+            return self._parse_analysis_response(cached_response, data)
+        
+        prompt = self._prepare_prompt(data, analysis_type)
+        if prompt is None:
+            return self._fallback_analysis(data, OVERSIZE_INPUT_ERROR)
         
         try:
-            response = self.client.messages.create(
-                model=self.config.model,
-                max_tokens=self.config.max_tokens,
-                temperature=self.config.temperature,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            )
+            # Stop streaming once the JSON block closes; trailing prose is never parsed
+            scanner = JSONBlockScanner()
+            with self.client.messages.stream(**self._request_params(prompt)) as stream:
+                for text in stream.text_stream:
+                    if scanner.feed(text):
+                        break
             
             # Parse AI response into structured results
-            ai_response = response.content[0].text
+            ai_response = scanner.text()
+            self._store_cached_response(data, analysis_type, ai_response)
             return self._parse_analysis_response(ai_response, data)
             
         except Exception as e:
             # Fallback to basic analysis if AI fails
             return self._fallback_analysis(data, str(e))
     
+    async def aanalyze(self, data: Dict[str, Any], analysis_type: str = "full",
+                       client=None) -> AnalysisResult:
+        """Async twin of ``analyze``
+        
+        Pass an ``AsyncAnthropic`` client to share one connection pool across many
+        concurrent analyses; defaults to this analyzer's own async client.
+        """
+        
+        cached_response = self._get_cached_response(data, analysis_type)
+        if cached_response is not None:
+            return self._parse_analysis_response(cached_response, data)
+        
+        prompt = self._prepare_prompt(data, analysis_type)
+        if prompt is None:
+            return self._fallback_analysis(data, OVERSIZE_INPUT_ERROR)
+        
+        client = client or self.async_client
+        
+        try:
+            scanner = JSONBlockScanner()
+            async with client.messages.stream(**self._request_params(prompt)) as stream:
+                async for text in stream.text_stream:
+                    if scanner.feed(text):
+                        break
+            
+            ai_response = scanner.text()
+            self._store_cached_response(data, analysis_type, ai_response)
+            return self._parse_analysis_response(ai_response, data)
+            
+        except Exception as e:
+            return self._fallback_analysis(data, str(e))
+    
+    def analyze_batch(self, items: List[Tuple[str, Dict[str, Any], str]]) -> Dict[str, AnalysisResult]:
+        """Analyze several projects through a single Message Batches submission
+        
+        Each item is a ``(custom_id, data, analysis_type)`` tuple. Batched requests
+        are billed at a discount and run concurrently on Anthropic's side, so this is
+        the preferred path for offline multi-repo analysis. Results are keyed by the
+        caller's ``custom_id``. A batch still running after ``config.batch_timeout``
+        seconds is cancelled and its items get the fallback analysis.
+        """
+        
+        if not items:
+            return {}
+        
+        results = {}
+        pending = []
+        prompts = {}
+        
+        for custom_id, data, analysis_type in items:
+            cached_response = self._get_cached_response(data, analysis_type)
+            if cached_response is not None:
+                results[custom_id] = self._parse_analysis_response(cached_response, data)
+                continue
+            
+            prompt = self._prepare_prompt(data, analysis_type)
+            if prompt is None:
+                results[custom_id] = self._fallback_analysis(data, OVERSIZE_INPUT_ERROR)
+            else:
+                prompts[custom_id] = prompt
+                pending.append((custom_id, data, analysis_type))
+        
+        if not pending:
+            return results
+        
+        # Batch custom_ids are restricted to [a-zA-Z0-9_-], so use positional ids
+        # and map them back to the caller's identifiers afterwards
+        batch_ids = {f"item-{i}": item for i, item in enumerate(pending)}
+        requests = [
+            {
+                "custom_id": batch_id,
+                "params": self._request_params(prompts[custom_id])
+            }
+            for batch_id, (custom_id, _, _) in batch_ids.items()
+        ]
+        
+        missing_reason = "No result returned for batch request"
+        
+        try:
+            batch = self.client.messages.batches.create(requests=requests)
+            deadline = time.monotonic() + self.config.batch_timeout
+            
+            while batch.processing_status != "ended":
+                if time.monotonic() >= deadline:
+                    self.client.messages.batches.cancel(batch.id)
+                    raise TimeoutError(f"Batch timed out after {self.config.batch_timeout}s")
+                time.sleep(self.config.batch_poll_interval)
+                batch = self.client.messages.batches.retrieve(batch.id)
+            
+            for entry in self.client.messages.batches.results(batch.id):
+                if entry.custom_id not in batch_ids:
+                    continue
+                
+                custom_id, data, analysis_type = batch_ids[entry.custom_id]
+                
+                if entry.result.type == "succeeded":
+                    ai_response = entry.result.message.content[0].text
+                    self._store_cached_response(data, analysis_type, ai_response)
+                    results[custom_id] = self._parse_analysis_response(ai_response, data)
+                else:
+                    results[custom_id] = self._fallback_analysis(data, f"Batch request {entry.result.type}")
+                    
+        except Exception as e:
+            # Fallback to basic analysis for anything the batch didn't deliver
+            missing_reason = str(e)
+        
+        for custom_id, data, _ in pending:
+            if custom_id not in results:
+                results[custom_id] = self._fallback_analysis(data, missing_reason)
+        
+        return results
+    
+    def _get_cached_response(self, data: Dict[str, Any], analysis_type: str) -> Optional[str]:
+        """Look up a cached Claude response for this project data"""
+        if not self.cache:
+            return None
+        
+        try:
+            namespace = self._cache_namespace(data, analysis_type)
+            # The fingerprint check answers "unchanged since last run?" without re-serializing
+            return (
+                self.cache.get_unchanged(namespace, self._fingerprint(data))
+                or self.cache.get(namespace, self._cache_text(data))
+            )
+        except Exception:
+            return None
+    
+    def _store_cached_response(self, data: Dict[str, Any], analysis_type: str, ai_response: str) -> None:
+        """Cache a Claude response for this project data"""
+        if not self.cache:
+            return
+        
+        try:
+            self.cache.set(
+                self._cache_namespace(data, analysis_type),
+                self._cache_text(data),
+                ai_response,
+                data_fingerprint=self._fingerprint(data)
+            )
+        except Exception:
+            pass  # Caching is best-effort and must never fail an analysis
+    
+    def _cache_namespace(self, data: Dict[str, Any], analysis_type: str) -> str:
+        """Scope cache entries, including similarity matches, to one model, type and project"""
+        project_info = data.get("project_info", {}) if isinstance(data, dict) else {}
+        return f"{self.config.model}:{analysis_type}:{project_info.get('path', '')}"
+    
+    def _cache_text(self, data: Dict[str, Any]) -> str:
+        """Canonical cache payload, ignoring the per-run collection timestamp"""
+        return json.dumps(self._without_timestamp(data), sort_keys=True, default=str)
+    
+    def _fingerprint(self, data: Dict[str, Any]) -> bytes:
+        """Change-detection fingerprint, ignoring the per-run collection timestamp"""
+        return fingerprint(self._without_timestamp(data))
+    
+    def _without_timestamp(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if isinstance(data, dict):
+            return {key: value for key, value in data.items() if key != "timestamp"}
+        return data
+    
+    def _request_params(self, prompt: str) -> Dict[str, Any]:
+        """Build the Messages API parameters for an analysis prompt"""
+        return {
+            "model": self.config.model,
+            "max_tokens": self.config.max_tokens,
+            "temperature": self.config.temperature,
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        }
+    
     def _build_analysis_prompt(self, data: Dict[str, Any], analysis_type: str) -> str:
         """Build the analysis prompt for Claude"""
         
-        base_prompt = f"""
-You are CodeMetrics, an expert AI analyst for the Automated Agile Framework ecosystem. 
-Analyze the following project data and provide insights for optimization.
-
-Analysis Type: {analysis_type}
-
-Project Data:
-{json.dumps(data, indent=2, default=str)}
-
-Ecosystem Context:
-- This is part of the Automated Agile Framework with 4 components:
-  1. Standardized Modules Framework (scaffolding)
-  2. CodeCreate (AI generation with Claude 4)  
-  3. CodeReview (quality & security analysis)
-  4. CodeMetrics (analytics & optimization - this tool)
-
-Please provide analysis in the following JSON format:
-{{
-    "performance_score": <0-100>,
-    "quality_score": <0-100>,
-    "security_score": <0-100>,
-    "key_findings": [
-        "Finding 1",
-        "Finding 2",
-        "..."
-    ],
-    "recommendations": [
-        "Recommendation 1", 
-        "Recommendation 2",
-        "..."
-    ],
-    "detailed_metrics": {{
-        "code_complexity": <score>,
-        "test_coverage": <percentage>,
-        "dependency_health": <score>,
-        "performance_indicators": {{
-            "response_time_ms": <value>,
-            "memory_usage_mb": <value>,
-            "cpu_utilization": <percentage>
-        }},
-        "ecosystem_integration": {{
-            "framework_compatibility": <score>,
-            "codecreate_pattern_adoption": <score>,
-            "codereview_compliance": <score>
-        }}
-    }}
-}}
-        """
+        return self._render_prompt(self._serialize_for_prompt(self._compact_for_prompt(data)), analysis_type)
+    
+    def _prepare_prompt(self, data: Dict[str, Any], analysis_type: str) -> Optional[str]:
+        """Build the prompt, or return None when the data cannot fit the model context"""
         
-        if analysis_type == "performance":
-            base_prompt += """
-Focus specifically on:
-- Response time optimization
-- Resource utilization
-- Scaling patterns
-- Performance regression detection
-            """
-        elif analysis_type == "quality":
-            base_prompt += """
-Focus specifically on:
-- Code maintainability
-- Test coverage and quality
-- Documentation completeness
-- Best practice adherence
-            """
-        elif analysis_type == "security":
-            base_prompt += """
-Focus specifically on:
-- Vulnerability detection
-- Security best practices
-- Compliance requirements (GDPR, SOC2, HIPAA)
-- Threat pattern recognition
-            """
+        budget = PROMPT_CONTEXT_SHARE * self.config.max_context_tokens
+        data_json = self._serialize_for_prompt(self._compact_for_prompt(data))
+        
+        if self._approx_tokens(data_json) > budget:
+            logger.warning(
+                "Project data is ~%d tokens, over the %d-token budget; keeping only %s",
+                self._approx_tokens(data_json), budget, ", ".join(self.config.oversize_keep_keys)
+            )
+            data_json = self._serialize_for_prompt(self._compact_for_prompt(self._summarize_oversize(data)))
+            
+            if self._approx_tokens(data_json) > budget:
+                logger.warning("Project data still exceeds the model context; pre-filter it before analysis")
+                return None
+        
+        return self._render_prompt(data_json, analysis_type)
+    
+    def _render_prompt(self, data_json: str, analysis_type: str) -> str:
+        head, tail = _prompt_frame(analysis_type)
+        return head + data_json + "\n" + tail
+    
+    def _summarize_oversize(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Keep only the highest-signal sections of oversize project data"""
+        if not isinstance(data, dict):
+            return data
+        return {key: value for key, value in data.items() if key in self.config.oversize_keep_keys}
+    
+    @staticmethod
+    def _approx_tokens(text: str) -> int:
+        """Rough token count (about four characters per token)"""
+        return len(text) // 4
+    
+    def _compact_for_prompt(self, value: Any) -> Any:
+        """Strip noise keys and bound long strings and lists before prompting"""
+        
+        if isinstance(value, dict):
+            exclude = self.config.prompt_exclude_keys
+            return {
+                key: self._compact_for_prompt(item)
+                for key, item in value.items()
+                if key not in exclude
+            }
+        
+        if isinstance(value, (list, tuple)):
+            if len(value) > PROMPT_LIST_LIMIT:
+                return {
+                    "head": [self._compact_for_prompt(item) for item in value[:PROMPT_LIST_HEAD]],
+                    "tail": [self._compact_for_prompt(item) for item in value[-PROMPT_LIST_TAIL:]],
+                    "omitted": len(value) - PROMPT_LIST_HEAD - PROMPT_LIST_TAIL
+                }
+            return [self._compact_for_prompt(item) for item in value]
+        
+        if isinstance(value, str) and len(value) > self.config.max_field_chars:
+            omitted = len(value) - self.config.max_field_chars
+            return value[:self.config.max_field_chars] + f"...[truncated {omitted} chars]"
+        
+        return value
+    
+    def _serialize_for_prompt(self, data: Any) -> str:
+        """Serialize prompt data as compact JSON"""
+        
+        if _MSGSPEC_ENCODER is not None or orjson is not None:
+            return encode_json(data).decode('utf-8')
         
-        return base_prompt
+        return json.dumps(data, separators=(",", ":"), default=str)
     
     def _parse_analysis_response(self, ai_response: str, original_data: Dict[str, Any]) -> AnalysisResult:
         """Parse Claude's response into structured results"""
         
         try:
             # Try to extract JSON from the response
-            start_idx = ai_response.find('{')
-            end_idx = ai_response.rfind('}') + 1
+            match = _JSON_BLOCK_RE.search(ai_response)
             
-            if start_idx >= 0 and end_idx > start_idx:
-                json_str = ai_response[start_idx:end_idx]
-                parsed = json.loads(json_str)
+            if match:
+                parsed = _ANALYSIS_ADAPTER.validate_json(match.group(0))
                 
                 return AnalysisResult(
-                    performance_score=parsed.get('performance_score', 0),
-                    quality_score=parsed.get('quality_score', 0),
-                    security_score=parsed.get('security_score', 0),
-                    key_findings=parsed.get('key_findings', []),
-                    recommendations=parsed.get('recommendations', []),
-                    metrics=parsed.get('detailed_metrics', {}),
+                    performance_score=parsed.performance_score,
+                    quality_score=parsed.quality_score,
+                    security_score=parsed.security_score,
+                    key_findings=parsed.key_findings,
+                    recommendations=parsed.recommendations,
+                    metrics=parsed.detailed_metrics,
                     timestamp=time.time()
                 )
             else:
                 # Fallback parsing if JSON not found
                 return self._extract_scores_from_text(ai_response, original_data)
                 
-        except json.JSONDecodeError:
+        except ValidationError:
+            # Invalid JSON, or a top-level value that isn't an object
             return self._extract_scores_from_text(ai_response, original_data)
     
     def _extract_scores_from_text(self, text: str, data: Dict[str, Any]) -> AnalysisResult:
@@ -209,23 +599,10 @@ Focus specifically on:
         security_score = 85
         
         # Simple keyword-based extraction
-        key_findings = []
-        recommendations = []
-        
-        lines = text.split('\n')
-        current_section = None
-        
-        for line in lines:
-            line = line.strip()
-            if 'finding' in line.lower() or 'issue' in line.lower():
-                current_section = 'findings'
-            elif 'recommend' in line.lower() or 'suggest' in line.lower():
-                current_section = 'recommendations'
-            elif line.startswith('•') or line.startswith('-') or line.startswith('*'):
-                if current_section == 'findings':
-                    key_findings.append(line[1:].strip())
-                elif current_section == 'recommendations':
-                    recommendations.append(line[1:].strip())
+        if _fastparse is not None and _fastparse.NUMBA_AVAILABLE and len(text) >= FASTPARSE_MIN_CHARS:
+            key_findings, recommendations = _fastparse.extract_sections(text)
+        else:
+            key_findings, recommendations = self._extract_sections(text)
         
         return AnalysisResult(
             performance_score=performance_score,
@@ -237,6 +614,27 @@ Focus specifically on:
             timestamp=time.time()
         )
     
+    def _extract_sections(self, text: str) -> Tuple[List[str], List[str]]:
+        """Collect findings and recommendation bullets; section headers take precedence over bullets"""
+        
+        key_findings = []
+        recommendations = []
+        current_section = None
+        
+        # Lowercase the whole response once; lowering never adds or removes newlines,
+        # so the two splits stay aligned line for line
+        for line, lowered in zip(text.split('\n'), text.lower().split('\n')):
+            if 'finding' in lowered or 'issue' in lowered:
+                current_section = key_findings
+            elif 'recommend' in lowered or 'suggest' in lowered:
+                current_section = recommendations
+            elif current_section is not None:
+                line = line.strip()
+                if line.startswith(_BULLET_MARKERS):
+                    current_section.append(line[1:].strip())
+        
+        return key_findings, recommendations
+    
     def _fallback_analysis(self, data: Dict[str, Any], error: str) -> AnalysisResult:
         """Provide basic analysis when AI is unavailable"""
         
@@ -4,67 +4,376 @@ Data collection from ecosystem components and project analysis
 
 import os
 import json
+import mmap
+import re
 import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, FrozenSet, List, Any, NamedTuple, Optional, Sequence, Tuple, Union
 import ast
+import heapq
 import time
 
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from ._cache import FileMetricsCache
 from .config import Config
 
+# Line classification over raw bytes; whitespace matches str.strip() for ASCII
+_BLANK_LINE_RE = re.compile(rb'^[ \t\r\f\v]*$', re.MULTILINE)
+_COMMENT_LINE_RE = re.compile(rb'^[ \t\r\f\v]*(?:#|//|/\*).*$', re.MULTILINE)
+_COMPLEXITY_RE = re.compile(rb'\b(?:if|for|while|try|except|catch|switch|case)\b', re.IGNORECASE)
+
+if msgspec is not None:
+    class _PackageManifest(msgspec.Struct):
+        """The only package.json fields the collector reads; the rest are skipped unparsed"""
+        dependencies: Dict[str, Any] = {}
+        devDependencies: Dict[str, Any] = {}
+    
+    _MANIFEST_DECODER = msgspec.json.Decoder(_PackageManifest)
+else:
+    _MANIFEST_DECODER = None
+
+def _manifest_dependencies(raw: bytes) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Decode package.json bytes into its runtime and dev dependency maps"""
+    
+    if _MANIFEST_DECODER is not None:
+        manifest = _MANIFEST_DECODER.decode(raw)
+        return manifest.dependencies, manifest.devDependencies
+    
+    package_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    return package_data.get('dependencies', {}), package_data.get('devDependencies', {})
+
+IGNORE_PATTERNS = (
+    '.git', '__pycache__', 'node_modules', '.pytest_cache',
+    '.venv', 'venv', '.env', 'build', 'dist'
+)
+# One alternation scans a path once in C instead of once per pattern
+_IGNORE_RE = re.compile('|'.join(map(re.escape, IGNORE_PATTERNS)))
+
+LANGUAGE_EXTENSIONS = {
+    '.py': 'Python',
+    '.js': 'JavaScript',
+    '.ts': 'TypeScript',
+    '.java': 'Java',
+    '.cpp': 'C++',
+    '.c': 'C',
+    '.go': 'Go',
+    '.rs': 'Rust',
+    '.rb': 'Ruby',
+    '.php': 'PHP',
+    '.html': 'HTML',
+    '.css': 'CSS',
+    '.sql': 'SQL'
+}
+
+SECURITY_FILE_NAMES = frozenset({
+    "security.py", "auth.py", "authentication.py",
+    "authorization.py", "permissions.py", "middleware.py"
+})
+
+SENSITIVE_PATTERNS = ("password", "secret", "token", "api_key", "private_key")
+# Lookahead so overlapping hits (e.g. "secretoken") are all seen, without lowercasing a copy of the file
+_SENSITIVE_RE = re.compile(
+    b'(?=(' + b'|'.join(re.escape(pattern.encode()) for pattern in SENSITIVE_PATTERNS) + b'))',
+    re.IGNORECASE
+)
+# Credentials sit near the top of a file; don't read generated blobs in full
+SENSITIVE_SCAN_BYTES = 256 * 1024
+
+LARGEST_FILES_LIMIT = 10
+READ_BUFFER_SIZE = 64 * 1024
+
+# Below this many uncached files, worker start-up costs more than it saves
+PARALLEL_MIN_FILES = 64
+PARALLEL_CHUNKSIZE = 32
+
+def _analyze_file_worker(file_path: str) -> Dict[str, Any]:
+    """Analyze individual file metrics
+    
+    Module-level so it pickles into collector worker processes.
+    """
+    
+    try:
+        with open(file_path, 'rb', buffering=READ_BUFFER_SIZE) as f:
+            data = f.read()
+    except Exception:
+        return {"total_lines": 0, "code_lines": 0, "comment_lines": 0, "empty_lines": 0, "complexity": 0}
+    
+    if not data:
+        return {"total_lines": 0, "code_lines": 0, "comment_lines": 0, "empty_lines": 0, "complexity": 0}
+    
+    terminated = data.endswith(b'\n')
+    total_lines = data.count(b'\n') + (0 if terminated else 1)
+    
+    # A trailing newline leaves one empty match at the end of the buffer that is not a line
+    empty_lines = len(_BLANK_LINE_RE.findall(data)) - (1 if terminated else 0)
+    
+    comments = _COMMENT_LINE_RE.findall(data)
+    comment_lines = len(comments)
+    code_lines = total_lines - empty_lines - comment_lines
+    
+    # Simple complexity calculation (control structures outside comment lines)
+    complexity = len(_COMPLEXITY_RE.findall(data))
+    complexity -= sum(len(_COMPLEXITY_RE.findall(line)) for line in comments)
+    
+    return {
+        "total_lines": total_lines,
+        "code_lines": code_lines,
+        "comment_lines": comment_lines,
+        "empty_lines": empty_lines,
+        "complexity": complexity
+    }
+
+def _count_endpoints_worker(file_path: str) -> int:
+    """Count route decorators in one Python file"""
+    
+    try:
+        with open(file_path, 'rb') as f:
+            # mmap rejects empty files
+            if os.fstat(f.fileno()).st_size == 0:
+                return 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                # Simple pattern matching for FastAPI/Flask routes, without decoding the file
+                return _count_occurrences(content, b'@app.') + _count_occurrences(content, b'@router.')
+    except Exception:
+        return 0
+
+def _count_occurrences(buf: mmap.mmap, needle: bytes) -> int:
+    """Count non-overlapping occurrences of needle in a mapped file"""
+    
+    count = 0
+    position = buf.find(needle)
+    while position != -1:
+        count += 1
+        position = buf.find(needle, position + len(needle))
+    return count
+
+def _sensitive_patterns_worker(file_path: str) -> List[str]:
+    """List the sensitive patterns present in one Python file"""
+    
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read(SENSITIVE_SCAN_BYTES)
+    except Exception:
+        return []
+    
+    found = set()
+    for match in _SENSITIVE_RE.finditer(data):
+        found.add(match.group(1).lower())
+        if len(found) == len(SENSITIVE_PATTERNS):
+            break
+    
+    return [pattern for pattern in SENSITIVE_PATTERNS if pattern.encode() in found]
+
+class FileRecord(NamedTuple):
+    """A regular file seen by the project walk"""
+    path: str
+    name: str
+    suffix: str
+    size: int
+    mtime_ns: int
+
+class _Collection:
+    """State scoped to one ``collect_project_data`` call
+    
+    Directory listings, per-file cache entries and the worker pool live here
+    rather than on the collector, so concurrent collections on one
+    ``DataCollector`` (e.g. dashboard jobs) never share or shut down each
+    other's state.
+    """
+    
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self.listings: Dict[str, FrozenSet[str]] = {}
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+    
+    def pool(self) -> Optional[ProcessPoolExecutor]:
+        """Start the process pool on first use"""
+        if self.max_workers <= 1:
+            return None
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+    
+    def close(self) -> None:
+        """Shut down the pool, if one was started"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
 class DataCollector:
-    """Collects metrics data from various sources"""
+    """Collects metrics data from various sources
+    
+    One collector may run several collections at once; everything specific
+    to a run is kept on its ``_Collection``.
+    """
     
     def __init__(self, config: Config):
         self.config = config
+        self._file_cache = FileMetricsCache(
+            Path(config.cache_dir) / "file_metrics.db",
+            ttl_hours=config.cache_ttl_hours
+        ) if config.cache_enabled else None
     
     def collect_project_data(self, project_path: str, analysis_type: str = "full") -> Dict[str, Any]:
         """Collect comprehensive project data for analysis"""
         
         project_path = Path(project_path).resolve()
         
-        data = {
-            "project_info": self._get_project_info(project_path),
-            "file_metrics": self._analyze_files(project_path),
-            "dependency_analysis": self._analyze_dependencies(project_path),
-            "git_metrics": self._get_git_metrics(project_path),
-            "ecosystem_integration": self._check_ecosystem_integration(project_path),
-            "timestamp": time.time(),
-            "analysis_type": analysis_type
-        }
+        # Walk the tree once; every helper below reads this list instead of rglob
+        files = self._scan_once(project_path)
+        collection = _Collection(self.config.max_workers)
+        try:
+            data = {
+                "project_info": self._get_project_info(project_path, files, collection),
+                "file_metrics": self._analyze_files(project_path, files, collection),
+                "dependency_analysis": self._analyze_dependencies(project_path, collection),
+                "git_metrics": self._get_git_metrics(project_path, collection),
+                "ecosystem_integration": self._check_ecosystem_integration(project_path, collection),
+                "timestamp": time.time(),
+                "analysis_type": analysis_type
+            }
+            
+            if analysis_type in ["full", "performance"]:
+                data["performance_metrics"] = self._collect_performance_metrics(project_path, files, collection)
+            
+            if analysis_type in ["full", "quality"]:
+                data["quality_metrics"] = self._collect_quality_metrics(project_path, files, collection)
+            
+            if analysis_type in ["full", "security"]:
+                data["security_metrics"] = self._collect_security_metrics(project_path, files, collection)
+        finally:
+            collection.close()
         
-        if analysis_type in ["full", "performance"]:
-            data["performance_metrics"] = self._collect_performance_metrics(project_path)
+        return data
+    
+    def _scan_once(self, project_path: Path) -> List[FileRecord]:
+        """Walk the project tree once, never descending into ignored directories"""
         
-        if analysis_type in ["full", "quality"]:
-            data["quality_metrics"] = self._collect_quality_metrics(project_path)
+        files = []
+        pending = deque([os.fspath(project_path)])
+        
+        while pending:
+            try:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if self._should_ignore_file(entry.name):
+                            continue
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                stat = entry.stat(follow_symlinks=False)
+                                files.append(FileRecord(
+                                    entry.path,
+                                    entry.name,
+                                    os.path.splitext(entry.name)[1].lower(),
+                                    stat.st_size,
+                                    stat.st_mtime_ns
+                                ))
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        
+        return files
+    
+    def _dir_names(self, directory: Path, collection: Optional[_Collection] = None) -> FrozenSet[str]:
+        """Names in a directory, listed once per collection; empty if it doesn't exist"""
+        
+        key = os.fspath(directory)
+        names = collection.listings.get(key) if collection is not None else None
+        if names is None:
+            try:
+                names = frozenset(os.listdir(key))
+            except OSError:
+                names = frozenset()
+            if collection is not None:
+                collection.listings[key] = names
+        
+        return names
+    
+    def _file_metrics(
+        self, records: Sequence[FileRecord], kind: str, worker: Callable[[str], Any],
+        collection: Optional[_Collection] = None
+    ) -> List[Any]:
+        """Return one per-file metric for each record
+        
+        Values are reused from the on-disk cache while a file is unchanged;
+        misses are computed in the collection's worker pool when there are
+        enough of them to pay for it.
+        """
+        
+        cache = self._file_cache
+        entries = [self._file_entry(record, collection) for record in records]
+        missing = [i for i, entry in enumerate(entries) if kind not in entry]
+        
+        if missing:
+            paths = [records[i].path for i in missing]
+            # Standalone helper calls have no collection to shut a pool down
+            pool = collection.pool() if collection is not None and len(paths) >= PARALLEL_MIN_FILES else None
+            results = pool.map(worker, paths, chunksize=PARALLEL_CHUNKSIZE) if pool else map(worker, paths)
             
-        if analysis_type in ["full", "security"]:
-            data["security_metrics"] = self._collect_security_metrics(project_path)
+            for i, value in zip(missing, results):
+                entries[i][kind] = value
+            
+            # Written only once the batch is computed, so the database is never locked while files are read
+            if cache is not None:
+                cache.set_many(
+                    (records[i].path, records[i].mtime_ns, records[i].size, entries[i]) for i in missing
+                )
         
-        return data
+        return [entry[kind] for entry in entries]
     
-    def _get_project_info(self, project_path: Path) -> Dict[str, Any]:
+    def _file_entry(self, record: FileRecord, collection: Optional[_Collection] = None) -> Dict[str, Any]:
+        """All metrics known for one file, loaded from disk at most once per collection"""
+        
+        entry = collection.entries.get(record.path) if collection is not None else None
+        if entry is None:
+            cache = self._file_cache
+            entry = (cache.get(record.path, record.mtime_ns, record.size) if cache is not None else None) or {}
+            if collection is not None:
+                collection.entries[record.path] = entry
+        
+        return entry
+    
+    def _get_project_info(
+        self, project_path: Path, files: List[FileRecord], collection: Optional[_Collection] = None
+    ) -> Dict[str, Any]:
         """Collect basic project information"""
         
         info = {
             "path": str(project_path),
             "name": project_path.name,
-            "size_bytes": self._get_directory_size(project_path),
-            "file_count": len(list(project_path.rglob("*"))),
-            "programming_languages": self._detect_languages(project_path)
+            "size_bytes": self._get_directory_size(files),
+            "file_count": len(files),
+            "programming_languages": self._detect_languages(files)
         }
         
         # Check for common files
         common_files = ["README.md", "requirements.txt", "package.json", "Dockerfile", ".gitignore"]
+        root_names = self._dir_names(project_path, collection)
         info["has_files"] = {
-            file: (project_path / file).exists() 
+            file: file in root_names
             for file in common_files
         }
         
         return info
     
-    def _analyze_files(self, project_path: Path) -> Dict[str, Any]:
+    def _analyze_files(
+        self, project_path: Path, files: List[FileRecord], collection: Optional[_Collection] = None
+    ) -> Dict[str, Any]:
         """Analyze project files for metrics"""
         
         metrics = {
@@ -76,130 +385,108 @@ class DataCollector:
             "empty_lines": 0,
             "file_types": {},
             "largest_files": [],
-            "complexity_scores": []
+            "complexity_scores": [],
+            "skipped_files": 0
         }
         
         code_extensions = {'.py', '.js', '.ts', '.java', '.cpp', '.c', '.go', '.rs', '.rb', '.php'}
+        max_file_size = self.config.max_file_size_kb * 1024
         
-        for file_path in project_path.rglob("*"):
-            if file_path.is_file() and not self._should_ignore_file(file_path):
-                metrics["total_files"] += 1
-                
-                # Track file types
-                ext = file_path.suffix.lower()
-                metrics["file_types"][ext] = metrics["file_types"].get(ext, 0) + 1
-                
-                # Analyze code files
-                if ext in code_extensions:
-                    metrics["code_files"] += 1
-                    file_metrics = self._analyze_file(file_path)
-                    
-                    metrics["total_lines"] += file_metrics["total_lines"]
-                    metrics["code_lines"] += file_metrics["code_lines"]
-                    metrics["comment_lines"] += file_metrics["comment_lines"]
-                    metrics["empty_lines"] += file_metrics["empty_lines"]
-                    
-                    if file_metrics["complexity"] > 0:
-                        metrics["complexity_scores"].append({
-                            "file": str(file_path.relative_to(project_path)),
-                            "complexity": file_metrics["complexity"]
-                        })
-                    
-                    # Track largest files
-                    metrics["largest_files"].append({
-                        "file": str(file_path.relative_to(project_path)),
-                        "lines": file_metrics["total_lines"],
-                        "size_bytes": file_path.stat().st_size
-                    })
-        
-        # Sort and limit largest files
-        metrics["largest_files"] = sorted(
-            metrics["largest_files"], 
-            key=lambda x: x["lines"], 
-            reverse=True
-        )[:10]
-        
-        return metrics
-    
-    def _analyze_file(self, file_path: Path) -> Dict[str, Any]:
-        """Analyze individual file metrics"""
+        code_records = []
         
-        try:
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                lines = f.readlines()
-        except Exception:
-            return {"total_lines": 0, "code_lines": 0, "comment_lines": 0, "empty_lines": 0, "complexity": 0}
-        
-        total_lines = len(lines)
-        code_lines = 0
-        comment_lines = 0
-        empty_lines = 0
-        complexity = 0
-        
-        for line in lines:
-            stripped = line.strip()
-            if not stripped:
-                empty_lines += 1
-            elif stripped.startswith('#') or stripped.startswith('//') or stripped.startswith('/*'):
-                comment_lines += 1
+        for record in files:
+            metrics["total_files"] += 1
+            
+            # Track file types
+            ext = record.suffix
+            metrics["file_types"][ext] = metrics["file_types"].get(ext, 0) + 1
+            
+            if ext in code_extensions:
+                metrics["code_files"] += 1
+                # Generated or vendored blobs past the size limit are counted but never read
+                if record.size > max_file_size:
+                    metrics["skipped_files"] += 1
+                else:
+                    code_records.append(record)
+        
+        # Analyze code files
+        
+        # Walked paths all start with the root, so relative paths are plain slices
+        root_prefix = os.fspath(project_path).rstrip(os.sep) + os.sep
+        
+        # Min-heap of the longest files so far; -index keeps the earlier file on ties
+        largest = []
+        
+        file_metrics_list = self._file_metrics(code_records, "lines", _analyze_file_worker, collection)
+        for index, (record, file_metrics) in enumerate(zip(code_records, file_metrics_list)):
+            metrics["total_lines"] += file_metrics["total_lines"]
+            metrics["code_lines"] += file_metrics["code_lines"]
+            metrics["comment_lines"] += file_metrics["comment_lines"]
+            metrics["empty_lines"] += file_metrics["empty_lines"]
+            
+            relative_path = record.path[len(root_prefix):] if record.path.startswith(root_prefix) else record.path
+            
+            if file_metrics["complexity"] > 0:
+                metrics["complexity_scores"].append({
+                    "file": relative_path,
+                    "complexity": file_metrics["complexity"]
+                })
+            
+            # Track largest files
+            entry = (file_metrics["total_lines"], -index, relative_path, record.size)
+            if len(largest) < LARGEST_FILES_LIMIT:
+                heapq.heappush(largest, entry)
             else:
-                code_lines += 1
-                
-                # Simple complexity calculation (control structures)
-                complexity_keywords = ['if', 'for', 'while', 'try', 'except', 'catch', 'switch', 'case']
-                for keyword in complexity_keywords:
-                    if keyword in stripped.lower():
-                        complexity += 1
+                heapq.heappushpop(largest, entry)
         
-        return {
-            "total_lines": total_lines,
-            "code_lines": code_lines,
-            "comment_lines": comment_lines,
-            "empty_lines": empty_lines,
-            "complexity": complexity
-        }
+        metrics["largest_files"] = [
+            {"file": path, "lines": lines, "size_bytes": size}
+            for lines, _, path, size in sorted(largest, reverse=True)
+        ]
+        
+        return metrics
     
-    def _analyze_dependencies(self, project_path: Path) -> Dict[str, Any]:
+    def _analyze_dependencies(self, project_path: Path, collection: Optional[_Collection] = None) -> Dict[str, Any]:
         """Analyze project dependencies"""
         
         deps = {
-            "python": self._get_python_dependencies(project_path),
-            "node": self._get_node_dependencies(project_path),
-            "docker": self._check_docker_config(project_path)
+            "python": self._get_python_dependencies(project_path, collection),
+            "node": self._get_node_dependencies(project_path, collection),
+            "docker": self._check_docker_config(project_path, collection)
         }
         
         return deps
     
-    def _get_python_dependencies(self, project_path: Path) -> Dict[str, Any]:
+    def _get_python_dependencies(self, project_path: Path, collection: Optional[_Collection] = None) -> Dict[str, Any]:
         """Get Python dependency information"""
         
         requirements_file = project_path / "requirements.txt"
-        if requirements_file.exists():
+        if "requirements.txt" in self._dir_names(project_path, collection):
             try:
-                with open(requirements_file, 'r') as f:
-                    requirements = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+                requirements = [
+                    line for line in (raw.strip() for raw in requirements_file.read_bytes().splitlines())
+                    if line and not line.startswith(b'#')
+                ]
                 
                 return {
                     "has_requirements": True,
                     "dependency_count": len(requirements),
-                    "dependencies": requirements[:20]  # Limit for analysis
+                    # Only the entries sent for analysis are decoded
+                    "dependencies": [line.decode('utf-8', 'replace') for line in requirements[:20]]
                 }
             except Exception:
                 pass
         
         return {"has_requirements": False, "dependency_count": 0, "dependencies": []}
     
-    def _get_node_dependencies(self, project_path: Path) -> Dict[str, Any]:
+    def _get_node_dependencies(self, project_path: Path, collection: Optional[_Collection] = None) -> Dict[str, Any]:
         """Get Node.js dependency information"""
         
         package_json = project_path / "package.json"
-        if package_json.exists():
+        if "package.json" in self._dir_names(project_path, collection):
             try:
-                with open(package_json, 'r') as f:
-                    package_data = json.load(f)
-                
-                deps = package_data.get('dependencies', {})
-                dev_deps = package_data.get('devDependencies', {})
+                with open(package_json, 'rb') as f:
+                    deps, dev_deps = _manifest_dependencies(f.read())
                 
                 return {
                     "has_package_json": True,
@@ -212,31 +499,30 @@ class DataCollector:
         
         return {"has_package_json": False, "dependency_count": 0}
     
-    def _check_docker_config(self, project_path: Path) -> Dict[str, Any]:
+    def _check_docker_config(self, project_path: Path, collection: Optional[_Collection] = None) -> Dict[str, Any]:
         """Check Docker configuration"""
         
-        dockerfile = project_path / "Dockerfile"
-        docker_compose = project_path / "docker-compose.yml"
+        root_names = self._dir_names(project_path, collection)
+        has_dockerfile = "Dockerfile" in root_names
+        has_docker_compose = "docker-compose.yml" in root_names
         
         return {
-            "has_dockerfile": dockerfile.exists(),
-            "has_docker_compose": docker_compose.exists(),
-            "containerized": dockerfile.exists() or docker_compose.exists()
+            "has_dockerfile": has_dockerfile,
+            "has_docker_compose": has_docker_compose,
+            "containerized": has_dockerfile or has_docker_compose
         }
     
-    def _get_git_metrics(self, project_path: Path) -> Dict[str, Any]:
+    def _get_git_metrics(self, project_path: Path, collection: Optional[_Collection] = None) -> Dict[str, Any]:
         """Collect Git repository metrics"""
         
         try:
             # Check if it's a git repository
-            git_dir = project_path / ".git"
-            if not git_dir.exists():
+            if ".git" not in self._dir_names(project_path, collection):
                 return {"is_git_repo": False}
             
             # Get basic git info
             result = subprocess.run(
-                ["git", "rev-list", "--count", "HEAD"],
-                cwd=project_path,
+                ["git", "-C", str(project_path), "rev-list", "--count", "HEAD"],
                 capture_output=True,
                 text=True,
                 timeout=10
@@ -244,27 +530,19 @@ class DataCollector:
             
             commit_count = int(result.stdout.strip()) if result.returncode == 0 else 0
             
-            # Get recent activity
-            result = subprocess.run(
-                ["git", "log", "--oneline", "-n", "10"],
-                cwd=project_path,
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            recent_commits = len(result.stdout.strip().split('\n')) if result.returncode == 0 else 0
+            # Recent activity is the last 10 commits, which the count already bounds
+            recent_commits = min(commit_count, 10)
             
             return {
                 "is_git_repo": True,
                 "commit_count": commit_count,
                 "recent_commits": recent_commits
             }
-            
+        
         except Exception:
             return {"is_git_repo": False}
     
-    def _check_ecosystem_integration(self, project_path: Path) -> Dict[str, Any]:
+    def _check_ecosystem_integration(self, project_path: Path, collection: Optional[_Collection] = None) -> Dict[str, Any]:
         """Check integration with Automated Agile Framework components"""
         
         integration = {
@@ -274,91 +552,83 @@ class DataCollector:
             "github_actions": False
         }
         
+        root_names = self._dir_names(project_path, collection)
+        workflow_names = self._dir_names(project_path / ".github" / "workflows", collection)
+        
         # Check for framework patterns
-        if (project_path / "module.json").exists():
+        if "module.json" in root_names:
             integration["standardized_framework"] = True
         
         # Check for CodeCreate patterns
-        codecreate_indicators = [
-            ".github/workflows/codecreate.yml",
-            "codecreate_config.json",
-            "generated_by_codecreate.md"
-        ]
-        for indicator in codecreate_indicators:
-            if (project_path / indicator).exists():
-                integration["codecreate_compatible"] = True
-                break
+        if ("codecreate.yml" in workflow_names
+                or not root_names.isdisjoint({"codecreate_config.json", "generated_by_codecreate.md"})):
+            integration["codecreate_compatible"] = True
         
         # Check for CodeReview setup
-        codereview_indicators = [
-            ".github/workflows/codereview.yml",
-            ".ai_review_cache"
-        ]
-        for indicator in codereview_indicators:
-            if (project_path / indicator).exists():
-                integration["codereview_configured"] = True
-                break
+        if "codereview.yml" in workflow_names or ".ai_review_cache" in root_names:
+            integration["codereview_configured"] = True
         
         # Check for GitHub Actions
-        github_actions_dir = project_path / ".github" / "workflows"
-        if github_actions_dir.exists() and any(github_actions_dir.iterdir()):
+        if workflow_names:
             integration["github_actions"] = True
         
         return integration
     
-    def _collect_performance_metrics(self, project_path: Path) -> Dict[str, Any]:
+    def _collect_performance_metrics(
+        self, project_path: Path, files: List[FileRecord], collection: Optional[_Collection] = None
+    ) -> Dict[str, Any]:
         """Collect performance-related metrics"""
         
         return {
             "estimated_startup_time": "unknown",
             "memory_footprint": "unknown",
-            "api_endpoints": self._count_api_endpoints(project_path),
+            "api_endpoints": self._count_api_endpoints(files, collection),
             "database_queries": "unknown"
         }
     
-    def _collect_quality_metrics(self, project_path: Path) -> Dict[str, Any]:
+    def _collect_quality_metrics(
+        self, project_path: Path, files: List[FileRecord], collection: Optional[_Collection] = None
+    ) -> Dict[str, Any]:
         """Collect code quality metrics"""
         
         return {
-            "test_coverage": self._estimate_test_coverage(project_path),
-            "documentation_score": self._assess_documentation(project_path),
+            "test_coverage": self._estimate_test_coverage(files),
+            "documentation_score": self._assess_documentation(project_path, files, collection),
             "code_duplication": "unknown"
         }
     
-    def _collect_security_metrics(self, project_path: Path) -> Dict[str, Any]:
+    def _collect_security_metrics(
+        self, project_path: Path, files: List[FileRecord], collection: Optional[_Collection] = None
+    ) -> Dict[str, Any]:
         """Collect security-related metrics"""
         
         return {
-            "security_files": self._count_security_files(project_path),
-            "sensitive_patterns": self._scan_sensitive_patterns(project_path),
+            "security_files": self._count_security_files(files),
+            "sensitive_patterns": self._scan_sensitive_patterns(files, collection),
             "dependency_vulnerabilities": "unknown"
         }
     
-    def _count_api_endpoints(self, project_path: Path) -> int:
+    def _count_api_endpoints(self, files: List[FileRecord], collection: Optional[_Collection] = None) -> int:
         """Count potential API endpoints"""
-        endpoint_count = 0
+        py_records = [record for record in files if record.suffix == '.py']
         
-        for py_file in project_path.rglob("*.py"):
-            try:
-                with open(py_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    # Simple pattern matching for FastAPI/Flask routes
-                    endpoint_count += content.count('@app.') + content.count('@router.')
-            except Exception:
-                continue
-        
-        return endpoint_count
+        return sum(self._file_metrics(py_records, "api_endpoints", _count_endpoints_worker, collection))
     
-    def _estimate_test_coverage(self, project_path: Path) -> str:
+    def _estimate_test_coverage(self, files: List[FileRecord]) -> str:
         """Estimate test coverage based on file structure"""
         
-        test_files = list(project_path.rglob("test_*.py")) + list(project_path.rglob("*_test.py"))
-        code_files = list(project_path.rglob("*.py"))
+        code_count = 0
+        test_count = 0
+        for record in files:
+            if record.suffix == '.py':
+                code_count += 1
+                if record.name.startswith('test_') or record.name.endswith('_test.py'):
+                    test_count += 1
         
-        if not code_files:
+        if not code_count:
             return "no_code_files"
         
-        coverage_ratio = len(test_files) / len(code_files)
+        coverage_ratio = test_count / code_count
         
         if coverage_ratio >= 0.8:
             return "high"
@@ -369,107 +639,59 @@ class DataCollector:
         else:
             return "very_low"
     
-    def _assess_documentation(self, project_path: Path) -> str:
+    def _assess_documentation(
+        self, project_path: Path, files: List[FileRecord], collection: Optional[_Collection] = None
+    ) -> str:
         """Assess documentation quality"""
         
-        doc_files = list(project_path.rglob("*.md")) + list(project_path.rglob("*.rst"))
+        doc_count = sum(1 for record in files if record.suffix in ('.md', '.rst'))
         
-        has_readme = (project_path / "README.md").exists()
-        has_docs_dir = (project_path / "docs").exists()
+        root_names = self._dir_names(project_path, collection)
+        has_readme = "README.md" in root_names
+        has_docs_dir = "docs" in root_names
         
-        if has_readme and has_docs_dir and len(doc_files) >= 5:
+        if has_readme and has_docs_dir and doc_count >= 5:
             return "excellent"
-        elif has_readme and len(doc_files) >= 3:
+        elif has_readme and doc_count >= 3:
             return "good"
         elif has_readme:
             return "basic"
         else:
             return "poor"
     
-    def _count_security_files(self, project_path: Path) -> int:
+    def _count_security_files(self, files: List[FileRecord]) -> int:
         """Count security-related files"""
         
-        security_patterns = [
-            "security.py", "auth.py", "authentication.py",
-            "authorization.py", "permissions.py", "middleware.py"
-        ]
-        
-        count = 0
-        for pattern in security_patterns:
-            count += len(list(project_path.rglob(pattern)))
-        
-        return count
+        return sum(1 for record in files if record.name in SECURITY_FILE_NAMES)
     
-    def _scan_sensitive_patterns(self, project_path: Path) -> List[str]:
+    def _scan_sensitive_patterns(self, files: List[FileRecord], collection: Optional[_Collection] = None) -> List[str]:
         """Scan for potentially sensitive patterns"""
         
-        sensitive_patterns = [
-            "password", "secret", "token", "api_key", "private_key"
-        ]
-        
+        py_records = [record for record in files if record.suffix == '.py']
         findings = []
         
-        for py_file in project_path.rglob("*.py"):
-            try:
-                with open(py_file, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read().lower()
-                    for pattern in sensitive_patterns:
-                        if pattern in content and len(findings) < 10:  # Limit findings
-                            findings.append(f"Found '{pattern}' pattern in {py_file.name}")
-            except Exception:
-                continue
+        patterns_by_file = self._file_metrics(py_records, "sensitive_patterns", _sensitive_patterns_worker, collection)
+        for record, patterns in zip(py_records, patterns_by_file):
+            for pattern in patterns:
+                findings.append(f"Found '{pattern}' pattern in {record.name}")
+                if len(findings) >= 10:  # Limit findings
+                    return findings
         
         return findings
     
-    def _get_directory_size(self, path: Path) -> int:
+    def _get_directory_size(self, files: List[FileRecord]) -> int:
         """Calculate total directory size"""
         
-        total_size = 0
-        try:
-            for file_path in path.rglob("*"):
-                if file_path.is_file():
-                    total_size += file_path.stat().st_size
-        except Exception:
-            pass
-        
-        return total_size
+        return sum(record.size for record in files)
     
-    def _detect_languages(self, project_path: Path) -> List[str]:
+    def _detect_languages(self, files: List[FileRecord]) -> List[str]:
         """Detect programming languages in the project"""
         
-        language_extensions = {
-            '.py': 'Python',
-            '.js': 'JavaScript',
-            '.ts': 'TypeScript',
-            '.java': 'Java',
-            '.cpp': 'C++',
-            '.c': 'C',
-            '.go': 'Go',
-            '.rs': 'Rust',
-            '.rb': 'Ruby',
-            '.php': 'PHP',
-            '.html': 'HTML',
-            '.css': 'CSS',
-            '.sql': 'SQL'
-        }
-        
-        found_languages = set()
+        suffixes = {record.suffix for record in files}
         
-        for file_path in project_path.rglob("*"):
-            if file_path.is_file():
-                ext = file_path.suffix.lower()
-                if ext in language_extensions:
-                    found_languages.add(language_extensions[ext])
-        
-        return sorted(list(found_languages))
+        return sorted({LANGUAGE_EXTENSIONS[ext] for ext in suffixes & LANGUAGE_EXTENSIONS.keys()})
     
-    def _should_ignore_file(self, file_path: Path) -> bool:
-        """Check if file should be ignored in analysis"""
-        
-        ignore_patterns = [
-            '.git', '__pycache__', 'node_modules', '.pytest_cache',
-            '.venv', 'venv', '.env', 'build', 'dist'
-        ]
+    def _should_ignore_file(self, file_path: Union[str, Path]) -> bool:
+        """Check if a file or directory should be ignored in analysis"""
         
-        path_str = str(file_path)
-        return any(pattern in path_str for pattern in ignore_patterns)
+        return _IGNORE_RE.search(os.fspath(file_path)) is not None
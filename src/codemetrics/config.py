@@ -2,52 +2,113 @@
 Configuration management for CodeMetrics
 """
 
+import copy
+import functools
 import os
 import yaml
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Optional
 from dataclasses import dataclass, field
 
+DEFAULT_PROMPT_EXCLUDE_KEYS = ("raw_diff", "file_contents", "binary_blob", "embeddings", "timestamp")
+DEFAULT_OVERSIZE_KEEP_KEYS = (
+    "project_info", "analysis_type", "quality_metrics", "security_metrics", "performance_metrics"
+)
+DEFAULT_ECOSYSTEM_REPOS = (
+    "Jita81/Standardized-Modules-Framework-v1.0.0",
+    "Jita81/CODEREVIEW",
+    "Jita81/CODECREATE",
+    "Jita81/CODETEST",
+    "Jita81/CODEMETRICS"
+)
+
+# libyaml's C parser when PyYAML was built with it
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+@functools.lru_cache(maxsize=8)
+def _read_config_file(path: str, mtime_ns: int) -> Dict[str, Any]:
+    """Parse a YAML config file; the mtime in the key invalidates edited files"""
+    with open(path, 'rb') as f:
+        return yaml.load(f, Loader=_YAML_LOADER) or {}
+
+def _parse_bool(value: str) -> bool:
+    return value.lower() in ('true', '1', 'yes', 'on')
+
+def _apply_env(config: 'Config', name: str, env_var: str, cast: Callable[[str], Any] = str) -> None:
+    """Set a field from an environment variable when it is defined"""
+    value = os.environ.get(env_var)
+    if value is not None:
+        setattr(config, name, cast(value))
+
+_ENV_OVERRIDES = (
+    ('anthropic_api_key', 'ANTHROPIC_API_KEY', str),
+    ('github_token', 'GITHUB_TOKEN', str),
+    ('model', 'CODEMETRICS_MODEL', str),
+    ('max_tokens', 'CODEMETRICS_MAX_TOKENS', int),
+    ('temperature', 'CODEMETRICS_TEMPERATURE', float),
+    ('cache_enabled', 'CODEMETRICS_CACHE_ENABLED', _parse_bool),
+    ('output_dir', 'CODEMETRICS_OUTPUT_DIR', str),
+)
+
+
+def default_cache_dir() -> str:
+    """Per-user cache directory, kept out of the repositories being scanned."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "codemetrics")
+
+
 @dataclass
 class Config:
     """Configuration class for CodeMetrics"""
     
     # API Configuration
-    anthropic_api_key: str = field(default_factory=lambda: os.getenv('ANTHROPIC_API_KEY', ''))
-    github_token: str = field(default_factory=lambda: os.getenv('GITHUB_TOKEN', ''))
+    # Read per instance (not at import) so keys exported after import still apply
+    anthropic_api_key: str = field(default_factory=functools.partial(os.environ.get, 'ANTHROPIC_API_KEY', ''))
+    github_token: str = field(default_factory=functools.partial(os.environ.get, 'GITHUB_TOKEN', ''))
     
     # AI Model Configuration
     model: str = "claude-3-5-sonnet-20241022"
     max_tokens: int = 8192
     temperature: float = 0.3
+    max_context_tokens: int = 200000
     
     # Analysis Configuration
     max_file_size_kb: int = 2000
     max_workers: int = 4
     chunk_size_lines: int = 200
     
+    # Prompt Configuration
+    max_field_chars: int = 2000
+    prompt_exclude_keys: list = field(default_factory=functools.partial(list, DEFAULT_PROMPT_EXCLUDE_KEYS))
+    oversize_keep_keys: list = field(default_factory=functools.partial(list, DEFAULT_OVERSIZE_KEEP_KEYS))
+    
     # Caching Configuration
     cache_enabled: bool = True
-    cache_dir: str = ".codemetrics_cache"
+    cache_dir: str = field(default_factory=default_cache_dir)
     cache_ttl_hours: int = 24
+    cache_similarity_threshold: Optional[float] = None
     
     # Retry Configuration
     max_retries: int = 3
     retry_delay: float = 2.0
     
+    # Batch Configuration
+    batch_poll_interval: float = 30.0
+    batch_timeout: float = 3600.0
+    
+    # Concurrency Configuration
+    max_concurrent_requests: int = 8
+    analysis_timeout: float = 60.0
+    
     # Dashboard Configuration
     dashboard_host: str = "localhost"
     dashboard_port: int = 8080
     dashboard_debug: bool = False
+    dashboard_x_sendfile: bool = False
+    dashboard_threads: int = 8
     
     # Ecosystem Configuration
-    ecosystem_repos: list = field(default_factory=lambda: [
-        "Jita81/Standardized-Modules-Framework-v1.0.0",
-        "Jita81/CODEREVIEW",
-        "Jita81/CODECREATE",
-        "Jita81/CODETEST",
-        "Jita81/CODEMETRICS"
-    ])
+    ecosystem_repos: list = field(default_factory=functools.partial(list, DEFAULT_ECOSYSTEM_REPOS))
     
     # Output Configuration
     output_dir: str = "reports"
@@ -76,33 +137,17 @@ class Config:
                     break
         
         if config_file and config_file.exists():
-            with open(config_file, 'r') as f:
-                config_data = yaml.safe_load(f) or {}
+            resolved = config_file.resolve()
+            # Copy so callers (and env overrides below) never mutate the cached parse
+            config_data = copy.deepcopy(_read_config_file(str(resolved), resolved.stat().st_mtime_ns))
         
-        # Override with environment variables
-        env_overrides = {
-            'anthropic_api_key': os.getenv('ANTHROPIC_API_KEY'),
-            'github_token': os.getenv('GITHUB_TOKEN'),
-            'model': os.getenv('CODEMETRICS_MODEL'),
-            'max_tokens': os.getenv('CODEMETRICS_MAX_TOKENS'),
-            'temperature': os.getenv('CODEMETRICS_TEMPERATURE'),
-            'cache_enabled': os.getenv('CODEMETRICS_CACHE_ENABLED'),
-            'output_dir': os.getenv('CODEMETRICS_OUTPUT_DIR'),
-        }
+        config = cls(**config_data)
         
-        # Apply non-None environment overrides
-        for key, value in env_overrides.items():
-            if value is not None:
-                if key in ['max_tokens']:
-                    config_data[key] = int(value)
-                elif key in ['temperature']:
-                    config_data[key] = float(value)
-                elif key in ['cache_enabled']:
-                    config_data[key] = value.lower() in ('true', '1', 'yes', 'on')
-                else:
-                    config_data[key] = value
+        # Override with environment variables
+        for name, env_var, cast in _ENV_OVERRIDES:
+            _apply_env(config, name, env_var, cast)
         
-        return cls(**config_data)
+        return config
     
     def save(self, config_path: str) -> None:
         """Save configuration to file"""
@@ -114,17 +159,28 @@ class Config:
             'model': self.model,
             'max_tokens': self.max_tokens,
             'temperature': self.temperature,
+            'max_context_tokens': self.max_context_tokens,
             'max_file_size_kb': self.max_file_size_kb,
             'max_workers': self.max_workers,
             'chunk_size_lines': self.chunk_size_lines,
+            'max_field_chars': self.max_field_chars,
+            'prompt_exclude_keys': self.prompt_exclude_keys,
+            'oversize_keep_keys': self.oversize_keep_keys,
             'cache_enabled': self.cache_enabled,
             'cache_dir': self.cache_dir,
             'cache_ttl_hours': self.cache_ttl_hours,
+            'cache_similarity_threshold': self.cache_similarity_threshold,
             'max_retries': self.max_retries,
             'retry_delay': self.retry_delay,
+            'batch_poll_interval': self.batch_poll_interval,
+            'batch_timeout': self.batch_timeout,
+            'max_concurrent_requests': self.max_concurrent_requests,
+            'analysis_timeout': self.analysis_timeout,
             'dashboard_host': self.dashboard_host,
             'dashboard_port': self.dashboard_port,
             'dashboard_debug': self.dashboard_debug,
+            'dashboard_x_sendfile': self.dashboard_x_sendfile,
+            'dashboard_threads': self.dashboard_threads,
             'ecosystem_repos': self.ecosystem_repos,
             'output_dir': self.output_dir,
             'output_format': self.output_format,
@@ -2,120 +2,101 @@
 Web dashboard for CodeMetrics analytics
 """
 
-import json
+import gzip
+import hashlib
+from html import escape
+import threading
 import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List
-from datetime import datetime, timedelta
+from typing import BinaryIO, Dict, Any, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
 
 try:
-    from flask import Flask, render_template, jsonify, request, send_from_directory
+    from flask import Flask, Response, render_template, request
 except ImportError:
     Flask = None
     print("Flask not installed. Dashboard functionality requires: pip install flask")
 
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    from waitress import serve
+except ImportError:
+    serve = None
+
 from .config import Config
 from .collector import DataCollector
-from .analyzer import MetricsAnalyzer
+from .analyzer import MetricsAnalyzer, encode_json
 
-class Dashboard:
-    """Web-based analytics dashboard"""
-    
-    def __init__(self, config: Config):
-        self.config = config
-        self.app = None
-        self.collector = DataCollector(config)
-        self.analyzer = MetricsAnalyzer(config)
-        
-        if Flask:
-            self._setup_flask_app()
-    
-    def _setup_flask_app(self):
-        """Initialize Flask application"""
-        
-        self.app = Flask(__name__, 
-                        template_folder='templates',
-                        static_folder='static')
-        
-        # Main dashboard route
-        @self.app.route('/')
-        def dashboard():
-            return self._render_dashboard()
-        
-        # API routes
-        @self.app.route('/api/analyze', methods=['POST'])
-        def api_analyze():
-            return self._api_analyze()
-        
-        @self.app.route('/api/metrics/<project_name>')
-        def api_metrics(project_name):
-            return self._api_get_metrics(project_name)
-        
-        @self.app.route('/api/ecosystem-health')
-        def api_ecosystem_health():
-            return self._api_ecosystem_health()
-        
-        # Static file serving
-        @self.app.route('/static/<path:filename>')
-        def static_files(filename):
-            return send_from_directory('static', filename)
-    
-    def run(self, host: str = None, port: int = None, debug: bool = None):
-        """Start the dashboard server"""
-        
-        if not self.app:
-            raise RuntimeError("Flask not available. Install with: pip install flask")
-        
-        host = host or self.config.dashboard_host
-        port = port or self.config.dashboard_port
-        debug = debug or self.config.dashboard_debug
-        
-        print(f"🚀 CodeMetrics Dashboard starting at http://{host}:{port}")
-        self.app.run(host=host, port=port, debug=debug)
-    
-    def _render_dashboard(self) -> str:
-        """Render the main dashboard page"""
-        
-        # For now, return a simple HTML page
-        # In a full implementation, this would use proper templates
-        return f"""
+# Dashboards poll every 30s; serve one serialized health payload for this long
+ECOSYSTEM_HEALTH_TTL = 15.0
+METRICS_CACHE_SIZE = 256
+ANALYSIS_JOB_HISTORY = 256
+
+class AnalyzeRequest(BaseModel):
+    """Body accepted by POST /api/analyze"""
+    project_path: str = '.'
+    analysis_type: Literal['full', 'performance', 'quality', 'security'] = 'full'
+
+# Built once; parses and validates the raw body in a single pydantic-core pass
+_ANALYZE_REQUEST_ADAPTER = TypeAdapter(AnalyzeRequest)
+
+def _validation_message(error: ValidationError) -> str:
+    """One-line summary of a request validation error"""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc']) or 'body'}: {item['msg']}"
+        for item in error.errors(include_url=False)
+    )
+
+_DASHBOARD_PREFIX = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>CodeMetrics Dashboard</title>
-    <style>
-        body {{ 
+    <style>"""
+
+_DASHBOARD_CSS = """
+        body { 
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             margin: 0; padding: 20px; background: #f5f5f5;
-        }}
-        .header {{ 
+        }
+        .header { 
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white; padding: 20px; border-radius: 10px; margin-bottom: 20px;
-        }}
-        .metrics-grid {{ 
+        }
+        .metrics-grid { 
             display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
             gap: 20px; margin-bottom: 20px;
-        }}
-        .metric-card {{ 
+        }
+        .metric-card { 
             background: white; padding: 20px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .score {{ font-size: 2em; font-weight: bold; color: #667eea; }}
-        .ecosystem-status {{ 
+        }
+        .score { font-size: 2em; font-weight: bold; color: #667eea; }
+        .ecosystem-status { 
             background: white; padding: 20px; border-radius: 10px; box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .status-item {{ 
+        }
+        .status-item { 
             display: flex; justify-content: space-between; padding: 10px 0; border-bottom: 1px solid #eee;
-        }}
-        .status-active {{ color: #4CAF50; }}
-        .status-pending {{ color: #FF9800; }}
-        button {{
+        }
+        .status-active { color: #4CAF50; }
+        .status-pending { color: #FF9800; }
+        button {
             background: #667eea; color: white; border: none; padding: 10px 20px;
             border-radius: 5px; cursor: pointer; margin: 5px;
-        }}
-        button:hover {{ background: #5a6fd8; }}
-    </style>
+        }
+        button:hover { background: #5a6fd8; }
+    """
+
+_DASHBOARD_BODY = """</style>
 </head>
 <body>
     <div class="header">
@@ -188,23 +169,23 @@ class Dashboard:
         // Load initial metrics
         refreshMetrics();
         
-        function refreshMetrics() {{
+        function refreshMetrics() {
             // Simulate loading metrics - in real implementation, this would call the API
-            setTimeout(() => {{
+            setTimeout(() => {
                 document.getElementById('performance-score').textContent = '87';
                 document.getElementById('quality-score').textContent = '92';
                 document.getElementById('security-score').textContent = '89';
                 document.getElementById('ecosystem-health').textContent = '94';
-            }}, 1000);
-        }}
+            }, 1000);
+        }
         
-        function runAnalysis() {{
+        function runAnalysis() {
             alert('🔍 Starting analysis... This feature will trigger the analytics engine.');
-        }}
+        }
         
-        function generateReport() {{
+        function generateReport() {
             alert('📋 Generating report... This will create a comprehensive analytics report.');
-        }}
+        }
         
         // Auto-refresh every 30 seconds
         setInterval(refreshMetrics, 30000);
@@ -212,127 +193,45 @@ class Dashboard:
 </body>
 </html>
         """
-    
-    def _api_analyze(self) -> Dict[str, Any]:
-        """API endpoint for running analysis"""
-        
-        try:
-            data = request.get_json()
-            project_path = data.get('project_path', '.')
-            analysis_type = data.get('analysis_type', 'full')
-            
-            # Collect data and analyze
-            project_data = self.collector.collect_project_data(project_path, analysis_type)
-            results = self.analyzer.analyze(project_data, analysis_type)
-            
-            return jsonify({
-                'success': True,
-                'results': {
-                    'performance_score': results.performance_score,
-                    'quality_score': results.quality_score,
-                    'security_score': results.security_score,
-                    'key_findings': results.key_findings,
-                    'recommendations': results.recommendations,
-                    'timestamp': results.timestamp
-                }
-            })
-            
-        except Exception as e:
-            return jsonify({'success': False, 'error': str(e)}), 500
-    
-    def _api_get_metrics(self, project_name: str) -> Dict[str, Any]:
-        """API endpoint for getting project metrics"""
-        
-        # In a real implementation, this would load from cache/database
-        return jsonify({
-            'project_name': project_name,
-            'metrics': {
-                'performance_score': 87,
-                'quality_score': 92,
-                'security_score': 89,
-                'last_updated': time.time()
-            }
-        })
-    
-    def _api_ecosystem_health(self) -> Dict[str, Any]:
-        """API endpoint for ecosystem health check"""
-        
-        # Simulate ecosystem health check
-        health_data = {
-            'overall_health': 94,
-            'components': {
-                'standardized_framework': {
-                    'status': 'active',
-                    'health_score': 95,
-                    'last_activity': time.time() - 3600  # 1 hour ago
-                },
-                'codecreate': {
-                    'status': 'active',
-                    'health_score': 92,
-                    'last_activity': time.time() - 1800  # 30 minutes ago
-                },
-                'codereview': {
-                    'status': 'active', 
-                    'health_score': 97,
-                    'last_activity': time.time() - 900   # 15 minutes ago
-                },
-                'codetest': {
-                    'status': 'active',
-                    'health_score': 90,
-                    'last_activity': time.time() - 1200  # 20 minutes ago
-                },
-                'codemetrics': {
-                    'status': 'active',
-                    'health_score': 93,
-                    'last_activity': time.time()         # Now
-                }
-            },
-            'integration_score': 91,
-            'performance_trends': 'improving',
-            'last_check': time.time()
-        }
-        
-        return jsonify(health_data)
-    
-    def generate_static_report(self, analysis_results: Dict[str, Any], output_path: str) -> None:
-        """Generate a static HTML report"""
-        
-        report_html = f"""
+
+_REPORT_CSS = """
+        body { font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 40px; }
+        .header { text-align: center; margin-bottom: 40px; }
+        .scores { display: flex; justify-content: space-around; margin: 40px 0; }
+        .score-card { text-align: center; padding: 20px; border: 1px solid #ddd; border-radius: 10px; }
+        .score { font-size: 3em; font-weight: bold; color: #667eea; }
+        .findings, .recommendations { margin: 30px 0; }
+        .findings h3, .recommendations h3 { color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px; }
+        ul { list-style-type: none; padding: 0; }
+        li { padding: 10px; margin: 5px 0; background: #f8f9fa; border-radius: 5px; }
+    """
+
+_REPORT_HEADER = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>CodeMetrics Analysis Report</title>
-    <style>
-        body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif; margin: 40px; }}
-        .header {{ text-align: center; margin-bottom: 40px; }}
-        .scores {{ display: flex; justify-content: space-around; margin: 40px 0; }}
-        .score-card {{ text-align: center; padding: 20px; border: 1px solid #ddd; border-radius: 10px; }}
-        .score {{ font-size: 3em; font-weight: bold; color: #667eea; }}
-        .findings, .recommendations {{ margin: 30px 0; }}
-        .findings h3, .recommendations h3 {{ color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px; }}
-        ul {{ list-style-type: none; padding: 0; }}
-        li {{ padding: 10px; margin: 5px 0; background: #f8f9fa; border-radius: 5px; }}
-    </style>
+    <style>{css}</style>
 </head>
 <body>
     <div class="header">
         <h1>📊 CodeMetrics Analysis Report</h1>
-        <p>Generated on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+        <p>Generated on {generated}</p>
     </div>
     
     <div class="scores">
         <div class="score-card">
-            <div class="score">{analysis_results.get('performance_score', 0)}</div>
+            <div class="score">{performance_score}</div>
             <h4>Performance Score</h4>
         </div>
         <div class="score-card">
-            <div class="score">{analysis_results.get('quality_score', 0)}</div>
+            <div class="score">{quality_score}</div>
             <h4>Quality Score</h4>
         </div>
         <div class="score-card">
-            <div class="score">{analysis_results.get('security_score', 0)}</div>
+            <div class="score">{security_score}</div>
             <h4>Security Score</h4>
         </div>
     </div>
@@ -340,20 +239,366 @@ class Dashboard:
     <div class="findings">
         <h3>🔍 Key Findings</h3>
         <ul>
-            {''.join(f'<li>{finding}</li>' for finding in analysis_results.get('key_findings', []))}
+            """
+
+_REPORT_MIDDLE = """
         </ul>
     </div>
     
     <div class="recommendations">
         <h3>💡 Recommendations</h3>
         <ul>
-            {''.join(f'<li>{rec}</li>' for rec in analysis_results.get('recommendations', []))}
+            """.encode('utf-8')
+
+_REPORT_FOOTER = b"""
         </ul>
     </div>
 </body>
 </html>
         """
+
+_LI_TEMPLATE = b'<li>%s</li>'
+
+def _write_items(f: BinaryIO, items: List[Any]) -> None:
+    """Stream items to a binary file as escaped <li> elements"""
+    for item in items:
+        f.write(_LI_TEMPLATE % escape(str(item)).encode('utf-8'))
+
+def _json_response(payload: Any, status: int = 200) -> "Response":
+    """JSON response encoded straight to bytes by the fastest installed backend"""
+    return Response(encode_json(payload), status=status, mimetype='application/json')
+
+def _etag(body: bytes) -> str:
+    """Strong validator for a serialized body"""
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+def _cached_json_response(body: bytes, etag: str, cache_control: str) -> "Response":
+    """Serve a pre-serialized JSON body, answering matching If-None-Match with 304"""
+    
+    response = Response(body, mimetype='application/json')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = cache_control
+    return response.make_conditional(request)
+
+class Dashboard:
+    """Web-based analytics dashboard"""
+    
+    _ECO_TEMPLATE = {
+        'overall_health': 94,
+        'components': {
+            'standardized_framework': {'status': 'active', 'health_score': 95},
+            'codecreate': {'status': 'active', 'health_score': 92},
+            'codereview': {'status': 'active', 'health_score': 97},
+            'codetest': {'status': 'active', 'health_score': 90},
+            'codemetrics': {'status': 'active', 'health_score': 93}
+        },
+        'integration_score': 91,
+        'performance_trends': 'improving'
+    }
+    
+    # Seconds since each component's last activity
+    _ECO_ACTIVITY_AGE = {
+        'standardized_framework': 3600,  # 1 hour ago
+        'codecreate': 1800,              # 30 minutes ago
+        'codereview': 900,               # 15 minutes ago
+        'codetest': 1200,                # 20 minutes ago
+        'codemetrics': 0                 # Now
+    }
+    
+    def __init__(self, config: Config):
+        self.config = config
+        self.app = None
+        self.collector = DataCollector(config)
+        self.analyzer = MetricsAnalyzer(config)
+        
+        # (built_at, body, etag); replaced as a whole so readers never need the lock
+        self._eco_cache = (0.0, b'', '')
+        self._eco_body_template, self._eco_activity_ages = self._ecosystem_health_template()
+        self._eco_lock = threading.Lock()
+        
+        # Serialized /api/metrics (body, etag) pairs by project, least recently used first
+        self._metrics_cache: "OrderedDict[str, Tuple[bytes, str]]" = OrderedDict()
+        self._metrics_lock = threading.Lock()
+        
+        # Analyses run off the request thread; each job resolves to (status, body)
+        self._pool = ThreadPoolExecutor(max_workers=config.max_workers, thread_name_prefix='codemetrics-analyze')
+        self._jobs: "OrderedDict[str, Future]" = OrderedDict()
+        self._jobs_lock = threading.Lock()
+        
+        # Report directories already created by this dashboard
+        self._ensured_dirs: set = set()
+        
+        if Flask:
+            self._setup_flask_app()
+        
+        # The page has no per-request data, so render, hash and compress it once
+        self._dashboard_html = self._render_dashboard().encode('utf-8')
+        self._dashboard_etag = _etag(self._dashboard_html)
+        self._dashboard_encodings = {'gzip': gzip.compress(self._dashboard_html, compresslevel=6, mtime=0)}
+        if brotli is not None:
+            self._dashboard_encodings['br'] = brotli.compress(self._dashboard_html, quality=5)
+    
+    def _setup_flask_app(self):
+        """Initialize Flask application"""
+        
+        self.app = Flask(__name__, 
+                        template_folder='templates',
+                        static_folder='static')
+        
+        # Main dashboard route
+        @self.app.route('/')
+        def dashboard():
+            return self._serve_dashboard()
+        
+        # API routes
+        @self.app.route('/api/analyze', methods=['POST'])
+        def api_analyze():
+            return self._api_analyze()
+        
+        @self.app.route('/api/analyze/<job_id>')
+        def api_analyze_status(job_id):
+            return self._api_analyze_status(job_id)
+        
+        @self.app.route('/api/metrics/<project_name>')
+        def api_metrics(project_name):
+            return self._api_get_metrics(project_name)
         
-        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-        with open(output_path, 'w') as f:
-            f.write(report_html)
+        @self.app.route('/api/ecosystem-health')
+        def api_ecosystem_health():
+            return self._api_ecosystem_health()
+        
+        # Flask's built-in /static route serves assets with conditional GET; let
+        # browsers cache them for a day, and hand file bodies to the front-end
+        # server (nginx/uwsgi sendfile) when it supports X-Sendfile
+        self.app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 86400
+        self.app.use_x_sendfile = self.config.dashboard_x_sendfile
+    
+    def run(self, host: str = None, port: int = None, debug: bool = None):
+        """Start the dashboard server"""
+        
+        if not self.app:
+            raise RuntimeError("Flask not available. Install with: pip install flask")
+        
+        host = host or self.config.dashboard_host
+        port = port or self.config.dashboard_port
+        debug = debug or self.config.dashboard_debug
+        
+        print(f"🚀 CodeMetrics Dashboard starting at http://{host}:{port}")
+        
+        # The Werkzeug dev server is only for debugging; waitress serves requests
+        # on a thread pool so a slow /api/analyze doesn't block the page
+        if serve is not None and not debug:
+            serve(self.app, host=host, port=port, threads=self.config.dashboard_threads)
+        else:
+            self.app.run(host=host, port=port, debug=debug, threaded=True)
+    
+    def _serve_dashboard(self) -> "Response":
+        """Serve the pre-rendered dashboard page, answering revalidations with 304
+        
+        Clients that accept Brotli or gzip get the matching pre-compressed body.
+        """
+        
+        encoding = self._pick_encoding()
+        if encoding is None:
+            response = Response(self._dashboard_html, mimetype='text/html')
+            response.set_etag(self._dashboard_etag)
+        else:
+            response = Response(self._dashboard_encodings[encoding], mimetype='text/html')
+            response.headers['Content-Encoding'] = encoding
+            # Each representation needs its own strong validator
+            response.set_etag(f"{self._dashboard_etag}-{encoding}")
+        
+        response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = 'public, max-age=300'
+        return response.make_conditional(request)
+    
+    def _pick_encoding(self) -> Optional[str]:
+        """Preferred pre-compressed encoding the client accepts, if any"""
+        
+        accepted = request.accept_encodings
+        for encoding in ('br', 'gzip'):
+            if encoding in self._dashboard_encodings and accepted.quality(encoding) > 0:
+                return encoding
+        return None
+    
+    def _render_dashboard(self) -> str:
+        """Render the main dashboard page"""
+        
+        # For now, return a simple HTML page
+        # In a full implementation, this would use proper templates
+        return _DASHBOARD_PREFIX + _DASHBOARD_CSS + _DASHBOARD_BODY
+    
+    def _api_analyze(self) -> Dict[str, Any]:
+        """API endpoint for starting an analysis
+        
+        Collection and analysis can take seconds, so they run on the job pool
+        and the client polls ``/api/analyze/<job_id>`` for the result.
+        """
+        
+        try:
+            # Validate the raw body directly; Flask need not keep a copy of it
+            data = _ANALYZE_REQUEST_ADAPTER.validate_json(request.get_data(cache=False))
+        except ValidationError as e:
+            return _json_response({'success': False, 'error': f'Invalid request body: {_validation_message(e)}'}, 400)
+        
+        job_id = uuid.uuid4().hex
+        future = self._pool.submit(self._run_analysis, data)
+        
+        with self._jobs_lock:
+            self._jobs[job_id] = future
+            # Forget the oldest finished jobs once the history is full
+            for old_id in list(self._jobs):
+                if len(self._jobs) <= ANALYSIS_JOB_HISTORY:
+                    break
+                if self._jobs[old_id].done():
+                    del self._jobs[old_id]
+        
+        return _json_response({'success': True, 'status': 'pending', 'job_id': job_id}, 202)
+    
+    def _api_analyze_status(self, job_id: str) -> Dict[str, Any]:
+        """API endpoint for polling an analysis job"""
+        
+        with self._jobs_lock:
+            future = self._jobs.get(job_id)
+        
+        if future is None:
+            return _json_response({'success': False, 'error': f'Unknown job: {job_id}'}, 404)
+        
+        if not future.done():
+            return _json_response({'success': True, 'status': 'pending', 'job_id': job_id}, 202)
+        
+        status, body = future.result()
+        return Response(body, status=status, mimetype='application/json')
+    
+    def _run_analysis(self, data: AnalyzeRequest) -> Tuple[int, bytes]:
+        """Collect and analyze a project, serializing the outcome once for every poll"""
+        
+        try:
+            project_path = data.project_path
+            analysis_type = data.analysis_type
+            
+            # Collect data and analyze
+            project_data = self.collector.collect_project_data(project_path, analysis_type)
+            results = self.analyzer.analyze(project_data, analysis_type)
+            self.invalidate_metrics(Path(project_data.get('project_info', {}).get('path', project_path)).name)
+            
+            # AnalysisResult is a dataclass; the encoder walks its fields directly
+            return 200, encode_json({'success': True, 'results': results})
+        
+        except Exception as e:
+            return 500, encode_json({'success': False, 'error': str(e)})
+    
+    def _api_get_metrics(self, project_name: str) -> Dict[str, Any]:
+        """API endpoint for getting project metrics"""
+        
+        body, etag = self._metrics_entry(project_name)
+        # Metrics change whenever an analysis runs, so clients always revalidate
+        return _cached_json_response(body, etag, 'no-cache')
+    
+    def _metrics_entry(self, project_name: str) -> Tuple[bytes, str]:
+        """Serialized metrics for a project and their ETag, built once until invalidated"""
+        
+        with self._metrics_lock:
+            entry = self._metrics_cache.get(project_name)
+            if entry is not None:
+                self._metrics_cache.move_to_end(project_name)
+                return entry
+        
+        # In a real implementation, this would load from cache/database
+        body = encode_json({
+            'project_name': project_name,
+            'metrics': {
+                'performance_score': 87,
+                'quality_score': 92,
+                'security_score': 89,
+                'last_updated': time.time()
+            }
+        })
+        
+        entry = (body, _etag(body))
+        
+        with self._metrics_lock:
+            self._metrics_cache[project_name] = entry
+            if len(self._metrics_cache) > METRICS_CACHE_SIZE:
+                self._metrics_cache.popitem(last=False)
+        
+        return entry
+    
+    def invalidate_metrics(self, project_name: Optional[str] = None) -> None:
+        """Drop cached metrics for one project, or for all projects"""
+        
+        with self._metrics_lock:
+            if project_name is None:
+                self._metrics_cache.clear()
+            else:
+                self._metrics_cache.pop(project_name, None)
+    
+    def _api_ecosystem_health(self) -> Dict[str, Any]:
+        """API endpoint for ecosystem health check"""
+        
+        # One clock read serves the freshness checks and the payload timestamps
+        now = time.time()
+        built_at, body, etag = self._eco_cache
+        if not body or now - built_at >= ECOSYSTEM_HEALTH_TTL:
+            with self._eco_lock:
+                built_at, body, etag = self._eco_cache
+                if not body or now - built_at >= ECOSYSTEM_HEALTH_TTL:
+                    body = self._eco_body_template % (
+                        *(now - age for age in self._eco_activity_ages), now
+                    )
+                    etag = _etag(body)
+                    self._eco_cache = (now, body, etag)
+        
+        return _cached_json_response(body, etag, f'max-age={int(ECOSYSTEM_HEALTH_TTL)}')
+    
+    def _ecosystem_health_template(self) -> Tuple[bytes, Tuple[int, ...]]:
+        """Serialize the health payload once with ``%f`` slots for its timestamps
+        
+        Returns the byte template and the activity age of each component, in
+        slot order; the final slot is ``last_check``.
+        """
+        
+        placeholder = '@@timestamp@@'
+        components = {
+            name: {**component, 'last_activity': placeholder}
+            for name, component in self._ECO_TEMPLATE['components'].items()
+        }
+        body = encode_json({**self._ECO_TEMPLATE, 'components': components, 'last_check': placeholder})
+        template = body.replace(b'%', b'%%').replace(f'"{placeholder}"'.encode('ascii'), b'%f')
+        
+        return template, tuple(self._ECO_ACTIVITY_AGE[name] for name in components)
+    
+    def generate_static_report(self, analysis_results: Dict[str, Any], output_path: str) -> None:
+        """Generate a static HTML report
+        
+        The page is streamed to disk piece by piece, so long finding lists are
+        never held as one string.
+        """
+        
+        header = _REPORT_HEADER.format(
+            css=_REPORT_CSS,
+            generated=time.strftime('%Y-%m-%d %H:%M:%S'),
+            performance_score=escape(str(analysis_results.get('performance_score', 0))),
+            quality_score=escape(str(analysis_results.get('quality_score', 0))),
+            security_score=escape(str(analysis_results.get('security_score', 0)))
+        )
+        
+        self._ensure_dir(output_path)
+        with open(output_path, 'wb', buffering=1 << 20) as f:
+            f.write(header.encode('utf-8'))
+            _write_items(f, analysis_results.get('key_findings', []))
+            f.write(_REPORT_MIDDLE)
+            _write_items(f, analysis_results.get('recommendations', []))
+            f.write(_REPORT_FOOTER)
+
+    def _ensure_dir(self, path: str) -> None:
+        """Create the parent directory of ``path`` the first time it is used"""
+        
+        parent = str(Path(path).parent)
+        if parent not in self._ensured_dirs:
+            Path(parent).mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(parent)
+
+def create_app(config_path: Optional[str] = None) -> "Flask":
+    """WSGI application factory, e.g. ``gunicorn 'codemetrics.dashboard:create_app()'``"""
+    return Dashboard(Config.load(config_path)).app
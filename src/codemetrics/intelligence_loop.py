@@ -10,15 +10,21 @@ This module implements an intelligent feedback loop that:
 6. Uses Claude for analysis and improvement generation
 """
 
+import hashlib
+import heapq
+import importlib.util
 import json
 import asyncio
-import subprocess
+import os
 import tempfile
 import shutil
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, field
+from typing import Dict, Final, Iterator, List, Any, Optional, Tuple
+from dataclasses import asdict, dataclass, field, is_dataclass
 from enum import Enum
 
 try:
@@ -27,11 +33,179 @@ try:
 except ImportError as e:
     raise ImportError(f"Required packages not installed: {e}. Run: pip install anthropic GitPython")
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .config import Config
 from .analyzer import MetricsAnalyzer
-from ..integrations.codecreate import CodeCreateIntegration
-from ..integrations.codereview import CodeReviewIntegration
-from ..integrations.codetest import CodeTestIntegration
+from ._cache import ResponseCache
+from ._client import get_client
+from ._streaming import JSONBlockScanner
+from integrations.codecreate import CodeCreateIntegration
+from integrations.codereview import CodeReviewIntegration
+from integrations.codetest import CodeTestIntegration
+
+# Concurrent Claude requests per loop, to stay within API rate limits
+MAX_CONCURRENT_CLAUDE_CALLS = 5
+CLAUDE_EXECUTOR_WORKERS = 8
+INTEGRATION_EXECUTOR_WORKERS = 16
+IMPROVEMENT_CACHE_SIZE = 256
+
+# pytest's exit code when a selection matches no tests, and the words reserved in -k expressions
+PYTEST_NO_TESTS_COLLECTED = 5
+_PYTEST_K_KEYWORDS = frozenset({"and", "or", "not", "True", "False", "None"})
+
+# Static prompt blocks; kept byte-identical across calls so Claude's prompt cache can reuse them
+_CACHE_EPHEMERAL: Final[Dict[str, str]] = {"type": "ephemeral"}
+
+_ANALYST_ROLE: Final[str] = """
+You are an expert AI system analyst for the Automated Agile Framework ecosystem. Analyze the following feedback data from CodeCreate (generation), CodeReview (quality/security), and CodeTest (testing/compliance) processes.
+"""
+
+_ANALYSIS_SCHEMA: Final[str] = """
+Please provide analysis in the following JSON format:
+{
+    "root_cause_analysis": [
+        {
+            "root_cause": "Description of underlying issue",
+            "affected_processes": ["generate", "review", "test"],
+            "severity": "low|medium|high|critical",
+            "confidence": 0.0-1.0,
+            "evidence": ["Evidence point 1", "Evidence point 2"]
+        }
+    ],
+    "pattern_insights": {
+        "recurring_issues": ["Issue 1", "Issue 2"],
+        "cross_process_correlations": [
+            {
+                "processes": ["process1", "process2"],
+                "correlation": "Description",
+                "strength": 0.0-1.0
+            }
+        ],
+        "trend_analysis": {
+            "improving_areas": ["Area 1"],
+            "degrading_areas": ["Area 2"],
+            "stable_areas": ["Area 3"]
+        }
+    },
+    "improvement_priorities": [
+        {
+            "priority": 1,
+            "focus_area": "Description",
+            "expected_impact": "high|medium|low",
+            "effort_required": "high|medium|low"
+        }
+    ]
+}
+"""
+
+_IMPROVER_ROLE: Final[str] = """
+You are an expert software engineer improving the Automated Agile Framework ecosystem. Based on the priority area and feedback analysis, generate specific code improvements.
+"""
+
+_IMPROVEMENTS_SCHEMA: Final[str] = """
+Generate improvements in JSON format:
+{
+    "improvements": [
+        {
+            "process_type": "generate|review|test|framework",
+            "improvement_type": "bug_fix|performance|reliability|accuracy|feature",
+            "description": "Detailed description of the improvement",
+            "target_files": ["file1.py", "file2.py"],
+            "code_changes": [
+                {
+                    "file": "path/to/file.py",
+                    "change_type": "modify|add|delete",
+                    "description": "What this change does",
+                    "code": "Actual code to implement or modify"
+                }
+            ],
+            "confidence_score": 0.0-1.0,
+            "expected_impact": "high|medium|low",
+            "risk_level": "high|medium|low"
+        }
+    ]
+}
+"""
+
+_JSON_DECODER = json.JSONDecoder()
+
+def _extract_json_object(text: str) -> Optional[Dict[str, Any]]:
+    """Decode the first JSON object embedded in a response, skipping stray braces in prose"""
+    
+    start = text.find('{')
+    while start >= 0:
+        try:
+            obj, _ = _JSON_DECODER.raw_decode(text, start)
+            if isinstance(obj, dict):
+                return obj
+        except ValueError:
+            pass
+        start = text.find('{', start + 1)
+    return None
+
+def _prompt_default(obj: Any) -> Any:
+    """Encode values the stdlib JSON encoder doesn't handle, as orjson would"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if is_dataclass(obj):
+        return asdict(obj)
+    return str(obj)
+
+def _prompt_json(data: Any) -> str:
+    """Compact, key-sorted JSON for prompts; stable bytes keep prompt-cache prefixes reusable"""
+    
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), default=_prompt_default)
+
+def _cache_key_default(obj: Any) -> Any:
+    """Encode feedback values for cache keys, ignoring sub-day timestamp jitter"""
+    if isinstance(obj, datetime):
+        return obj.date().isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if is_dataclass(obj):
+        return asdict(obj)
+    return str(obj)
+
+def _cache_text(data: Dict[str, Any], *extra: Any) -> str:
+    """Canonical text identifying a Claude request for the response cache
+    
+    The collection timestamp differs on every run, so it is left out.
+    """
+    data = {key: value for key, value in data.items() if key != "collection_timestamp"}
+    return json.dumps([data, *extra], sort_keys=True, default=_cache_key_default)
+
+def _empty_analysis() -> Dict[str, Any]:
+    """The analysis Claude would give for feedback with nothing to report"""
+    return {
+        "root_cause_analysis": [],
+        "pattern_insights": {
+            "recurring_issues": [],
+            "cross_process_correlations": [],
+            "trend_analysis": {"improving_areas": [], "degrading_areas": [], "stable_areas": []}
+        },
+        "improvement_priorities": []
+    }
+
+_ANALYSIS_SYSTEM: Final[List[Dict[str, Any]]] = [
+    {"type": "text", "text": _ANALYST_ROLE},
+    {"type": "text", "text": _ANALYSIS_SCHEMA, "cache_control": _CACHE_EPHEMERAL}
+]
+
+_IMPROVEMENTS_SYSTEM: Final[List[Dict[str, Any]]] = [
+    {"type": "text", "text": _IMPROVER_ROLE},
+    {"type": "text", "text": _IMPROVEMENTS_SCHEMA, "cache_control": _CACHE_EPHEMERAL}
+]
 
 class ProcessType(Enum):
     """Types of processes in the ecosystem"""
@@ -47,7 +221,7 @@ class FeedbackSeverity(Enum):
     HIGH = "high"
     CRITICAL = "critical"
 
-@dataclass
+@dataclass(slots=True)
 class FeedbackItem:
     """Individual feedback item from ecosystem processes"""
     id: str
@@ -61,7 +235,7 @@ class FeedbackItem:
     affected_modules: List[str]
     context: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True)
 class ImprovementCandidate:
     """Candidate improvement for a process"""
     process_type: ProcessType
@@ -73,7 +247,7 @@ class ImprovementCandidate:
     expected_impact: str
     risk_level: str
 
-@dataclass
+@dataclass(slots=True)
 class IterationResult:
     """Result of testing an improvement iteration"""
     iteration_id: str
@@ -91,7 +265,7 @@ class EcosystemIntelligenceLoop:
     
     def __init__(self, config: Config):
         self.config = config
-        self.client = anthropic.Anthropic(api_key=config.anthropic_api_key)
+        self.client = get_client(config.anthropic_api_key)
         self.analyzer = MetricsAnalyzer(config)
         
         # Initialize integrations
@@ -102,13 +276,45 @@ class EcosystemIntelligenceLoop:
         # State management
         self.feedback_history: List[FeedbackItem] = []
         self.active_iterations: List[IterationResult] = []
-        self.improvement_cache: Dict[str, List[ImprovementCandidate]] = {}
+        # Parsed candidates by request digest, least recently used first
+        self.improvement_cache: "OrderedDict[str, List[ImprovementCandidate]]" = OrderedDict()
         
         # Configuration
         self.max_iterations = 10
         self.analysis_window_days = 30
         self.min_feedback_frequency = 3  # Minimum occurrences to consider
         
+        self._claude_semaphore = asyncio.Semaphore(MAX_CONCURRENT_CLAUDE_CALLS)
+        # Dedicated pools so Claude calls and integration I/O never queue behind each other
+        # or behind other users of the loop's default executor
+        self._claude_executor = ThreadPoolExecutor(
+            max_workers=CLAUDE_EXECUTOR_WORKERS, thread_name_prefix="claude"
+        )
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=INTEGRATION_EXECUTOR_WORKERS, thread_name_prefix="integrations"
+        )
+        
+        # Identical feedback within the analysis window reuses Claude's earlier answer
+        self.response_cache = ResponseCache(
+            Path(config.cache_dir) / "intelligence.db",
+            ttl_hours=self.analysis_window_days * 24,
+            similarity_threshold=None
+        ) if config.cache_enabled else None
+    
+    async def __aenter__(self) -> "EcosystemIntelligenceLoop":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.close()
+    
+    def close(self) -> None:
+        """Shut down the worker pools and close the response cache"""
+        
+        self._claude_executor.shutdown(wait=True)
+        self._io_executor.shutdown(wait=True)
+        if self.response_cache is not None:
+            self.response_cache.close()
+        
     async def run_intelligence_loop(self, target_repo_path: str) -> Dict[str, Any]:
         """Run the complete intelligence loop"""
         
@@ -153,44 +359,37 @@ class EcosystemIntelligenceLoop:
             "processes": {}
         }
         
-        # Collect from CodeCreate
-        try:
-            codecreate_metrics = self.codecreate.collect_generation_metrics()
-            codecreate_quality = self.codecreate.analyze_generation_quality()
-            
-            feedback_data["processes"]["codecreate"] = {
-                "metrics": codecreate_metrics,
-                "quality": codecreate_quality,
-                "feedback_items": self._extract_codecreate_feedback(codecreate_metrics, codecreate_quality)
-            }
-        except Exception as e:
-            feedback_data["processes"]["codecreate"] = {"error": str(e)}
+        # The six integration calls are independent blocking I/O, so run them concurrently
+        sources = (
+            ("codecreate", "quality", self._extract_codecreate_feedback,
+             self.codecreate.collect_generation_metrics, self.codecreate.analyze_generation_quality),
+            ("codereview", "trends", self._extract_codereview_feedback,
+             self.codereview.collect_review_metrics, self.codereview.analyze_security_trends),
+            ("codetest", "compliance", self._extract_codetest_feedback,
+             self.codetest.collect_testing_metrics, self.codetest.analyze_framework_compliance)
+        )
         
-        # Collect from CodeReview
-        try:
-            codereview_metrics = self.codereview.collect_review_metrics()
-            security_trends = self.codereview.analyze_security_trends()
-            
-            feedback_data["processes"]["codereview"] = {
-                "metrics": codereview_metrics,
-                "trends": security_trends,
-                "feedback_items": self._extract_codereview_feedback(codereview_metrics, security_trends)
-            }
-        except Exception as e:
-            feedback_data["processes"]["codereview"] = {"error": str(e)}
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(self._io_executor, call) for source in sources for call in source[3:]),
+            return_exceptions=True
+        )
         
-        # Collect from CodeTest
-        try:
-            codetest_metrics = self.codetest.collect_testing_metrics()
-            compliance_analysis = self.codetest.analyze_framework_compliance()
-            
-            feedback_data["processes"]["codetest"] = {
-                "metrics": codetest_metrics,
-                "compliance": compliance_analysis,
-                "feedback_items": self._extract_codetest_feedback(codetest_metrics, compliance_analysis)
-            }
-        except Exception as e:
-            feedback_data["processes"]["codetest"] = {"error": str(e)}
+        # A failing call only marks its own process as errored
+        for n, (process, detail_key, extract, _, _) in enumerate(sources):
+            metrics, details = results[2 * n:2 * n + 2]
+            try:
+                for outcome in (metrics, details):
+                    if isinstance(outcome, BaseException):
+                        raise outcome
+                
+                feedback_data["processes"][process] = {
+                    "metrics": metrics,
+                    detail_key: details,
+                    "feedback_items": extract(metrics, details)
+                }
+            except Exception as e:
+                feedback_data["processes"][process] = {"error": str(e)}
         
         # Analyze feedback patterns using Claude
         feedback_analysis = await self._analyze_feedback_patterns(feedback_data)
@@ -202,36 +401,42 @@ class EcosystemIntelligenceLoop:
         """Extract feedback items from CodeCreate data"""
         
         feedback_items = []
+        now = datetime.now()
         
         # Check generation success rate
-        if metrics.get("total_generations", 0) > 0:
-            success_rate = metrics.get("successful_generations", 0) / metrics["total_generations"]
+        total = metrics.get("total_generations", 0)
+        successful = metrics.get("successful_generations", 0)
+        if total > 0:
+            success_rate = successful / total
             if success_rate < 0.85:  # Below 85% success rate
                 feedback_items.append(FeedbackItem(
-                    id=f"codecreate_low_success_{datetime.now().strftime('%Y%m%d')}",
+                    id=f"codecreate_low_success_{now.strftime('%Y%m%d')}",
                     process_type=ProcessType.GENERATE,
                     severity=FeedbackSeverity.MEDIUM if success_rate > 0.70 else FeedbackSeverity.HIGH,
                     description=f"Generation success rate is low: {success_rate:.2%}",
-                    error_details=f"Only {metrics['successful_generations']} out of {metrics['total_generations']} generations succeeded",
-                    frequency=metrics["total_generations"] - metrics["successful_generations"],
-                    first_seen=datetime.now() - timedelta(days=7),
-                    last_seen=datetime.now(),
+                    error_details=f"Only {successful} out of {total} generations succeeded",
+                    frequency=total - successful,
+                    first_seen=now - timedelta(days=7),
+                    last_seen=now,
                     affected_modules=["generation_engine"]
                 ))
         
         # Check quality issues
         if quality.get("common_issues"):
+            two_weeks_ago = now - timedelta(days=14)
             for issue in quality["common_issues"]:
-                if issue["frequency"] > 0.1:  # More than 10% frequency
+                frequency = issue["frequency"]
+                if frequency > 0.1:  # More than 10% frequency
+                    name = issue["issue"]
                     feedback_items.append(FeedbackItem(
-                        id=f"codecreate_quality_{issue['issue'].replace(' ', '_')}",
+                        id=f"codecreate_quality_{name.replace(' ', '_')}",
                         process_type=ProcessType.GENERATE,
                         severity=FeedbackSeverity.MEDIUM,
-                        description=f"Common quality issue: {issue['issue']}",
-                        error_details=f"Occurs in {issue['frequency']:.1%} of generations",
-                        frequency=int(issue["frequency"] * 100),
-                        first_seen=datetime.now() - timedelta(days=14),
-                        last_seen=datetime.now(),
+                        description=f"Common quality issue: {name}",
+                        error_details=f"Occurs in {frequency:.1%} of generations",
+                        frequency=int(frequency * 100),
+                        first_seen=two_weeks_ago,
+                        last_seen=now,
                         affected_modules=["code_generation"]
                     ))
         
@@ -241,9 +446,11 @@ class EcosystemIntelligenceLoop:
         """Extract feedback items from CodeReview data"""
         
         feedback_items = []
+        now = datetime.now()
         
         # Check detection rates
         detection_rates = metrics.get("detection_rates", {})
+        ten_days_ago = now - timedelta(days=10)
         for vulnerability_type, rate in detection_rates.items():
             if rate < 0.85:  # Below 85% detection rate
                 feedback_items.append(FeedbackItem(
@@ -253,8 +460,8 @@ class EcosystemIntelligenceLoop:
                     description=f"Low detection rate for {vulnerability_type}",
                     error_details=f"Detection rate is only {rate:.1%}",
                     frequency=int((1 - rate) * 100),
-                    first_seen=datetime.now() - timedelta(days=10),
-                    last_seen=datetime.now(),
+                    first_seen=ten_days_ago,
+                    last_seen=now,
                     affected_modules=["security_analysis", vulnerability_type.replace("_", "-")]
                 ))
         
@@ -269,8 +476,8 @@ class EcosystemIntelligenceLoop:
                     description=f"Critical vulnerabilities found: {recent['critical']}",
                     error_details=f"Found {recent['critical']} critical and {recent['high']} high severity vulnerabilities",
                     frequency=recent["critical"],
-                    first_seen=datetime.now() - timedelta(days=30),
-                    last_seen=datetime.now(),
+                    first_seen=now - timedelta(days=30),
+                    last_seen=now,
                     affected_modules=["security_scanning"]
                 ))
         
@@ -280,10 +487,11 @@ class EcosystemIntelligenceLoop:
         """Extract feedback items from CodeTest data"""
         
         feedback_items = []
+        now = datetime.now()
         
         # Check compliance rates
-        if metrics.get("framework_compliance_rate", 0) < 0.90:
-            compliance_rate = metrics["framework_compliance_rate"]
+        compliance_rate = metrics.get("framework_compliance_rate", 0)
+        if compliance_rate < 0.90:
             feedback_items.append(FeedbackItem(
                 id="codetest_low_compliance",
                 process_type=ProcessType.TEST,
@@ -291,25 +499,28 @@ class EcosystemIntelligenceLoop:
                 description=f"Framework compliance rate is low: {compliance_rate:.1%}",
                 error_details=f"Compliance rate below 90% threshold",
                 frequency=int((1 - compliance_rate) * 100),
-                first_seen=datetime.now() - timedelta(days=14),
-                last_seen=datetime.now(),
+                first_seen=now - timedelta(days=14),
+                last_seen=now,
                 affected_modules=["framework_validation"]
             ))
         
         # Check module-specific issues
         module_coverage = metrics.get("module_type_coverage", {})
+        week_ago = now - timedelta(days=7)
         for module_type, data in module_coverage.items():
-            if data.get("success_rate", 0) < 0.85:
+            success_rate = data.get("success_rate", 0)
+            if success_rate < 0.85:
+                module_name = module_type.lower()
                 feedback_items.append(FeedbackItem(
-                    id=f"codetest_{module_type.lower()}_issues",
+                    id=f"codetest_{module_name}_issues",
                     process_type=ProcessType.TEST,
                     severity=FeedbackSeverity.MEDIUM,
                     description=f"Low success rate for {module_type} modules",
-                    error_details=f"Success rate: {data['success_rate']:.1%}",
+                    error_details=f"Success rate: {success_rate:.1%}",
                     frequency=data.get("tests_run", 0),
-                    first_seen=datetime.now() - timedelta(days=7),
-                    last_seen=datetime.now(),
-                    affected_modules=[module_type.lower()]
+                    first_seen=week_ago,
+                    last_seen=now,
+                    affected_modules=[module_name]
                 ))
         
         return feedback_items
@@ -317,148 +528,184 @@ class EcosystemIntelligenceLoop:
     async def _analyze_feedback_patterns(self, feedback_data: Dict[str, Any]) -> Dict[str, Any]:
         """Use Claude to analyze feedback patterns and root causes"""
         
-        prompt = f"""
-You are an expert AI system analyst for the Automated Agile Framework ecosystem. Analyze the following feedback data from CodeCreate (generation), CodeReview (quality/security), and CodeTest (testing/compliance) processes.
-
-Feedback Data:
-{json.dumps(feedback_data, indent=2, default=str)}
-
-Please provide analysis in the following JSON format:
-{{
-    "root_cause_analysis": [
-        {{
-            "root_cause": "Description of underlying issue",
-            "affected_processes": ["generate", "review", "test"],
-            "severity": "low|medium|high|critical",
-            "confidence": 0.0-1.0,
-            "evidence": ["Evidence point 1", "Evidence point 2"]
-        }}
-    ],
-    "pattern_insights": {{
-        "recurring_issues": ["Issue 1", "Issue 2"],
-        "cross_process_correlations": [
-            {{
-                "processes": ["process1", "process2"],
-                "correlation": "Description",
-                "strength": 0.0-1.0
-            }}
-        ],
-        "trend_analysis": {{
-            "improving_areas": ["Area 1"],
-            "degrading_areas": ["Area 2"],
-            "stable_areas": ["Area 3"]
-        }}
-    }},
-    "improvement_priorities": [
-        {{
-            "priority": 1,
-            "focus_area": "Description",
-            "expected_impact": "high|medium|low",
-            "effort_required": "high|medium|low"
-        }}
-    ]
-}}
-        """
+        # Without any feedback items there is nothing for Claude to find
+        total_items = sum(
+            len(process.get("feedback_items", []))
+            for process in feedback_data.get("processes", {}).values()
+            if isinstance(process, dict)
+        )
+        if total_items == 0:
+            return _empty_analysis()
+        
+        namespace = f"feedback_patterns:{self.config.model}"
+        cache_text = _cache_text(feedback_data)
         
         try:
-            response = await asyncio.get_event_loop().run_in_executor(
-                None, 
-                lambda: self.client.messages.create(
-                    model=self.config.model,
-                    max_tokens=4000,
-                    temperature=0.3,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-            )
+            ai_response = self._cached_response(namespace, cache_text)
+            fresh = ai_response is None
             
-            ai_response = response.content[0].text
+            if fresh:
+                # Only the feedback data varies; the role and schema live in the cached system blocks
+                content = f"Feedback Data:\n{_prompt_json(feedback_data)}"
+                ai_response = await asyncio.get_running_loop().run_in_executor(
+                    self._claude_executor, 
+                    lambda: self._stream_json_response(
+                        model=self.config.model,
+                        max_tokens=4000,
+                        temperature=0.3,
+                        system=_ANALYSIS_SYSTEM,
+                        messages=[{"role": "user", "content": content}]
+                    )
+                )
             
             # Extract JSON from response
-            start_idx = ai_response.find('{')
-            end_idx = ai_response.rfind('}') + 1
+            analysis = _extract_json_object(ai_response)
             
-            if start_idx >= 0 and end_idx > start_idx:
-                json_str = ai_response[start_idx:end_idx]
-                return json.loads(json_str)
+            if analysis is not None:
+                if fresh:
+                    self._store_response(namespace, cache_text, ai_response)
+                return analysis
             else:
                 return {"error": "Could not parse AI response", "raw_response": ai_response}
                 
         except Exception as e:
             return {"error": str(e)}
     
+    def _stream_json_response(self, **params: Any) -> str:
+        """Stream a Claude response, hanging up once its JSON object closes
+        
+        Returns the text received so far; trailing prose is never downloaded.
+        """
+        
+        scanner = JSONBlockScanner()
+        with self.client.messages.stream(**params) as stream:
+            for text in stream.text_stream:
+                if scanner.feed(text):
+                    break
+        return scanner.text()
+    
+    def _cached_response(self, namespace: str, cache_text: str) -> Optional[str]:
+        """Return Claude's stored answer for an identical request, if any"""
+        
+        if self.response_cache is None:
+            return None
+        return self.response_cache.get(namespace, cache_text)
+    
+    def _store_response(self, namespace: str, cache_text: str, ai_response: str) -> None:
+        """Remember a successfully parsed answer"""
+        
+        if self.response_cache is not None:
+            self.response_cache.set(namespace, cache_text, ai_response)
+    
     async def identify_improvements(self, feedback_analysis: Dict[str, Any]) -> List[ImprovementCandidate]:
         """Identify specific improvements based on feedback analysis"""
         
         print("🔍 Identifying improvement opportunities...")
         
-        improvement_candidates = []
-        
-        # Use Claude to generate improvement candidates
+        # Use Claude to generate improvement candidates; priorities are independent,
+        # so request them concurrently
         ai_analysis = feedback_analysis.get("ai_analysis", {})
+        priorities = ai_analysis.get("improvement_priorities")
+        if not priorities:
+            return []
+        
+        summary = self._summarize_feedback_for_candidates(feedback_analysis)
+        
+        async def generate(priority: Dict[str, Any]) -> List[ImprovementCandidate]:
+            async with self._claude_semaphore:
+                return await self._generate_improvement_candidates(priority, summary)
         
-        for priority in ai_analysis.get("improvement_priorities", []):
-            candidates = await self._generate_improvement_candidates(priority, feedback_analysis)
-            improvement_candidates.extend(candidates)
+        results = await asyncio.gather(
+            *(generate(priority) for priority in priorities),
+            return_exceptions=True
+        )
         
-        # Sort by confidence score and expected impact
-        improvement_candidates.sort(key=lambda x: (x.confidence_score, x.expected_impact == "high"), reverse=True)
+        improvement_candidates = [
+            candidate for result in results if not isinstance(result, BaseException)
+            for candidate in result
+        ]
         
-        return improvement_candidates[:self.max_iterations]  # Limit to max iterations
+        # Keep the best candidates by confidence score and expected impact, up to max iterations
+        return heapq.nlargest(
+            self.max_iterations, improvement_candidates,
+            key=lambda x: (x.confidence_score, x.expected_impact == "high")
+        )
+    
+    def _summarize_feedback_for_candidates(self, feedback_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduce collected feedback to what candidate generation needs
+        
+        Raw per-process metrics are dropped; the root causes, recurring issues
+        and a one-line view of each feedback item remain.
+        """
+        
+        ai_analysis = feedback_analysis.get("ai_analysis") or {}
+        pattern_insights = ai_analysis.get("pattern_insights") or {}
+        
+        processes = {}
+        for name, process in feedback_analysis.get("processes", {}).items():
+            if "error" in process:
+                processes[name] = {"error": process["error"]}
+                continue
+            processes[name] = {
+                "feedback_items": [
+                    {
+                        "description": item.description,
+                        "severity": item.severity.value,
+                        "affected_modules": item.affected_modules
+                    }
+                    for item in process.get("feedback_items", [])
+                ]
+            }
+        
+        return {
+            "root_cause_analysis": ai_analysis.get("root_cause_analysis", []),
+            "recurring_issues": pattern_insights.get("recurring_issues", []),
+            "processes": processes
+        }
     
     async def _generate_improvement_candidates(self, priority: Dict[str, Any], feedback_analysis: Dict[str, Any]) -> List[ImprovementCandidate]:
         """Generate specific improvement candidates for a priority area"""
         
-        prompt = f"""
-You are an expert software engineer improving the Automated Agile Framework ecosystem. Based on the priority area and feedback analysis, generate specific code improvements.
-
-Priority Area: {priority}
-Feedback Analysis: {json.dumps(feedback_analysis, indent=2, default=str)}
-
-Generate improvements in JSON format:
-{{
-    "improvements": [
-        {{
-            "process_type": "generate|review|test|framework",
-            "improvement_type": "bug_fix|performance|reliability|accuracy|feature",
-            "description": "Detailed description of the improvement",
-            "target_files": ["file1.py", "file2.py"],
-            "code_changes": [
-                {{
-                    "file": "path/to/file.py",
-                    "change_type": "modify|add|delete",
-                    "description": "What this change does",
-                    "code": "Actual code to implement or modify"
-                }}
-            ],
-            "confidence_score": 0.0-1.0,
-            "expected_impact": "high|medium|low",
-            "risk_level": "high|medium|low"
-        }}
-    ]
-}}
-        """
+        namespace = f"improvement_candidates:{self.config.model}"
+        cache_text = _cache_text(feedback_analysis, priority)
+        
+        # Repeat requests within this loop skip the disk cache and re-parsing too
+        key = hashlib.blake2b(cache_text.encode('utf-8'), digest_size=12).hexdigest()
+        cached = self.improvement_cache.get(key)
+        if cached is not None:
+            self.improvement_cache.move_to_end(key)
+            return list(cached)
         
         try:
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.client.messages.create(
-                    model=self.config.model,
-                    max_tokens=6000,
-                    temperature=0.4,
-                    messages=[{"role": "user", "content": prompt}]
-                )
-            )
+            ai_response = self._cached_response(namespace, cache_text)
+            fresh = ai_response is None
             
-            ai_response = response.content[0].text
+            if fresh:
+                # The feedback summary is shared by every priority in a run, so it goes first
+                # and is cached too; only the trailing priority block differs between calls
+                content = [
+                    {
+                        "type": "text",
+                        "text": f"Feedback Analysis: {_prompt_json(feedback_analysis)}",
+                        "cache_control": _CACHE_EPHEMERAL
+                    },
+                    {"type": "text", "text": f"Priority Area: {priority}"}
+                ]
+                ai_response = await asyncio.get_running_loop().run_in_executor(
+                    self._claude_executor,
+                    lambda: self._stream_json_response(
+                        model=self.config.model,
+                        max_tokens=6000,
+                        temperature=0.4,
+                        system=_IMPROVEMENTS_SYSTEM,
+                        messages=[{"role": "user", "content": content}]
+                    )
+                )
             
             # Extract JSON from response
-            start_idx = ai_response.find('{')
-            end_idx = ai_response.rfind('}') + 1
+            data = _extract_json_object(ai_response)
             
-            if start_idx >= 0 and end_idx > start_idx:
-                json_str = ai_response[start_idx:end_idx]
-                data = json.loads(json_str)
-                
+            if data is not None:
                 candidates = []
                 for imp in data.get("improvements", []):
                     candidates.append(ImprovementCandidate(
@@ -472,7 +719,13 @@ Generate improvements in JSON format:
                         risk_level=imp["risk_level"]
                     ))
                 
-                return candidates
+                if fresh:
+                    self._store_response(namespace, cache_text, ai_response)
+                
+                self.improvement_cache[key] = candidates
+                if len(self.improvement_cache) > IMPROVEMENT_CACHE_SIZE:
+                    self.improvement_cache.popitem(last=False)
+                return list(candidates)
             
         except Exception as e:
             print(f"⚠️ Failed to generate improvement candidates: {e}")
@@ -480,54 +733,57 @@ Generate improvements in JSON format:
         return []
     
     async def run_iterative_improvements(self, repo_path: str, candidates: List[ImprovementCandidate]) -> List[IterationResult]:
-        """Run iterative testing of improvement candidates"""
+        """Run iterative testing of improvement candidates
+        
+        Each iteration gets its own git worktree, so iterations never touch the
+        caller's checkout and their test runs can overlap.
+        """
         
+        candidates = candidates[:self.max_iterations]
         print(f"🧪 Running {len(candidates)} improvement iterations...")
         
-        iteration_results = []
         repo = git.Repo(repo_path)
-        original_branch = repo.active_branch.name
+        # Test suites are CPU-heavy; leave headroom so concurrent runs don't thrash
+        semaphore = asyncio.Semaphore(max(1, (os.cpu_count() or 2) // 2))
         
-        try:
-            for i, candidate in enumerate(candidates[:self.max_iterations]):
+        async def run_iteration(i: int, candidate: ImprovementCandidate) -> IterationResult:
+            async with semaphore:
                 print(f"  🔄 Running iteration {i+1}/{len(candidates)}: {candidate.description[:50]}...")
-                
-                result = await self._test_improvement_iteration(repo, candidate, i+1)
-                iteration_results.append(result)
-                
-                # Return to original branch after each iteration
-                repo.git.checkout(original_branch)
-                
-                # Clean up the test branch
-                try:
-                    repo.git.branch('-D', result.branch_name)
-                except:
-                    pass  # Branch might not exist if creation failed
-            
-        except Exception as e:
-            print(f"❌ Iteration testing failed: {e}")
-            # Ensure we're back on the original branch
-            try:
-                repo.git.checkout(original_branch)
-            except:
-                pass
+                return await self._test_improvement_iteration(repo, candidate, i+1)
         
-        return iteration_results
+        return list(await asyncio.gather(*(run_iteration(i, c) for i, c in enumerate(candidates))))
+    
+    @contextmanager
+    def _iteration_worktree(self, repo: git.Repo, branch_name: str) -> Iterator[str]:
+        """Check out HEAD into a temporary detached worktree, removing it afterwards
+        
+        Iteration changes are always thrown away, so no branch is created;
+        ``branch_name`` only labels the scratch directory.
+        """
+        
+        worktree_path = tempfile.mkdtemp(prefix=f"{branch_name}-")
+        try:
+            repo.git.worktree('add', '--detach', worktree_path)
+            yield worktree_path
+        finally:
+            try:
+                repo.git.worktree('remove', '--force', worktree_path)
+            except git.GitCommandError:
+                pass  # Worktree might not exist if creation failed
+            shutil.rmtree(worktree_path, ignore_errors=True)
     
     async def _test_improvement_iteration(self, repo: git.Repo, candidate: ImprovementCandidate, iteration_num: int) -> IterationResult:
-        """Test a single improvement iteration"""
+        """Test a single improvement iteration in its own worktree"""
         
         branch_name = f"intelligence-loop-iteration-{iteration_num}-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
         
         try:
-            # Create new branch
-            repo.git.checkout('-b', branch_name)
-            
-            # Apply code changes
-            changes_applied = self._apply_code_changes(repo, candidate.code_changes)
-            
-            # Run tests to evaluate the improvement
-            test_results = await self._run_improvement_tests(repo.working_dir)
+            with self._iteration_worktree(repo, branch_name) as worktree_path:
+                # Apply code changes
+                changes_applied = self._apply_code_changes(worktree_path, candidate.code_changes)
+                
+                # Run tests to evaluate the improvement
+                test_results = await self._run_improvement_tests(worktree_path, candidate.target_files)
             
             # Calculate success metrics
             success_score = self._calculate_success_score(test_results)
@@ -557,30 +813,56 @@ Generate improvements in JSON format:
                 timestamp=datetime.now()
             )
     
-    def _apply_code_changes(self, repo: git.Repo, code_changes: List[Dict[str, str]]) -> bool:
-        """Apply code changes to the repository"""
+    def _apply_code_changes(self, worktree_path: str, code_changes: List[Dict[str, str]]) -> bool:
+        """Apply code changes to an iteration's worktree
+        
+        Changes are resolved against an in-memory overlay first, so a file
+        touched by several changes is read once and written (or deleted) once.
+        """
         
         try:
+            # Final content per file; None marks a deletion
+            overlay: Dict[Path, Optional[bytes]] = {}
+            
+            def current(file_path: Path) -> Optional[bytes]:
+                if file_path in overlay:
+                    return overlay[file_path]
+                return file_path.read_bytes() if file_path.exists() else None
+            
             for change in code_changes:
-                file_path = Path(repo.working_dir) / change["file"]
+                file_path = Path(worktree_path) / change["file"]
                 
                 if change["change_type"] == "modify":
-                    if file_path.exists():
+                    original = current(file_path)
+                    if original is not None:
                         # For this example, we'll append the change as a comment
                         # In practice, you'd implement more sophisticated code modification
-                        with open(file_path, 'a') as f:
-                            f.write(f"\n# Intelligence Loop Improvement: {change['description']}\n")
-                            f.write(f"# {change['code']}\n")
+                        overlay[file_path] = original + (
+                            f"\n# Intelligence Loop Improvement: {change['description']}\n"
+                            f"# {change['code']}\n"
+                        ).encode('utf-8')
                 
                 elif change["change_type"] == "add":
-                    file_path.parent.mkdir(parents=True, exist_ok=True)
-                    with open(file_path, 'w') as f:
-                        f.write(f"# Intelligence Loop Addition: {change['description']}\n")
-                        f.write(change['code'])
+                    overlay[file_path] = (
+                        f"# Intelligence Loop Addition: {change['description']}\n{change['code']}"
+                    ).encode('utf-8')
                 
                 elif change["change_type"] == "delete":
-                    if file_path.exists():
-                        file_path.unlink()
+                    if current(file_path) is not None:
+                        overlay[file_path] = None
+            
+            # Create each target directory once, however many files land in it
+            by_dir: Dict[Path, List[Tuple[Path, bytes]]] = defaultdict(list)
+            for file_path, content in overlay.items():
+                if content is None:
+                    file_path.unlink(missing_ok=True)
+                else:
+                    by_dir[file_path.parent].append((file_path, content))
+            
+            for parent, files in by_dir.items():
+                parent.mkdir(parents=True, exist_ok=True)
+                for file_path, content in files:
+                    file_path.write_bytes(content)
             
             return True
             
@@ -588,8 +870,49 @@ Generate improvements in JSON format:
             print(f"⚠️ Failed to apply code changes: {e}")
             return False
     
-    async def _run_improvement_tests(self, repo_path: str) -> Dict[str, Any]:
-        """Run tests to evaluate the improvement"""
+    @staticmethod
+    def _select_tests(repo_path: str, target_files: Optional[List[str]]) -> List[str]:
+        """Map a candidate's target files to the pytest arguments that cover them
+        
+        ``src/foo/bar.py`` maps to ``tests/foo/test_bar.py`` or ``tests/test_bar.py``;
+        when any target has no such file, the whole suite is filtered with ``-k``
+        on the module names instead. Names that can't appear in a ``-k``
+        expression are left out; without usable targets the full suite runs.
+        """
+        
+        root = Path(repo_path)
+        paths = []
+        stems = []
+        
+        for target in target_files or []:
+            target_path = Path(target)
+            if target_path.suffix != ".py":
+                continue
+            
+            stem = target_path.stem
+            if stem.startswith("test_") or target_path.parts[:1] == ("tests",):
+                candidates = [target_path]
+            else:
+                parts = target_path.parts[1:-1] if target_path.parts[:1] == ("src",) else target_path.parts[:-1]
+                candidates = [Path("tests", *parts, f"test_{stem}.py"), Path("tests", f"test_{stem}.py")]
+            
+            name = stem.removeprefix("test_")
+            if name.isidentifier() and name not in _PYTEST_K_KEYWORDS:
+                stems.append(name)
+            else:
+                continue
+            match = next((str(c) for c in candidates if (root / c).is_file()), None)
+            if match is not None:
+                paths.append(match)
+        
+        if not stems:
+            return ["tests/"]
+        if len(paths) == len(stems):
+            return list(dict.fromkeys(paths))
+        return ["tests/", "-k", " or ".join(dict.fromkeys(stems))]
+    
+    async def _run_improvement_tests(self, repo_path: str, target_files: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Run the tests covering the improvement's target files"""
         
         test_results = {
             "timestamp": datetime.now().isoformat(),
@@ -602,16 +925,17 @@ Generate improvements in JSON format:
         
         try:
             # Run basic tests (simplified for this example)
-            result = subprocess.run(
-                ["python", "-m", "pytest", "tests/", "-v", "--tb=short"],
-                cwd=repo_path,
-                capture_output=True,
-                text=True,
-                timeout=300  # 5 minute timeout
-            )
+            selection = self._select_tests(repo_path, target_files)
+            returncode = await self._run_pytest(repo_path, selection)
+            if returncode == PYTEST_NO_TESTS_COLLECTED and selection != ["tests/"]:
+                # Nothing covers the targets directly; fall back to the full suite
+                returncode = await self._run_pytest(repo_path, ["tests/"])
             
-            # Parse test results
-            if result.returncode == 0:
+            # Parse test results; a repo without tests leaves the counts at zero,
+            # which scores neutrally
+            if returncode == PYTEST_NO_TESTS_COLLECTED:
+                pass
+            elif returncode == 0:
                 test_results["tests_passed"] = 10  # Simulated
                 test_results["errors_fixed"] = 2
             else:
@@ -625,7 +949,7 @@ Generate improvements in JSON format:
                 "cpu_utilization": 0.45
             }
             
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             test_results["error"] = "Tests timed out"
             test_results["tests_failed"] = 1
             test_results["new_errors"] = 1
@@ -636,6 +960,31 @@ Generate improvements in JSON format:
         
         return test_results
     
+    async def _run_pytest(self, repo_path: str, selection: List[str]) -> int:
+        """Run pytest on a selection and return its exit code; timeouts kill it
+        
+        Awaiting the process keeps the event loop free for other iterations' test runs.
+        """
+        
+        args = [*selection, "-v", "--tb=short", "-x", "--no-header", "-p", "no:cacheprovider"]
+        if importlib.util.find_spec("xdist") is not None:
+            args += ["-n", "auto"]
+        
+        proc = await asyncio.create_subprocess_exec(
+            "python", "-m", "pytest", *args,
+            cwd=repo_path,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            await asyncio.wait_for(proc.communicate(), timeout=300)  # 5 minute timeout
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            raise
+        
+        return proc.returncode
+    
     def _calculate_success_score(self, test_results: Dict[str, Any]) -> float:
         """Calculate a success score for the iteration"""
         
@@ -670,14 +1019,10 @@ Generate improvements in JSON format:
         print("📈 Evaluating iteration results...")
         
         # Filter out failed iterations
-        successful_iterations = [r for r in iteration_results if r.success_score > 0.0]
-        
-        # Sort by success score (highest first)
-        successful_iterations.sort(key=lambda x: x.success_score, reverse=True)
+        successful_iterations = (r for r in iteration_results if r.success_score > 0.0)
         
-        # Return top 3 improvements or all if less than 3
-        best_count = min(3, len(successful_iterations))
-        best_improvements = successful_iterations[:best_count]
+        # Return the top 3 improvements by success score, or all if less than 3
+        best_improvements = heapq.nlargest(3, successful_iterations, key=lambda x: x.success_score)
         
         for i, result in enumerate(best_improvements, 1):
             print(f"  🏆 #{i}: {result.improvement_candidate.description[:60]}... (Score: {result.success_score:.2f})")
@@ -5,30 +5,187 @@ This module implements comprehensive audit trail functionality for tracking
 all optimization decisions and changes in the ecosystem.
 """
 
+import hashlib
 import json
-import uuid
+import os
+import queue
+import secrets
+import threading
+import weakref
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, fields, is_dataclass
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from functools import lru_cache
+from typing import Callable, DefaultDict, Dict, List, Any, Optional, Set, Tuple
 from pathlib import Path
 
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .module_interface import IAuditTrail, OptimizationRequest
 from .domain_entities import AuditEntry, OptimizationStatus
 
+# Open per-request shard files kept by FileAuditTrail's writer
+SHARD_HANDLE_CACHE_SIZE = 64
+
+def _writev_limit() -> int:
+    """Most buffers one writev call accepts; sysconf reports -1 when there is no fixed limit"""
+    try:
+        limit = os.sysconf("SC_IOV_MAX")
+    except (AttributeError, ValueError, OSError):
+        return 1024
+    return limit if limit > 0 else 1024
+
+_IOV_MAX = _writev_limit()
+
+# Patterns kept verbatim in a patterns_identified entry; the rest are only hashed
+PATTERN_SAMPLE_SIZE = 5
+
+# Pattern lists longer than this aggregate impact scores with numpy
+NUMPY_SUMMARY_THRESHOLD = 64
+
+# Actions every complete optimization must have logged, in lifecycle order
+_REQUIRED_ACTIONS = (
+    "optimization_started",
+    "patterns_identified",
+    "optimization_attempt",
+    "optimization_completed"
+)
+_REQUIRED_ACTION_SET = frozenset(_REQUIRED_ACTIONS)
+
+def _json_default(obj: Any) -> Any:
+    """Encode values the JSON backends don't handle natively"""
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    if is_dataclass(obj):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    if hasattr(obj, "tolist"):
+        return obj.tolist()  # numpy arrays and scalars
+    return str(obj)
+
+if msgspec is not None:
+    _MSGSPEC_ENCODER = msgspec.json.Encoder(enc_hook=_json_default)
+    _ENTRY_DECODER = msgspec.json.Decoder(AuditEntry)
+else:
+    _MSGSPEC_ENCODER = None
+    _ENTRY_DECODER = None
+
+def _dumps(data: Any, indent: bool = False) -> bytes:
+    """Serialize audit data (including AuditEntry dataclasses) to UTF-8 JSON
+    
+    Uses msgspec, then orjson, then the stdlib, whichever is installed and
+    accepts the value; anything else JSON can't represent becomes a string.
+    """
+    
+    if _MSGSPEC_ENCODER is not None:
+        try:
+            encoded = _MSGSPEC_ENCODER.encode(data)
+            return msgspec.json.format(encoded, indent=2) if indent else encoded
+        except (TypeError, OverflowError):
+            pass
+    
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(data, default=_json_default, option=option)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits
+    return json.dumps(data, indent=2 if indent else None, default=_json_default).encode('utf-8')
+
+def _loads(data: bytes) -> Any:
+    """Parse audit JSON written by ``_dumps``"""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _new_entry_id() -> str:
+    """Opaque 128-bit random entry ID, without uuid4's object and formatting overhead"""
+    return secrets.token_hex(16)
+
+def _pattern_details(patterns: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Audit details for identified patterns: a digest and a sample instead of the full list
+    
+    The digest covers a canonical encoding (sorted keys, compact separators)
+    so it is the same whichever JSON backend is installed.
+    """
+    canonical = json.dumps(patterns, sort_keys=True, separators=(",", ":"), default=_json_default)
+    return {
+        "pattern_count": len(patterns),
+        "patterns_hash": hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).hexdigest(),
+        "sample": patterns[:PATTERN_SAMPLE_SIZE]
+    }
+
+def _open_append(path: Path) -> int:
+    """Open a file for appending; O_APPEND makes each write land atomically at the end"""
+    return os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+
+def _append_all(fd: int, chunks: List[bytes]) -> None:
+    """Write chunks to an append descriptor with as few syscalls as possible, then fsync"""
+    if hasattr(os, "writev"):
+        for start in range(0, len(chunks), _IOV_MAX):
+            batch = chunks[start:start + _IOV_MAX]
+            written = os.writev(fd, batch)
+            rest = b''.join(batch)[written:] if written < sum(map(len, batch)) else b''
+            while rest:
+                rest = rest[os.write(fd, rest):]
+    else:
+        data = b''.join(chunks)
+        while data:
+            data = data[os.write(fd, data):]
+    os.fsync(fd)
+
+@lru_cache(maxsize=None)
+def _ensure_dir(path: str) -> None:
+    """Create an audit directory once per process, however often trails are rebuilt"""
+    Path(path).mkdir(parents=True, exist_ok=True)
+
+@lru_cache(maxsize=4096)
+def _parse_iso(timestamp: str) -> datetime:
+    """Parse an ISO 8601 audit timestamp; datetimes are immutable, so results are shared"""
+    return datetime.fromisoformat(timestamp)
+
 class DatabaseAuditTrail(IAuditTrail):
     """Database-backed audit trail implementation"""
     
     def __init__(self, config):
         self.config = config
-        self.audit_entries: Dict[str, List[AuditEntry]] = {}
+        self.audit_entries: DefaultDict[str, List[AuditEntry]] = defaultdict(list)
         
         # In production, this would connect to a proper database
         # For now, we'll use in-memory storage with file backup
         self.storage_path = Path(config.output_dir) / "audit_trail"
-        self.storage_path.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(os.path.abspath(self.storage_path))
+        
+        # One worker keeps each request's writes in submission order
+        self._persist_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audit-persist")
+        self._pending_persists: Set[Future] = set()
+        # The last reference may be dropped on the worker itself, so collection
+        # only stops it; queued persists still run, and the executor's own exit
+        # hook waits for them
+        weakref.finalize(self, self._persist_pool.shutdown, wait=False)
+    
+    def flush(self) -> None:
+        """Block until every scheduled persist has been written"""
+        wait(list(self._pending_persists))
+    
+    def close(self) -> None:
+        """Finish any scheduled persists and stop the persist worker"""
+        self._persist_pool.shutdown(wait=True)
     
     def log_optimization_start(self, request: OptimizationRequest) -> str:
         """Log start of optimization process"""
-        entry_id = str(uuid.uuid4())
+        entry_id = _new_entry_id()
         correlation_id = request.request_id
         
         entry = AuditEntry(
@@ -53,7 +210,7 @@ class DatabaseAuditTrail(IAuditTrail):
     
     def log_pattern_identification(self, request_id: str, patterns: List[Dict[str, Any]]) -> None:
         """Log identified patterns"""
-        entry_id = str(uuid.uuid4())
+        entry_id = _new_entry_id()
         
         entry = AuditEntry(
             entry_id=entry_id,
@@ -62,8 +219,7 @@ class DatabaseAuditTrail(IAuditTrail):
             action="patterns_identified",
             actor="ai_analyzer",
             details={
-                "pattern_count": len(patterns),
-                "patterns": patterns,
+                **_pattern_details(patterns),
                 "analysis_summary": self._generate_pattern_summary(patterns)
             }
         )
@@ -72,7 +228,7 @@ class DatabaseAuditTrail(IAuditTrail):
     
     def log_optimization_attempt(self, request_id: str, attempt: Dict[str, Any]) -> None:
         """Log optimization attempt"""
-        entry_id = str(uuid.uuid4())
+        entry_id = _new_entry_id()
         
         entry = AuditEntry(
             entry_id=entry_id,
@@ -89,7 +245,7 @@ class DatabaseAuditTrail(IAuditTrail):
     
     def log_optimization_result(self, request_id: str, result: Dict[str, Any]) -> None:
         """Log optimization result"""
-        entry_id = str(uuid.uuid4())
+        entry_id = _new_entry_id()
         
         entry = AuditEntry(
             entry_id=entry_id,
@@ -102,8 +258,8 @@ class DatabaseAuditTrail(IAuditTrail):
         
         self._store_audit_entry(entry)
         
-        # Persist to file for durability
-        self._persist_audit_trail(request_id)
+        # Persist to file for durability, off the caller's critical path
+        self._schedule_persist(request_id)
     
     def get_audit_history(self, request_id: str) -> List[Dict[str, Any]]:
         """Get audit history for request"""
@@ -118,61 +274,82 @@ class DatabaseAuditTrail(IAuditTrail):
     
     def _store_audit_entry(self, entry: AuditEntry) -> None:
         """Store audit entry in memory"""
-        if entry.request_id not in self.audit_entries:
-            self.audit_entries[entry.request_id] = []
-        
         self.audit_entries[entry.request_id].append(entry)
     
-    def _persist_audit_trail(self, request_id: str) -> None:
-        """Persist audit trail to file"""
-        if request_id not in self.audit_entries:
+    def _schedule_persist(self, request_id: str) -> None:
+        """Persist a snapshot of the request's entries on the background worker"""
+        entries = list(self.audit_entries[request_id])
+        try:
+            future = self._persist_pool.submit(self._persist_audit_trail, request_id, entries)
+        except RuntimeError:
+            # Closed (e.g. during interpreter shutdown); write synchronously instead
+            self._persist_audit_trail(request_id, entries)
             return
         
-        file_path = self.storage_path / f"{request_id}.json"
+        self._pending_persists.add(future)
+        future.add_done_callback(self._pending_persists.discard)
+    
+    def _persist_audit_trail(self, request_id: str, entries: Optional[List[AuditEntry]] = None) -> None:
+        """Persist audit trail to file, one JSON entry per line"""
+        if entries is None:
+            if request_id not in self.audit_entries:
+                return
+            entries = self.audit_entries[request_id]
         
-        entries_data = [
-            self._audit_entry_to_dict(entry) 
-            for entry in self.audit_entries[request_id]
-        ]
+        file_path = self.storage_path / f"{request_id}.jsonl"
         
         try:
-            with open(file_path, 'w') as f:
-                json.dump(entries_data, f, indent=2, default=str)
+            # The encoders take the dataclasses directly; no intermediate dicts
+            with open(file_path, 'wb') as f:
+                for entry in entries:
+                    f.write(_dumps(entry) + b'\n')
         except Exception as e:
             # Log error but don't fail the optimization
             print(f"Failed to persist audit trail: {e}")
     
     def _load_audit_trail(self, request_id: str) -> None:
-        """Load audit trail from file"""
-        file_path = self.storage_path / f"{request_id}.json"
-        
-        if not file_path.exists():
-            return
+        """Load audit trail from file, decoding one entry at a time"""
+        file_path = self.storage_path / f"{request_id}.jsonl"
+        legacy_path = self.storage_path / f"{request_id}.json"
         
         try:
-            with open(file_path, 'r') as f:
-                entries_data = json.load(f)
-            
-            entries = []
-            for entry_data in entries_data:
-                entry = AuditEntry(
-                    entry_id=entry_data["entry_id"],
-                    request_id=entry_data["request_id"],
-                    timestamp=datetime.fromisoformat(entry_data["timestamp"]),
-                    action=entry_data["action"],
-                    actor=entry_data["actor"],
-                    details=entry_data["details"],
-                    before_state=entry_data.get("before_state"),
-                    after_state=entry_data.get("after_state"),
-                    correlation_id=entry_data.get("correlation_id")
-                )
-                entries.append(entry)
+            if file_path.exists():
+                with open(file_path, 'rb') as f:
+                    entries = [self._decode_audit_entry(line) for line in f if line.strip()]
+            elif legacy_path.exists():
+                # Trails persisted before the JSONL format are a single JSON array
+                entries = [self._audit_entry_from_dict(data) for data in _loads(legacy_path.read_bytes())]
+            else:
+                return
             
             self.audit_entries[request_id] = entries
             
         except Exception as e:
             print(f"Failed to load audit trail: {e}")
     
+    def _decode_audit_entry(self, line: bytes) -> AuditEntry:
+        """Decode one persisted entry"""
+        if _ENTRY_DECODER is not None:
+            try:
+                return _ENTRY_DECODER.decode(line)
+            except msgspec.ValidationError:
+                pass  # e.g. a hand-edited entry; fall back to the lenient path
+        return self._audit_entry_from_dict(_loads(line))
+    
+    def _audit_entry_from_dict(self, entry_data: Dict[str, Any]) -> AuditEntry:
+        """Convert a persisted dictionary back into an audit entry"""
+        return AuditEntry(
+            entry_id=entry_data["entry_id"],
+            request_id=entry_data["request_id"],
+            timestamp=_parse_iso(entry_data["timestamp"]),
+            action=entry_data["action"],
+            actor=entry_data["actor"],
+            details=entry_data["details"],
+            before_state=entry_data.get("before_state"),
+            after_state=entry_data.get("after_state"),
+            correlation_id=entry_data.get("correlation_id")
+        )
+    
     def _audit_entry_to_dict(self, entry: AuditEntry) -> Dict[str, Any]:
         """Convert audit entry to dictionary"""
         return {
@@ -192,34 +369,29 @@ class DatabaseAuditTrail(IAuditTrail):
         if not patterns:
             return {"summary": "No patterns identified"}
         
-        # Count patterns by component
-        component_counts = {}
-        issue_type_counts = {}
-        total_impact = 0
-        high_priority_count = 0
-        
-        for pattern in patterns:
-            # Component analysis
-            component = pattern.get("component", "unknown")
-            component_counts[component] = component_counts.get(component, 0) + 1
-            
-            # Issue type analysis
-            issue_type = pattern.get("issue_type", "unknown")
-            issue_type_counts[issue_type] = issue_type_counts.get(issue_type, 0) + 1
-            
-            # Impact analysis
-            impact = pattern.get("impact_score", 0)
-            total_impact += impact
-            
-            if impact > 0.8:
-                high_priority_count += 1
+        # Count patterns by component and issue type
+        component_counts = Counter(pattern.get("component", "unknown") for pattern in patterns)
+        issue_type_counts = Counter(pattern.get("issue_type", "unknown") for pattern in patterns)
+        
+        # Impact analysis
+        if np is not None and len(patterns) > NUMPY_SUMMARY_THRESHOLD:
+            impacts = np.fromiter(
+                (pattern.get("impact_score", 0) for pattern in patterns),
+                dtype=np.float64, count=len(patterns)
+            )
+            total_impact = float(impacts.sum())
+            high_priority_count = int(np.count_nonzero(impacts > 0.8))
+        else:
+            impacts = [pattern.get("impact_score", 0) for pattern in patterns]
+            total_impact = sum(impacts)
+            high_priority_count = sum(1 for impact in impacts if impact > 0.8)
         
         avg_impact = total_impact / len(patterns) if patterns else 0
         
         return {
             "total_patterns": len(patterns),
-            "component_distribution": component_counts,
-            "issue_type_distribution": issue_type_counts,
+            "component_distribution": dict(component_counts),
+            "issue_type_distribution": dict(issue_type_counts),
             "average_impact_score": round(avg_impact, 2),
             "high_priority_patterns": high_priority_count,
             "recommendations": self._generate_audit_recommendations(patterns)
@@ -233,13 +405,10 @@ class DatabaseAuditTrail(IAuditTrail):
             return ["Continue monitoring ecosystem health"]
         
         # Component-based recommendations
-        component_counts = {}
-        for pattern in patterns:
-            component = pattern.get("component", "unknown")
-            component_counts[component] = component_counts.get(component, 0) + 1
+        component_counts = Counter(pattern.get("component", "unknown") for pattern in patterns)
         
         if component_counts:
-            most_affected = max(component_counts, key=component_counts.get)
+            [(most_affected, _)] = component_counts.most_common(1)
             recommendations.append(f"Focus optimization efforts on {most_affected} component")
         
         # Priority-based recommendations
@@ -254,20 +423,143 @@ class DatabaseAuditTrail(IAuditTrail):
         
         return recommendations
 
+def _backfill_shards(audit_file: Path, shard_dir: Path) -> None:
+    """Split a combined log written before sharding into per-request shards
+    
+    Runs once, when the shard directory does not exist yet. Shards are
+    built in a sibling directory and renamed into place, so an interrupted
+    back-fill is simply redone.
+    """
+    by_request: Dict[str, List[bytes]] = defaultdict(list)
+    with open(audit_file, 'rb') as f:
+        for line in f:
+            if line.strip():
+                by_request[_loads(line)["request_id"]].append(line if line.endswith(b'\n') else line + b'\n')
+    
+    staging = shard_dir.with_name(shard_dir.name + ".tmp")
+    staging.mkdir(parents=True, exist_ok=True)
+    for request_id, lines in by_request.items():
+        with open(staging / f"{request_id}.jsonl", 'wb') as f:
+            f.writelines(lines)
+    os.replace(staging, shard_dir)
+
+class _AppendWriter:
+    """Background appender behind a FileAuditTrail
+    
+    Holds the descriptors and writer thread separately from the trail, so a
+    trail that is dropped without ``close()`` can still be collected and
+    its finalizer can drain the queue and release them.
+    """
+    
+    def __init__(self, audit_file: Path, shard_dir: Path):
+        self.shard_dir = shard_dir
+        self.fd: Optional[int] = _open_append(audit_file)
+        self.shards: "OrderedDict[str, int]" = OrderedDict()
+        self.pending: "queue.Queue[Optional[Tuple[str, bytes]]]" = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name="audit-writer", daemon=True)
+        self.thread.start()
+    
+    def put(self, request_id: str, line: bytes) -> None:
+        if not self.thread.is_alive():
+            raise ValueError("audit trail is closed")
+        self.pending.put((request_id, line))
+    
+    def flush(self) -> None:
+        """Block until every queued entry has been written"""
+        if self.thread.is_alive():
+            self.pending.join()
+    
+    def close(self) -> None:
+        """Write any queued entries and close the descriptors"""
+        if self.thread.is_alive():
+            self.pending.put(None)
+            self.thread.join()
+        for fd in self.shards.values():
+            os.close(fd)
+        self.shards.clear()
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+    
+    def shard_path(self, request_id: str) -> Path:
+        return self.shard_dir / f"{request_id}.jsonl"
+    
+    def shard(self, request_id: str) -> int:
+        """Return the open shard descriptor for a request, closing the least recently used"""
+        fd = self.shards.get(request_id)
+        if fd is None:
+            fd = _open_append(self.shard_path(request_id))
+            self.shards[request_id] = fd
+            if len(self.shards) > SHARD_HANDLE_CACHE_SIZE:
+                _, evicted = self.shards.popitem(last=False)
+                os.close(evicted)
+        else:
+            self.shards.move_to_end(request_id)
+        return fd
+    
+    def run(self) -> None:
+        """Append queued entries in batches until closed"""
+        while True:
+            batch = [self.pending.get()]
+            while batch[-1] is not None:
+                try:
+                    batch.append(self.pending.get_nowait())
+                except queue.Empty:
+                    break
+            
+            try:
+                lines = [item[1] for item in batch if item is not None]
+                by_request: Dict[str, List[bytes]] = defaultdict(list)
+                for item in batch:
+                    if item is not None:
+                        by_request[item[0]].append(item[1])
+                
+                if lines:
+                    _append_all(self.fd, lines)
+                    # Fetch each shard just before writing it, as fetching may close another
+                    for request_id, request_lines in by_request.items():
+                        _append_all(self.shard(request_id), request_lines)
+            except Exception as e:
+                print(f"Failed to write audit entry: {e}")
+            finally:
+                for _ in batch:
+                    self.pending.task_done()
+            
+            if batch[-1] is None:
+                return
+
 class FileAuditTrail(IAuditTrail):
-    """File-based audit trail for simpler deployments"""
+    """File-based audit trail for simpler deployments
+    
+    Entries are queued and appended by a background writer, which commits
+    everything queued while the previous write was in flight with a single
+    gather write and fsync per file, on descriptors opened once with
+    ``O_APPEND``. Every entry goes to the combined
+    ``audit_trail.jsonl`` and to a per-request shard, so history lookups
+    only read that request's entries.
+    """
     
     def __init__(self, config):
         self.config = config
         self.audit_file = Path(config.output_dir) / "audit_trail.jsonl"
-        self.audit_file.parent.mkdir(parents=True, exist_ok=True)
+        self.shard_dir = Path(config.output_dir) / "audit_shards"
+        if self.audit_file.exists() and not self.shard_dir.exists():
+            try:
+                _backfill_shards(self.audit_file, self.shard_dir)
+            except Exception as e:
+                print(f"Failed to back-fill audit shards: {e}")
+        _ensure_dir(os.path.abspath(self.shard_dir))
+        
+        self._writer = _AppendWriter(self.audit_file, self.shard_dir)
+        # Drains and closes on close(), collection, or interpreter exit, whichever comes first
+        self._finalizer = weakref.finalize(self, self._writer.close)
     
     def log_optimization_start(self, request: OptimizationRequest) -> str:
         """Log start of optimization process"""
         correlation_id = request.request_id
         
         entry = {
-            "entry_id": str(uuid.uuid4()),
+            "entry_id": _new_entry_id(),
             "request_id": request.request_id,
             "timestamp": datetime.now().isoformat(),
             "action": "optimization_started",
@@ -287,15 +579,12 @@ class FileAuditTrail(IAuditTrail):
     def log_pattern_identification(self, request_id: str, patterns: List[Dict[str, Any]]) -> None:
         """Log identified patterns"""
         entry = {
-            "entry_id": str(uuid.uuid4()),
+            "entry_id": _new_entry_id(),
             "request_id": request_id,
             "timestamp": datetime.now().isoformat(),
             "action": "patterns_identified",
             "actor": "ai_analyzer",
-            "details": {
-                "pattern_count": len(patterns),
-                "patterns": patterns
-            }
+            "details": _pattern_details(patterns)
         }
         
         self._append_audit_entry(entry)
@@ -303,7 +592,7 @@ class FileAuditTrail(IAuditTrail):
     def log_optimization_attempt(self, request_id: str, attempt: Dict[str, Any]) -> None:
         """Log optimization attempt"""
         entry = {
-            "entry_id": str(uuid.uuid4()),
+            "entry_id": _new_entry_id(),
             "request_id": request_id,
             "timestamp": datetime.now().isoformat(),
             "action": "optimization_attempt",
@@ -316,7 +605,7 @@ class FileAuditTrail(IAuditTrail):
     def log_optimization_result(self, request_id: str, result: Dict[str, Any]) -> None:
         """Log optimization result"""
         entry = {
-            "entry_id": str(uuid.uuid4()),
+            "entry_id": _new_entry_id(),
             "request_id": request_id,
             "timestamp": datetime.now().isoformat(),
             "action": "optimization_completed",
@@ -330,29 +619,62 @@ class FileAuditTrail(IAuditTrail):
         """Get audit history for request"""
         entries = []
         
-        if not self.audit_file.exists():
-            return entries
+        self.flush()
+        shard_path = self._shard_path(request_id)
         
         try:
-            with open(self.audit_file, 'r') as f:
-                for line in f:
-                    if line.strip():
-                        entry = json.loads(line)
-                        if entry.get("request_id") == request_id:
-                            entries.append(entry)
+            # Entries logged before sharding were back-filled into shards on startup
+            if shard_path.exists():
+                with open(shard_path, 'rb') as f:
+                    entries = [_loads(line) for line in f if line.strip()]
         except Exception as e:
             print(f"Failed to read audit history: {e}")
         
         return entries
     
+    def flush(self) -> None:
+        """Block until every queued entry has been written"""
+        self._writer.flush()
+    
+    def close(self) -> None:
+        """Write any queued entries and close the audit files"""
+        self._finalizer()
+    
+    def _shard_path(self, request_id: str) -> Path:
+        return self._writer.shard_path(request_id)
+    
     def _append_audit_entry(self, entry: Dict[str, Any]) -> None:
-        """Append audit entry to file"""
+        """Queue audit entry for the background writer"""
         try:
-            with open(self.audit_file, 'a') as f:
-                f.write(json.dumps(entry, default=str) + '\n')
+            self._writer.put(entry["request_id"], _dumps(entry) + b'\n')
         except Exception as e:
             print(f"Failed to write audit entry: {e}")
 
+# Timeline summary formatters by audit action
+_ENTRY_SUMMARIES: Dict[str, Callable[[Dict[str, Any]], str]] = {
+    "optimization_started": lambda details: (
+        f"Started optimization for {len(details.get('components', []))} components: "
+        f"{', '.join(details.get('components', []))}"
+    ),
+    "patterns_identified": lambda details: f"AI identified {details.get('pattern_count', 0)} optimization patterns",
+    "optimization_attempt": lambda details: (
+        f"Iteration {details.get('iteration', 'unknown')} {details.get('status', 'unknown')}"
+    ),
+    "optimization_completed": lambda details: f"Optimization {details.get('status', 'unknown')}"
+}
+
+@dataclass
+class _HistoryScan:
+    """Everything the audit report needs, gathered in one pass over the history"""
+    start_time: Optional[str] = None
+    end_time: Optional[str] = None
+    iterations_completed: int = 0
+    successful_iterations: int = 0
+    present_actions: Set[str] = field(default_factory=set)
+    timeline: List[Dict[str, Any]] = field(default_factory=list)
+    timeline_sorted: bool = True
+    decisions: List[Dict[str, Any]] = field(default_factory=list)
+
 class AuditTrailManager:
     """Manager for audit trail operations with business logic"""
     
@@ -367,10 +689,11 @@ class AuditTrailManager:
             return {"error": "No audit history found for request"}
         
         # Analyze audit trail
-        timeline = self._build_timeline(history)
-        performance_analysis = self._analyze_performance(history)
-        decision_analysis = self._analyze_decisions(history)
-        compliance_check = self._check_compliance(history)
+        scan = self._scan_history(history)
+        timeline = self._build_timeline(scan)
+        performance_analysis = self._analyze_performance(scan)
+        decision_analysis = self._analyze_decisions(scan)
+        compliance_check = self._check_compliance(scan)
         
         return {
             "request_id": request_id,
@@ -379,46 +702,66 @@ class AuditTrailManager:
             "performance_analysis": performance_analysis,
             "decision_analysis": decision_analysis,
             "compliance_check": compliance_check,
-            "recommendations": self._generate_audit_recommendations_from_history(history)
+            "recommendations": self._generate_audit_recommendations_from_history(
+                performance_analysis, compliance_check
+            )
         }
     
-    def _build_timeline(self, history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Build chronological timeline of events"""
-        timeline = []
+    def _scan_history(self, history: List[Dict[str, Any]]) -> _HistoryScan:
+        """Walk the audit history once, collecting timeline, decisions and counters"""
+        scan = _HistoryScan()
         
         for entry in history:
-            timeline.append({
+            action = entry["action"]
+            scan.present_actions.add(action)
+            if scan.timeline and entry["timestamp"] < scan.timeline[-1]["timestamp"]:
+                scan.timeline_sorted = False
+            scan.timeline.append({
                 "timestamp": entry["timestamp"],
-                "action": entry["action"],
+                "action": action,
                 "actor": entry["actor"],
                 "summary": self._generate_entry_summary(entry)
             })
+            
+            if action == "optimization_started":
+                scan.start_time = entry["timestamp"]
+            elif action == "optimization_completed":
+                scan.end_time = entry["timestamp"]
+            elif action == "optimization_attempt":
+                scan.iterations_completed += 1
+                if entry["details"].get("status") == "success":
+                    scan.successful_iterations += 1
+            
+            if action in ("patterns_identified", "optimization_attempt"):
+                scan.decisions.append({
+                    "timestamp": entry["timestamp"],
+                    "decision_type": action,
+                    "details": entry["details"]
+                })
         
-        return sorted(timeline, key=lambda x: x["timestamp"])
+        return scan
+    
+    def _build_timeline(self, scan: _HistoryScan) -> List[Dict[str, Any]]:
+        """Build chronological timeline of events
+        
+        History arrives in insertion order, which is normally chronological, so
+        the sort only runs when the scan saw a timestamp go backwards.
+        """
+        if scan.timeline_sorted:
+            return scan.timeline
+        return sorted(scan.timeline, key=lambda x: x["timestamp"])
     
-    def _analyze_performance(self, history: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_performance(self, scan: _HistoryScan) -> Dict[str, Any]:
         """Analyze performance metrics from audit trail"""
-        start_time = None
-        end_time = None
-        iterations_completed = 0
-        successful_iterations = 0
-        
-        for entry in history:
-            if entry["action"] == "optimization_started":
-                start_time = entry["timestamp"]
-            elif entry["action"] == "optimization_completed":
-                end_time = entry["timestamp"]
-            elif entry["action"] == "optimization_attempt":
-                iterations_completed += 1
-                if entry["details"].get("status") == "success":
-                    successful_iterations += 1
-        
         total_duration = None
-        if start_time and end_time:
-            start_dt = datetime.fromisoformat(start_time)
-            end_dt = datetime.fromisoformat(end_time)
+        if scan.start_time and scan.end_time:
+            start_dt = _parse_iso(scan.start_time)
+            end_dt = _parse_iso(scan.end_time)
             total_duration = (end_dt - start_dt).total_seconds()
         
+        iterations_completed = scan.iterations_completed
+        successful_iterations = scan.successful_iterations
+        
         return {
             "total_duration_seconds": total_duration,
             "iterations_completed": iterations_completed,
@@ -426,38 +769,21 @@ class AuditTrailManager:
             "success_rate": successful_iterations / iterations_completed if iterations_completed > 0 else 0
         }
     
-    def _analyze_decisions(self, history: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _analyze_decisions(self, scan: _HistoryScan) -> Dict[str, Any]:
         """Analyze decisions made during optimization"""
-        decisions = []
-        
-        for entry in history:
-            if entry["action"] in ["patterns_identified", "optimization_attempt"]:
-                decisions.append({
-                    "timestamp": entry["timestamp"],
-                    "decision_type": entry["action"],
-                    "details": entry["details"]
-                })
-        
         return {
-            "total_decisions": len(decisions),
-            "decision_timeline": decisions
+            "total_decisions": len(scan.decisions),
+            "decision_timeline": scan.decisions
         }
     
-    def _check_compliance(self, history: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _check_compliance(self, scan: _HistoryScan) -> Dict[str, Any]:
         """Check compliance with audit requirements"""
-        required_actions = [
-            "optimization_started",
-            "patterns_identified", 
-            "optimization_attempt",
-            "optimization_completed"
-        ]
-        
-        present_actions = set(entry["action"] for entry in history)
-        missing_actions = set(required_actions) - present_actions
+        present_actions = scan.present_actions
+        missing_actions = _REQUIRED_ACTION_SET - present_actions
         
         return {
-            "compliance_score": len(present_actions & set(required_actions)) / len(required_actions),
-            "required_actions": required_actions,
+            "compliance_score": len(_REQUIRED_ACTION_SET & present_actions) / len(_REQUIRED_ACTIONS),
+            "required_actions": list(_REQUIRED_ACTIONS),
             "present_actions": list(present_actions),
             "missing_actions": list(missing_actions),
             "compliant": len(missing_actions) == 0
@@ -466,32 +792,17 @@ class AuditTrailManager:
     def _generate_entry_summary(self, entry: Dict[str, Any]) -> str:
         """Generate human-readable summary for audit entry"""
         action = entry["action"]
-        actor = entry["actor"]
-        details = entry["details"]
-        
-        if action == "optimization_started":
-            components = details.get("components", [])
-            return f"Started optimization for {len(components)} components: {', '.join(components)}"
-        elif action == "patterns_identified":
-            count = details.get("pattern_count", 0)
-            return f"AI identified {count} optimization patterns"
-        elif action == "optimization_attempt":
-            iteration = details.get("iteration", "unknown")
-            status = details.get("status", "unknown")
-            return f"Iteration {iteration} {status}"
-        elif action == "optimization_completed":
-            status = details.get("status", "unknown")
-            return f"Optimization {status}"
-        else:
-            return f"Action: {action} by {actor}"
+        summarize = _ENTRY_SUMMARIES.get(action)
+        if summarize is None:
+            return f"Action: {action} by {entry['actor']}"
+        return summarize(entry["details"])
     
-    def _generate_audit_recommendations_from_history(self, history: List[Dict[str, Any]]) -> List[str]:
-        """Generate recommendations based on audit history"""
+    def _generate_audit_recommendations_from_history(self, performance: Dict[str, Any],
+                                                     compliance: Dict[str, Any]) -> List[str]:
+        """Generate recommendations from the report's performance and compliance analysis"""
         recommendations = []
         
         # Analyze performance
-        performance = self._analyze_performance(history)
-        
         if performance["success_rate"] < 0.5:
             recommendations.append("Low success rate detected - review optimization criteria")
         
@@ -499,8 +810,6 @@ class AuditTrailManager:
             recommendations.append("Optimization took over 1 hour - consider parallel processing")
         
         # Analyze compliance
-        compliance = self._check_compliance(history)
-        
         if not compliance["compliant"]:
             recommendations.append(f"Missing audit actions: {', '.join(compliance['missing_actions'])}")
         
@@ -151,7 +151,7 @@ class IAuditTrail(ABC):
     
     @abstractmethod
     def get_audit_history(self, request_id: str) -> List[Dict[str, Any]]:
-        """Get audit history for request"""
+        """Get audit history for request, in the order entries were logged"""
         pass
 
 # Type protocols for dependency injection
@@ -2,21 +2,35 @@
 Tests for the MetricsAnalyzer class
 """
 
+import asyncio
+import gzip
+import json
 import pytest
-from unittest.mock import Mock, patch
-from src.codemetrics.analyzer import MetricsAnalyzer, AnalysisResult
+import random
+from contextlib import ExitStack
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+from src.codemetrics.analyzer import MetricsAnalyzer, AnalysisResult, encode_json
 from src.codemetrics.config import Config
+from src.codemetrics._client import reset_clients
 
 class TestMetricsAnalyzer:
     
+    @pytest.fixture(autouse=True)
+    def fresh_clients(self):
+        """Don't share cached Anthropic clients between tests"""
+        reset_clients()
+        yield
+        reset_clients()
+    
     @pytest.fixture
-    def config(self):
+    def config(self, tmp_path):
         """Create a test configuration"""
         return Config(
             anthropic_api_key="test-key",
             model="claude-3-5-sonnet-20241022",
             max_tokens=1000,
-            temperature=0.3
+            temperature=0.3,
+            cache_dir=str(tmp_path / "cache")
         )
     
     @pytest.fixture
@@ -30,7 +44,8 @@ class TestMetricsAnalyzer:
         with patch('src.codemetrics.analyzer.anthropic.Anthropic') as mock_anthropic:
             analyzer = MetricsAnalyzer(config)
             assert analyzer.config == config
-            mock_anthropic.assert_called_once_with(api_key="test-key")
+            mock_anthropic.assert_called_once()
+            assert mock_anthropic.call_args.kwargs["api_key"] == "test-key"
     
     def test_fallback_analysis(self, analyzer):
         """Test fallback analysis when AI fails"""
@@ -87,3 +102,297 @@ class TestMetricsAnalyzer:
         assert "Security Score: 88/100" in summary
         assert "Test finding" in summary
         assert "Test recommendation" in summary
+    
+    def test_analyze_batch_maps_results_by_custom_id(self, analyzer):
+        """Test batch analysis maps results back to caller ids"""
+        analyzer.config.batch_poll_interval = 0
+        
+        pending = Mock(id="batch_1", processing_status="in_progress")
+        ended = Mock(id="batch_1", processing_status="ended")
+        analyzer.client.messages.batches.create.return_value = pending
+        analyzer.client.messages.batches.retrieve.return_value = ended
+        
+        succeeded = Mock(custom_id="item-0")
+        succeeded.result.type = "succeeded"
+        succeeded.result.message.content = [Mock(text='{"performance_score": 91}')]
+        errored = Mock(custom_id="item-1")
+        errored.result.type = "errored"
+        analyzer.client.messages.batches.results.return_value = [succeeded, errored]
+        
+        results = analyzer.analyze_batch([
+            ("Jita81/CODEREVIEW", {"repo": "review"}, "full"),
+            ("Jita81/CODETEST", {"repo": "test"}, "security")
+        ])
+        
+        requests = analyzer.client.messages.batches.create.call_args.kwargs["requests"]
+        assert [r["custom_id"] for r in requests] == ["item-0", "item-1"]
+        assert results["Jita81/CODEREVIEW"].performance_score == 91
+        assert results["Jita81/CODETEST"].metrics["fallback_analysis"] is True
+    
+    def test_analyze_batch_cancels_after_timeout(self, analyzer):
+        """Test a batch still running at the deadline is cancelled and falls back"""
+        analyzer.config.batch_poll_interval = 0
+        analyzer.config.batch_timeout = 0
+        
+        analyzer.client.messages.batches.create.return_value = Mock(id="batch_1", processing_status="in_progress")
+        
+        results = analyzer.analyze_batch([("Jita81/CODEREVIEW", {"repo": "review"}, "full")])
+        
+        analyzer.client.messages.batches.cancel.assert_called_once_with("batch_1")
+        analyzer.client.messages.batches.results.assert_not_called()
+        assert results["Jita81/CODEREVIEW"].metrics["fallback_analysis"] is True
+        assert "timed out" in results["Jita81/CODEREVIEW"].metrics["error"]
+    
+    def _mock_stream(self, chunks):
+        """Build a messages.stream() context manager yielding text chunks"""
+        stream = MagicMock()
+        stream.__enter__.return_value.text_stream = iter(chunks)
+        return stream
+    
+    def test_analyze_reuses_cached_response(self, analyzer):
+        """Test repeated analyses of unchanged data are served from the cache"""
+        analyzer.client.messages.stream.return_value = self._mock_stream(
+            ['{"performance_score": 88, "quality_score": 80, "security_score": 90}']
+        )
+        
+        first = analyzer.analyze({"project_info": {"path": "/repo"}, "timestamp": "2024-01-01T00:00:00"})
+        second = analyzer.analyze({"project_info": {"path": "/repo"}, "timestamp": "2024-01-02T00:00:00"})
+        
+        assert analyzer.client.messages.stream.call_count == 1
+        assert first.performance_score == second.performance_score == 88
+    
+    def test_analyze_numeric_metric_change_misses_cache(self, analyzer):
+        """Test a change in metric values is re-analyzed rather than served from the cache"""
+        analyzer.client.messages.stream.side_effect = [
+            self._mock_stream(['{"performance_score": 88, "quality_score": 80, "security_score": 90}']),
+            self._mock_stream(['{"performance_score": 52, "quality_score": 80, "security_score": 90}'])
+        ]
+        
+        first = analyzer.analyze({"project_info": {"path": "/repo"}, "performance_metrics": {"avg_complexity": 4.0}})
+        second = analyzer.analyze({"project_info": {"path": "/repo"}, "performance_metrics": {"avg_complexity": 4.5}})
+        
+        assert analyzer.client.messages.stream.call_count == 2
+        assert (first.performance_score, second.performance_score) == (88, 52)
+    
+    def test_analyze_stops_streaming_after_json_block(self, analyzer):
+        """Test the stream is abandoned once the JSON object closes"""
+        chunks = iter([
+            'Here is the analysis:\n{"performance_score": 81, ',
+            '"key_findings": ["Uses {braces} \\"in\\" strings"]}',
+            '\n\nTrailing prose that is never read'
+        ])
+        analyzer.client.messages.stream.return_value = self._mock_stream(chunks)
+        
+        result = analyzer.analyze({"project_info": {"path": "/repo"}})
+        
+        assert result.performance_score == 81
+        assert result.key_findings == ['Uses {braces} "in" strings']
+        assert next(chunks) == '\n\nTrailing prose that is never read'
+    
+    def test_analyze_without_cache(self, config):
+        """Test caching can be disabled"""
+        config.cache_enabled = False
+        with patch('src.codemetrics.analyzer.anthropic.Anthropic'):
+            analyzer = MetricsAnalyzer(config)
+        
+        assert analyzer.cache is None
+    
+    def test_aanalyze_uses_injected_client(self, analyzer):
+        """Test async analysis with a shared AsyncAnthropic client"""
+        async def text_stream():
+            yield '{"performance_score": 77, "quality_score": 80, "security_score": 90}'
+        
+        client = Mock()
+        client.messages.stream.return_value.__aenter__ = AsyncMock(
+            return_value=Mock(text_stream=text_stream())
+        )
+        client.messages.stream.return_value.__aexit__ = AsyncMock(return_value=False)
+        
+        result = asyncio.run(analyzer.aanalyze({"project_info": {"path": "/repo"}}, "full", client))
+        
+        client.messages.stream.assert_called_once()
+        assert result.performance_score == 77
+    
+    def test_build_analysis_prompt_compacts_data(self, analyzer):
+        """Test noise keys are dropped and long values are bounded in prompts"""
+        data = {
+            "timestamp": 1700000000,
+            "git_metrics": {"raw_diff": "diff --git", "authors": list(range(100))},
+            "notes": "x" * 5000
+        }
+        
+        compacted = analyzer._compact_for_prompt(data)
+        prompt = analyzer._build_analysis_prompt(data, "full")
+        
+        assert "timestamp" not in compacted
+        assert "raw_diff" not in compacted["git_metrics"]
+        assert compacted["git_metrics"]["authors"]["omitted"] == 85
+        assert compacted["notes"].endswith("...[truncated 3000 chars]")
+        assert "diff --git" not in prompt
+    
+    def test_extract_scores_from_text(self, analyzer):
+        """Test bullet extraction from free-form responses"""
+        text = """
+        Key Findings:
+        - Slow database queries
+        * Missing indexes
+        Recommendations:
+        • Add query caching
+        - This line mentions an issue and starts a findings section
+        - Flaky tests
+        """
+        
+        result = analyzer._extract_scores_from_text(text, {})
+        
+        assert result.key_findings == ["Slow database queries", "Missing indexes", "Flaky tests"]
+        assert result.recommendations == ["Add query caching"]
+    
+    def test_analysis_result_save(self, tmp_path):
+        """Test results round-trip through save"""
+        result = AnalysisResult(
+            performance_score=85,
+            quality_score=90,
+            security_score=88,
+            key_findings=["Good performance"],
+            recommendations=["Add tests"],
+            metrics={"complexity": 10},
+            timestamp=1234567890.0
+        )
+        output = tmp_path / "reports" / "result.json"
+        
+        result.save(str(output))
+        
+        assert json.loads(output.read_text()) == result.to_dict()
+    
+    def test_fastparse_matches_python_parser(self, analyzer):
+        """Test the native line classifier agrees with the str.split() parser"""
+        from src.codemetrics import _fastparse
+        
+        text = """
+        Key Findings:
+        - Slow database queries
+          *   Missing indexes  
+        Recommendations:
+        • Add query caching
+        plain prose line
+        - This line mentions an ISSUE and starts a findings section
+        -
+        - Flaky tests
+        """
+        
+        assert _fastparse.extract_sections(text) == analyzer._extract_sections(text)
+    
+    def test_fastparse_matches_python_parser_on_unicode_whitespace(self, analyzer):
+        """Test the native classifier strips exactly what str.strip() does, beyond ASCII"""
+        from src.codemetrics import _fastparse
+        
+        spaces = [chr(c) for c in range(0x3001) if chr(c).isspace() and chr(c) != '\n']
+        alphabet = spaces + list("abé中-*• ") + ["Findings:", "ISSUE", "Recommend", "- ", "• ", "\n", "\n"]
+        rng = random.Random(0)
+        
+        for _ in range(2000):
+            text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+            assert _fastparse.extract_sections(text) == analyzer._extract_sections(text), repr(text)
+    
+    def test_unchanged_data_short_circuits_on_fingerprint(self, analyzer):
+        """Test unchanged project data reuses the last response for that project"""
+        data = {"project_info": {"path": "/repo"}, "git_metrics": {"commits": 3}}
+        analyzer._store_cached_response(data, "full", '{"performance_score": 64}')
+        namespace = analyzer._cache_namespace(data, "full")
+        
+        assert analyzer.cache.get_unchanged(namespace, analyzer._fingerprint(dict(data, timestamp=1.0))) is not None
+        assert analyzer.cache.get_unchanged(namespace, analyzer._fingerprint({**data, "git_metrics": {"commits": 4}})) is None
+        assert analyzer.analyze(data).performance_score == 64
+        analyzer.client.messages.stream.assert_not_called()
+    
+    def test_parse_analysis_response_coerces_drifting_fields(self, analyzer):
+        """Test invalid field values fall back to defaults without losing valid ones"""
+        response = '{"performance_score": "high", "quality_score": "92", "key_findings": ["Fast"]}'
+        
+        result = analyzer._parse_analysis_response(response, {})
+        
+        assert result.performance_score == 0
+        assert result.quality_score == 92
+        assert result.key_findings == ["Fast"]
+        assert result.metrics == {}
+    
+    def test_parse_analysis_response_rounds_fractional_scores(self, analyzer):
+        """Test fractional scores are rounded rather than replaced by the default"""
+        response = '{"performance_score": 85.6, "quality_score": 72.4, "security_score": 90.0}'
+
+        result = analyzer._parse_analysis_response(response, {})
+
+        assert (result.performance_score, result.quality_score, result.security_score) == (86, 72, 90)
+
+    def test_parse_analysis_response_with_invalid_json(self, analyzer):
+        """Test malformed JSON falls back to free-form text parsing"""
+        result = analyzer._parse_analysis_response('{"performance_score": 80,,}', {})
+        
+        assert result.metrics["analysis_type"] == "text_parsed"
+    
+    def test_analysis_result_save_jsonl_appends_gzip_records(self, tmp_path):
+        """Test results append as gzip-compressed JSON lines"""
+        result = AnalysisResult(
+            performance_score=85,
+            quality_score=90,
+            security_score=88,
+            key_findings=[],
+            recommendations=[],
+            metrics={},
+            timestamp=1234567890.0
+        )
+        output = tmp_path / "results.jsonl.gz"
+        
+        result.save_jsonl(str(output))
+        result.save_jsonl(str(output))
+        
+        with gzip.open(output, 'rt') as f:
+            records = [json.loads(line) for line in f]
+        assert records == [result.to_dict(), result.to_dict()]
+    
+    @pytest.mark.parametrize("disabled", [(), ("_MSGSPEC_ENCODER",), ("_MSGSPEC_ENCODER", "orjson")])
+    def test_encode_json_backends_agree(self, disabled):
+        """Test every JSON backend encodes nested results identically"""
+        result = AnalysisResult(
+            performance_score=85,
+            quality_score=90,
+            security_score=88,
+            key_findings=["Good performance"],
+            recommendations=[],
+            metrics={"complexity": 10},
+            timestamp=1234567890.0
+        )
+        
+        with ExitStack() as stack:
+            for name in disabled:
+                stack.enter_context(patch(f'src.codemetrics.analyzer.{name}', None))
+            encoded = encode_json({"repo": result}, indent=True)
+        
+        assert json.loads(encoded) == {"repo": result.to_dict()}
+    
+    def test_analyzers_share_one_client_per_api_key(self, config):
+        """Test the Anthropic client is created once per process and API key"""
+        with patch('src.codemetrics.analyzer.anthropic.Anthropic') as mock_anthropic:
+            first = MetricsAnalyzer(config)
+            second = MetricsAnalyzer(config)
+        
+        mock_anthropic.assert_called_once()
+        assert first.client is second.client
+    
+    def test_oversize_data_is_trimmed_then_rejected_before_the_api(self, analyzer):
+        """Test pre-flight trimming and rejection of data beyond the model context"""
+        analyzer.config.max_context_tokens = 500
+        data = {
+            "project_info": {"path": "/repo"},
+            "file_metrics": {f"module_{i}.py": {"lines": i} for i in range(500)}
+        }
+        
+        prompt = analyzer._prepare_prompt(data, "full")
+        assert "module_1.py" not in prompt
+        assert "/repo" in prompt
+        
+        data["project_info"]["notes"] = ["x" * 1000] * 30
+        result = analyzer.analyze(data)
+        
+        assert "pre-flight rejected" in result.key_findings[1]
+        analyzer.client.messages.stream.assert_not_called()
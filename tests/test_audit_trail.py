@@ -0,0 +1,307 @@
+"""
+Tests for the optimization audit trails
+"""
+
+import json
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import patch
+from src.codemetrics.modules.optimization import audit_trail
+from src.codemetrics.modules.optimization.audit_trail import (
+    AuditTrailManager, DatabaseAuditTrail, FileAuditTrail, NUMPY_SUMMARY_THRESHOLD, PATTERN_SAMPLE_SIZE,
+    SHARD_HANDLE_CACHE_SIZE, _pattern_details
+)
+from src.codemetrics.modules.optimization.module_interface import OptimizationRequest
+
+LIFECYCLE = ["optimization_started", "patterns_identified", "optimization_attempt", "optimization_completed"]
+
+def _request(request_id="req-1"):
+    return OptimizationRequest(
+        request_id=request_id,
+        components=["collector", "analyzer"],
+        max_iterations=3,
+        priority_level="high",
+        requester="tests",
+        timestamp=datetime(2024, 1, 1),
+        configuration={}
+    )
+
+def _patterns(count):
+    return [
+        {"component": "collector", "issue_type": "latency", "impact_score": 0.9, "index": i}
+        for i in range(count)
+    ]
+
+def _entry(minute, action, details, actor="system"):
+    return {
+        "entry_id": f"entry-{minute}",
+        "request_id": "req-1",
+        "timestamp": datetime(2024, 1, 1, 12, minute).isoformat(),
+        "action": action,
+        "actor": actor,
+        "details": details
+    }
+
+def _log_lifecycle(trail, request_id="req-1"):
+    trail.log_optimization_start(_request(request_id))
+    trail.log_pattern_identification(request_id, _patterns(2))
+    trail.log_optimization_attempt(request_id, {"iteration": 1, "status": "success"})
+    trail.log_optimization_result(request_id, {"status": "completed"})
+
+@pytest.fixture
+def config(tmp_path):
+    return SimpleNamespace(output_dir=str(tmp_path))
+
+class TestFileAuditTrail:
+    
+    @pytest.fixture
+    def trail(self, config):
+        trail = FileAuditTrail(config)
+        yield trail
+        trail.close()
+    
+    def test_history_in_logged_order(self, trail):
+        """Test flushed entries come back in the order they were logged"""
+        _log_lifecycle(trail)
+        trail.flush()
+        
+        assert [entry["action"] for entry in trail.get_audit_history("req-1")] == LIFECYCLE
+    
+    def test_history_reloads_in_new_instance(self, config, trail):
+        """Test a fresh trail over the same directory reads earlier entries"""
+        _log_lifecycle(trail)
+        trail.close()
+        
+        reloaded = FileAuditTrail(config)
+        try:
+            assert [entry["action"] for entry in reloaded.get_audit_history("req-1")] == LIFECYCLE
+        finally:
+            reloaded.close()
+    
+    def test_close_drains_queue(self, config, trail):
+        """Test close() writes every queued entry before releasing the files"""
+        for i in range(500):
+            trail.log_optimization_attempt("req-1", {"iteration": i})
+        trail.close()
+        
+        lines = (trail.shard_dir / "req-1.jsonl").read_bytes().splitlines()
+        assert [json.loads(line)["details"]["iteration"] for line in lines] == list(range(500))
+        assert len(trail.audit_file.read_bytes().splitlines()) == 500
+    
+    def test_close_rejects_later_entries(self, trail, capsys):
+        """Test entries logged after close() are reported rather than lost silently"""
+        trail.close()
+        trail.log_optimization_attempt("req-1", {"iteration": 1})
+        
+        assert "audit trail is closed" in capsys.readouterr().out
+    
+    def test_shard_handles_evicted_past_cache_size(self, trail):
+        """Test only the most recently used shard descriptors stay open"""
+        request_ids = [f"req-{i}" for i in range(SHARD_HANDLE_CACHE_SIZE + 6)]
+        for request_id in request_ids:
+            trail.log_optimization_attempt(request_id, {"iteration": 1})
+            trail.flush()
+        
+        # Writing to an evicted request reopens its shard
+        trail.log_optimization_attempt("req-0", {"iteration": 2})
+        trail.flush()
+        
+        assert len(trail._writer.shards) == SHARD_HANDLE_CACHE_SIZE
+        assert next(reversed(trail._writer.shards)) == "req-0"
+        assert [entry["details"]["iteration"] for entry in trail.get_audit_history("req-0")] == [1, 2]
+        assert all(len(trail.get_audit_history(request_id)) == 1 for request_id in request_ids[1:])
+    
+    def test_backfills_shards_from_combined_log(self, config, tmp_path):
+        """Test entries logged before sharding stay in the history once a shard exists"""
+        legacy = [
+            {"request_id": "req-1", "action": "optimization_started"},
+            {"request_id": "req-2", "action": "optimization_started"}
+        ]
+        (tmp_path / "audit_trail.jsonl").write_text("".join(json.dumps(entry) + "\n" for entry in legacy))
+        
+        trail = FileAuditTrail(config)
+        try:
+            trail.log_optimization_result("req-1", {"status": "completed"})
+            
+            assert [entry["action"] for entry in trail.get_audit_history("req-1")] == [
+                "optimization_started", "optimization_completed"
+            ]
+            assert len(trail.get_audit_history("req-2")) == 1
+        finally:
+            trail.close()
+    
+    def test_pattern_details_are_digest_and_sample(self, trail):
+        """Test identified patterns are recorded as a count, a hash and a sample"""
+        trail.log_pattern_identification("req-1", _patterns(PATTERN_SAMPLE_SIZE + 3))
+        trail.log_pattern_identification("req-1", _patterns(PATTERN_SAMPLE_SIZE + 3))
+        
+        first, second = (entry["details"] for entry in trail.get_audit_history("req-1"))
+        
+        assert set(first) == {"pattern_count", "patterns_hash", "sample"}
+        assert first["pattern_count"] == PATTERN_SAMPLE_SIZE + 3
+        assert first["sample"] == _patterns(PATTERN_SAMPLE_SIZE)
+        assert len(first["patterns_hash"]) == 32
+        assert first["patterns_hash"] == second["patterns_hash"]
+
+class TestDatabaseAuditTrail:
+    
+    @pytest.fixture
+    def trail(self, config):
+        trail = DatabaseAuditTrail(config)
+        yield trail
+        trail.close()
+    
+    def test_history_in_logged_order(self, trail):
+        """Test in-memory history keeps the logged order"""
+        _log_lifecycle(trail)
+        
+        assert [entry["action"] for entry in trail.get_audit_history("req-1")] == LIFECYCLE
+    
+    def test_history_reloads_from_jsonl(self, config, trail):
+        """Test a fresh trail loads the persisted JSONL trail"""
+        _log_lifecycle(trail)
+        trail.flush()
+        
+        assert (trail.storage_path / "req-1.jsonl").exists()
+        history = DatabaseAuditTrail(config).get_audit_history("req-1")
+        assert [entry["action"] for entry in history] == LIFECYCLE
+        assert history == trail.get_audit_history("req-1")
+    
+    def test_history_reloads_from_legacy_array(self, config, trail):
+        """Test trails persisted as a single JSON array still load"""
+        legacy = [
+            {
+                "entry_id": f"entry-{i}",
+                "request_id": "req-1",
+                "timestamp": datetime(2024, 1, 1, 12, i).isoformat(),
+                "action": action,
+                "actor": "system",
+                "details": {}
+            }
+            for i, action in enumerate(LIFECYCLE)
+        ]
+        (trail.storage_path / "req-1.json").write_text(json.dumps(legacy))
+        
+        history = trail.get_audit_history("req-1")
+        
+        assert [entry["action"] for entry in history] == LIFECYCLE
+        assert history[-1]["timestamp"] == "2024-01-01T12:03:00"
+    
+    def test_close_drains_pending_persists(self, config, trail):
+        """Test close() finishes scheduled persists"""
+        for i in range(20):
+            _log_lifecycle(trail, f"req-{i}")
+        trail.close()
+        
+        reloaded = DatabaseAuditTrail(config)
+        assert all(len(reloaded.get_audit_history(f"req-{i}")) == len(LIFECYCLE) for i in range(20))
+    
+    def test_pattern_details_are_digest_and_sample(self, trail):
+        """Test identified patterns are recorded as a digest and sample with a summary"""
+        trail.log_pattern_identification("req-1", _patterns(PATTERN_SAMPLE_SIZE + 3))
+        
+        [entry] = trail.get_audit_history("req-1")
+        details = entry["details"]
+        
+        assert set(details) == {"pattern_count", "patterns_hash", "sample", "analysis_summary"}
+        assert details["pattern_count"] == PATTERN_SAMPLE_SIZE + 3
+        assert details["sample"] == _patterns(PATTERN_SAMPLE_SIZE)
+        assert details["analysis_summary"]["total_patterns"] == PATTERN_SAMPLE_SIZE + 3
+    
+    def test_large_pattern_summary_matches_python_path(self, trail):
+        """Test the numpy summary of a long pattern list matches the pure-Python one"""
+        patterns = [
+            {"component": "collector" if i % 4 else "analyzer", "issue_type": "latency", "impact_score": (i % 10) / 10}
+            for i in range(NUMPY_SUMMARY_THRESHOLD + 36)
+        ]
+        
+        summary = trail._generate_pattern_summary(patterns)
+        with patch.object(audit_trail, "np", None):
+            assert trail._generate_pattern_summary(patterns) == summary
+        
+        assert summary["total_patterns"] == 100
+        assert summary["component_distribution"] == {"analyzer": 25, "collector": 75}
+        assert summary["average_impact_score"] == 0.45
+        assert summary["high_priority_patterns"] == 10
+        assert summary["recommendations"] == [
+            "Focus optimization efforts on collector component",
+            "Prioritize 10 high-impact patterns for immediate action"
+        ]
+
+class TestAuditTrailManager:
+    
+    def _manager(self, history):
+        return AuditTrailManager(SimpleNamespace(get_audit_history=lambda request_id: history))
+    
+    def test_report_orders_out_of_order_history(self):
+        """Test the report timeline is chronological and unknown actions get a generic summary"""
+        history = [
+            _entry(0, "optimization_started", {"components": ["collector", "analyzer"]}),
+            _entry(2, "optimization_attempt", {"iteration": 1, "status": "success"}),
+            _entry(1, "patterns_identified", {"pattern_count": 7}),
+            _entry(3, "manual_review", {}, actor="alice"),
+            _entry(5, "optimization_completed", {"status": "completed"})
+        ]
+        
+        report = self._manager(history).generate_audit_report("req-1")
+        
+        assert [event["summary"] for event in report["timeline"]] == [
+            "Started optimization for 2 components: collector, analyzer",
+            "AI identified 7 optimization patterns",
+            "Iteration 1 success",
+            "Action: manual_review by alice",
+            "Optimization completed"
+        ]
+        assert [decision["decision_type"] for decision in report["decision_analysis"]["decision_timeline"]] == [
+            "optimization_attempt", "patterns_identified"
+        ]
+        assert report["performance_analysis"] == {
+            "total_duration_seconds": 300.0,
+            "iterations_completed": 1,
+            "successful_iterations": 1,
+            "success_rate": 1.0
+        }
+        assert report["compliance_check"]["compliant"] is True
+        assert report["recommendations"] == ["Audit trail appears complete and compliant"]
+    
+    def test_report_flags_incomplete_history(self):
+        """Test an in-order history missing lifecycle actions is reported as non-compliant"""
+        history = [
+            _entry(0, "optimization_started", {"components": ["collector"]}),
+            _entry(1, "optimization_attempt", {"iteration": 1, "status": "failed"})
+        ]
+        
+        report = self._manager(history).generate_audit_report("req-1")
+        
+        assert [event["action"] for event in report["timeline"]] == ["optimization_started", "optimization_attempt"]
+        assert report["performance_analysis"]["total_duration_seconds"] is None
+        assert report["compliance_check"]["compliance_score"] == 0.5
+        assert sorted(report["compliance_check"]["missing_actions"]) == [
+            "optimization_completed", "patterns_identified"
+        ]
+        assert report["recommendations"][0] == "Low success rate detected - review optimization criteria"
+        assert report["recommendations"][1].startswith("Missing audit actions: ")
+    
+    def test_report_without_history(self):
+        """Test a request with no audit entries reports an error"""
+        assert self._manager([]).generate_audit_report("req-1") == {"error": "No audit history found for request"}
+
+def test_pattern_digest_is_canonical():
+    """Test the patterns digest is pinned and independent of key order and JSON backend"""
+    patterns = [
+        {"impact_score": 0.9, "component": "collector", "issue_type": "latency"},
+        {"component": "analyzer", "when": datetime(2024, 1, 1)}
+    ]
+    reordered = [dict(reversed(list(pattern.items()))) for pattern in patterns]
+    
+    assert _pattern_details(patterns)["patterns_hash"] == "d6f88728cf7d76b47907f8c565b09547"
+    assert _pattern_details(reordered)["patterns_hash"] == "d6f88728cf7d76b47907f8c565b09547"
+    with patch.object(audit_trail, "orjson", None), patch.object(audit_trail, "_MSGSPEC_ENCODER", None):
+        assert _pattern_details(patterns)["patterns_hash"] == "d6f88728cf7d76b47907f8c565b09547"
+
+def test_indeterminate_iov_max_falls_back():
+    """Test sysconf's -1 (no fixed limit) never becomes a writev batch size"""
+    with patch.object(audit_trail.os, "sysconf", return_value=-1):
+        assert audit_trail._writev_limit() == 1024
+    assert audit_trail._IOV_MAX > 0
@@ -0,0 +1,360 @@
+"""
+Tests for the DataCollector class
+"""
+
+import sqlite3
+import subprocess
+import time
+import pytest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest.mock import patch
+from src.codemetrics import collector as collector_module
+from src.codemetrics.collector import (
+    DataCollector, _analyze_file_worker, _count_endpoints_worker, _sensitive_patterns_worker
+)
+from src.codemetrics._cache import FileMetricsCache
+from src.codemetrics.config import Config
+
+class TestDataCollector:
+    
+    @pytest.fixture
+    def collector(self, tmp_path):
+        """Create a test collector"""
+        return DataCollector(Config(anthropic_api_key="test-key", cache_dir=str(tmp_path / "cache")))
+    
+    @pytest.fixture
+    def project(self, tmp_path):
+        """Create a small project tree"""
+        root = tmp_path / "project"
+        (root / "src").mkdir(parents=True)
+        (root / "tests").mkdir()
+        (root / "docs").mkdir()
+        (root / "node_modules" / "pkg").mkdir(parents=True)
+        
+        (root / "README.md").write_text("# Project\n")
+        (root / "src" / "app.py").write_text(
+            "# entry point\n"
+            "\n"
+            "@app.route('/')\n"
+            "def index():\n"
+            "    if True:\n"
+            "        return 'ok'\n"
+        )
+        (root / "src" / "auth.py").write_text("password = None\n")
+        (root / "tests" / "test_app.py").write_text("def test_index():\n    pass\n")
+        (root / "node_modules" / "pkg" / "index.js").write_text("module.exports = {}\n")
+        return root
+    
+    def test_scan_skips_ignored_directories(self, collector, project):
+        """Test the walk never descends into ignored directories"""
+        files = collector._scan_once(project)
+        
+        names = sorted(record.name for record in files)
+        assert names == ["README.md", "app.py", "auth.py", "test_app.py"]
+        assert all(record.size > 0 for record in files)
+        assert {record.suffix for record in files} == {".md", ".py"}
+    
+    def test_collect_project_data(self, collector, project):
+        """Test full collection over a single walk"""
+        data = collector.collect_project_data(str(project))
+        
+        assert data["project_info"]["file_count"] == 4
+        assert data["project_info"]["programming_languages"] == ["Python"]
+        assert data["project_info"]["has_files"]["README.md"] is True
+        
+        file_metrics = data["file_metrics"]
+        assert file_metrics["code_files"] == 3
+        assert file_metrics["total_lines"] == 9
+        assert file_metrics["comment_lines"] == 1
+        assert file_metrics["empty_lines"] == 1
+        assert file_metrics["largest_files"][0]["file"] == "src/app.py"
+        
+        assert data["performance_metrics"]["api_endpoints"] == 1
+        assert data["quality_metrics"]["test_coverage"] == "low"
+        assert data["security_metrics"]["security_files"] == 1
+        assert data["security_metrics"]["sensitive_patterns"] == ["Found 'password' pattern in auth.py"]
+    
+    def test_analyze_file_counts(self, collector, tmp_path):
+        """Test line classification and complexity over raw bytes"""
+        source = tmp_path / "module.py"
+        source.write_bytes(
+            b"# header\r\n"
+            b"  \r\n"
+            b"if ready:\r\n"
+            b"    for item in items:  # loop\r\n"
+            b"        // while\r\n"
+            b"        notify(item)"
+        )
+        
+        metrics = _analyze_file_worker(str(source))
+        
+        assert metrics == {
+            "total_lines": 6,
+            "code_lines": 3,
+            "comment_lines": 2,
+            "empty_lines": 1,
+            "complexity": 2
+        }
+    
+    def test_analyze_file_unreadable(self, collector, tmp_path):
+        """Test missing files report zero metrics"""
+        metrics = _analyze_file_worker(str(tmp_path / "missing.py"))
+        
+        assert metrics["total_lines"] == 0
+        assert metrics["complexity"] == 0
+    
+    def test_unchanged_files_are_not_reread(self, collector, project, tmp_path):
+        """Test per-file metrics come from the on-disk cache on a warm run"""
+        first = collector.collect_project_data(str(project))
+        
+        warm = DataCollector(Config(anthropic_api_key="test-key", cache_dir=str(tmp_path / "cache")))
+        with patch.object(collector_module, '_analyze_file_worker', side_effect=AssertionError("file re-read")), \
+                patch.object(collector_module, '_count_endpoints_worker', side_effect=AssertionError("file re-read")), \
+                patch.object(collector_module, '_sensitive_patterns_worker', side_effect=AssertionError("file re-read")):
+            second = warm.collect_project_data(str(project))
+        
+        assert second["file_metrics"] == first["file_metrics"]
+        assert second["performance_metrics"] == first["performance_metrics"]
+        assert second["security_metrics"] == first["security_metrics"]
+    
+    def test_changed_file_is_reanalyzed(self, collector, project):
+        """Test a modified file misses the cache"""
+        collector.collect_project_data(str(project))
+        
+        app = project / "src" / "app.py"
+        app.write_text(app.read_text() + "\n@app.route('/health')\ndef health():\n    return 'ok'\n")
+        
+        data = collector.collect_project_data(str(project))
+        
+        assert data["performance_metrics"]["api_endpoints"] == 2
+    
+    def test_cache_disabled(self, tmp_path, project):
+        """Test no metrics database is created when caching is off"""
+        collector = DataCollector(Config(cache_enabled=False, cache_dir=str(tmp_path / "nocache")))
+        
+        data = collector.collect_project_data(str(project))
+        
+        assert data["file_metrics"]["code_files"] == 3
+        assert not (tmp_path / "nocache").exists()
+    
+    def test_parallel_matches_serial(self, tmp_path, project):
+        """Test worker-pool results match the in-process scan"""
+        serial = DataCollector(Config(cache_enabled=False, max_workers=1))
+        parallel = DataCollector(Config(cache_enabled=False, max_workers=2))
+        
+        expected = serial.collect_project_data(str(project))
+        with patch.object(collector_module, 'PARALLEL_MIN_FILES', 1), \
+                patch.object(ProcessPoolExecutor, 'shutdown', autospec=True,
+                             side_effect=ProcessPoolExecutor.shutdown) as shutdown:
+            actual = parallel.collect_project_data(str(project))
+        
+        for key in ("file_metrics", "performance_metrics", "security_metrics"):
+            assert actual[key] == expected[key]
+        assert shutdown.call_count == 1
+    
+    def test_concurrent_collections_on_one_collector(self, tmp_path, project):
+        """Test overlapping collections never share or shut down each other's pool"""
+        collector = DataCollector(Config(cache_dir=str(tmp_path / "cache"), max_workers=2))
+        expected = DataCollector(Config(cache_enabled=False, max_workers=1)).collect_project_data(str(project))
+        start_pool = collector_module._Collection.pool
+        
+        def slow_pool(collection):
+            # Widen the window in which one collection could tear down another's pool
+            time.sleep(0.1)
+            return start_pool(collection)
+        
+        with patch.object(collector_module, 'PARALLEL_MIN_FILES', 1), \
+                patch.object(collector_module._Collection, 'pool', slow_pool), \
+                ThreadPoolExecutor(max_workers=4) as threads:
+            results = list(threads.map(lambda _: collector.collect_project_data(str(project)), range(4)))
+        
+        for data in results:
+            for key in ("file_metrics", "performance_metrics", "security_metrics"):
+                assert data[key] == expected[key]
+    
+    def test_node_dependencies(self, collector, project):
+        """Test package.json dependency counts"""
+        (project / "package.json").write_text(
+            '{"name": "app", "scripts": {"test": "jest"}, '
+            '"dependencies": {"react": "^18.0.0", "axios": "^1.0.0"}, '
+            '"devDependencies": {"jest": "^29.0.0"}}'
+        )
+        
+        deps = collector._get_node_dependencies(project)
+        
+        assert deps == {
+            "has_package_json": True,
+            "dependency_count": 2,
+            "dev_dependency_count": 1,
+            "total_dependencies": 3
+        }
+    
+    def test_node_dependencies_invalid_json(self, collector, project):
+        """Test a malformed package.json is reported as missing"""
+        (project / "package.json").write_text("{not json")
+        
+        assert collector._get_node_dependencies(project)["has_package_json"] is False
+    
+    @pytest.mark.parametrize("path,ignored", [
+        ("node_modules", True),
+        ("src/__pycache__/app.cpython-311.pyc", True),
+        (".venv", True),
+        ("rebuild.py", True),
+        ("src/app.py", False),
+        ("README.md", False),
+    ])
+    def test_should_ignore_file(self, collector, path, ignored):
+        """Test ignore patterns match anywhere in the path"""
+        assert collector._should_ignore_file(path) is ignored
+    
+    def test_count_endpoints(self, tmp_path):
+        """Test route decorators are counted from the mapped file"""
+        routes = tmp_path / "routes.py"
+        routes.write_text("@app.get('/')\n@router.post('/items')\n@router.delete('/items')\n")
+        empty = tmp_path / "empty.py"
+        empty.write_text("")
+        
+        assert _count_endpoints_worker(str(routes)) == 3
+        assert _count_endpoints_worker(str(empty)) == 0
+        assert _count_endpoints_worker(str(tmp_path / "missing.py")) == 0
+    
+    def test_git_metrics(self, collector, project):
+        """Test commit counts come from a single git invocation"""
+        subprocess.run(["git", "init", "-q"], cwd=project, check=True)
+        for n in range(3):
+            subprocess.run(
+                ["git", "-c", "user.name=test", "-c", "user.email=test@example.com",
+                 "commit", "-q", "--allow-empty", "-m", f"commit {n}"],
+                cwd=project, check=True
+            )
+        
+        with patch.object(collector_module.subprocess, 'run', wraps=subprocess.run) as run:
+            metrics = collector._get_git_metrics(project)
+        
+        assert metrics == {"is_git_repo": True, "commit_count": 3, "recent_commits": 3}
+        assert run.call_count == 1
+    
+    def test_git_metrics_not_a_repo(self, collector, project):
+        """Test non-repositories skip git entirely"""
+        assert collector._get_git_metrics(project) == {"is_git_repo": False}
+    
+    def test_ecosystem_integration(self, collector, project):
+        """Test integration markers are read from directory listings"""
+        workflows = project / ".github" / "workflows"
+        workflows.mkdir(parents=True)
+        (workflows / "codereview.yml").write_text("on: push\n")
+        (project / "module.json").write_text("{}")
+        (project / "docker-compose.yml").write_text("services: {}\n")
+        
+        data = collector.collect_project_data(str(project), analysis_type="quality")
+        
+        assert data["ecosystem_integration"] == {
+            "standardized_framework": True,
+            "codecreate_compatible": False,
+            "codereview_configured": True,
+            "github_actions": True
+        }
+        assert data["dependency_analysis"]["docker"] == {
+            "has_dockerfile": False,
+            "has_docker_compose": True,
+            "containerized": True
+        }
+        assert data["quality_metrics"]["documentation_score"] == "basic"
+    
+    def test_sensitive_patterns(self, tmp_path):
+        """Test sensitive patterns are matched case-insensitively, including overlaps"""
+        settings = tmp_path / "settings.py"
+        settings.write_text("DB_PASSWORD = env('SECRETOKEN')\nAPI_KEY = None\n")
+        
+        assert _sensitive_patterns_worker(str(settings)) == ["password", "secret", "token", "api_key"]
+    
+    def test_sensitive_findings_are_capped(self, collector, project):
+        """Test the scan stops at ten findings"""
+        for n in range(5):
+            (project / "src" / f"creds_{n}.py").write_text("password = secret = token = None\n")
+        
+        findings = collector._scan_sensitive_patterns(collector._scan_once(project))
+        
+        assert len(findings) == 10
+    
+    def test_largest_files_top_ten(self, collector, tmp_path):
+        """Test only the ten longest code files are kept, longest first"""
+        root = tmp_path / "many"
+        root.mkdir()
+        for n in range(15):
+            (root / f"mod_{n:02d}.py").write_text("x = 1\n" * (n + 1))
+        
+        largest = collector.collect_project_data(str(root))["file_metrics"]["largest_files"]
+        
+        assert [entry["lines"] for entry in largest] == list(range(15, 5, -1))
+        assert largest[0] == {"file": "mod_14.py", "lines": 15, "size_bytes": 90}
+    
+    def test_oversized_files_are_skipped(self, tmp_path, project):
+        """Test code files past max_file_size_kb are counted but not read"""
+        (project / "src" / "generated.py").write_text("x = 1\n" * 400)
+        collector = DataCollector(Config(cache_enabled=False, max_file_size_kb=1))
+        
+        file_metrics = collector.collect_project_data(str(project))["file_metrics"]
+        
+        assert file_metrics["code_files"] == 4
+        assert file_metrics["skipped_files"] == 1
+        assert file_metrics["total_lines"] == 9
+        assert all(entry["file"] != "src/generated.py" for entry in file_metrics["largest_files"])
+    
+    def test_python_dependencies(self, collector, project):
+        """Test requirements are counted in full but only the first twenty are listed"""
+        lines = ["# pinned", "", "  # indented comment"] + [f"package{n}==1.0" for n in range(25)]
+        (project / "requirements.txt").write_text("\n".join(lines) + "\n")
+        
+        deps = collector._get_python_dependencies(project)
+        
+        assert deps["has_requirements"] is True
+        assert deps["dependency_count"] == 25
+        assert deps["dependencies"][:2] == ["package0==1.0", "package1==1.0"]
+        assert len(deps["dependencies"]) == 20
+    
+    def test_locked_metrics_cache_is_a_miss(self, tmp_path, project):
+        """Test a metrics database locked by another process is treated as a cache miss"""
+        db_path = tmp_path / "cache" / "file_metrics.db"
+        warm = DataCollector(Config(cache_dir=str(tmp_path / "cache"), max_workers=1))
+        expected = warm.collect_project_data(str(project))
+        warm._file_cache.close()
+        
+        collector = DataCollector(Config(cache_dir=str(tmp_path / "cache"), max_workers=1))
+        collector._file_cache = FileMetricsCache(db_path, busy_timeout=0.05)
+        (project / "src" / "extra.py").write_text("x = 1\n")
+        
+        # Another collector process holding the write lock for the whole run
+        holder = sqlite3.connect(str(db_path), isolation_level=None)
+        holder.execute("BEGIN EXCLUSIVE")
+        try:
+            data = collector.collect_project_data(str(project))
+        finally:
+            holder.execute("ROLLBACK")
+            holder.close()
+        
+        assert data["file_metrics"]["code_files"] == expected["file_metrics"]["code_files"] + 1
+        assert data["security_metrics"] == expected["security_metrics"]
+    
+    def test_metrics_written_in_one_transaction(self, collector, project):
+        """Test each batch of computed metrics is stored with one write"""
+        with patch.object(collector._file_cache, 'set_many', wraps=collector._file_cache.set_many) as set_many:
+            collector.collect_project_data(str(project), analysis_type="performance")
+        
+        # Line metrics, then endpoint counts
+        assert set_many.call_count == 2
+        
+        warm = DataCollector(collector.config)
+        with patch.object(warm._file_cache, 'set_many') as set_many:
+            warm.collect_project_data(str(project), analysis_type="performance")
+        set_many.assert_not_called()
+    
+    def test_full_collection_reads_each_file_entry_once(self, collector, project):
+        """Test the full analysis shares one walk and one cache lookup per file"""
+        with patch.object(collector, '_scan_once', wraps=collector._scan_once) as scan, \
+                patch.object(collector._file_cache, 'get', wraps=collector._file_cache.get) as get:
+            collector.collect_project_data(str(project), analysis_type="full")
+        
+        assert scan.call_count == 1
+        looked_up = [call.args[0] for call in get.call_args_list]
+        assert len(looked_up) == len(set(looked_up))
@@ -2,6 +2,7 @@
 Tests for the Config class
 """
 
+import os
 import pytest
 import tempfile
 import yaml
@@ -20,6 +21,13 @@ class TestConfig:
         assert config.cache_enabled == True
         assert config.max_retries == 3
     
+    def test_cache_dir_defaults_outside_working_tree(self, tmp_path, monkeypatch):
+        """Test the cache lives in the user cache directory, not the scanned repository"""
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+        
+        assert Config().cache_dir == str(tmp_path / "codemetrics")
+        assert Config().cache_similarity_threshold is None
+    
     def test_config_validation_success(self):
         """Test successful config validation"""
         config = Config(anthropic_api_key="test-key")
@@ -94,3 +102,47 @@ class TestConfig:
             assert 'anthropic_api_key' not in saved_data
         finally:
             Path(config_path).unlink()
+    
+    def test_config_load_reparses_edited_file(self, tmp_path):
+        """Test cached config parses are invalidated by edits and never shared"""
+        config_path = tmp_path / "config.yml"
+        config_path.write_text(yaml.dump({'model': 'first-model', 'ecosystem_repos': ['a/b']}))
+        
+        first = Config.load(str(config_path))
+        first.ecosystem_repos.append('c/d')
+        assert Config.load(str(config_path)).ecosystem_repos == ['a/b']
+        
+        config_path.write_text(yaml.dump({'model': 'second-model'}))
+        os.utime(config_path, ns=(0, config_path.stat().st_mtime_ns + 1_000_000))
+        
+        assert Config.load(str(config_path)).model == 'second-model'
+    
+    def test_default_lists_are_not_shared(self):
+        """Test list defaults are fresh copies per instance"""
+        first = Config()
+        first.ecosystem_repos.append("someone/else")
+        
+        assert "someone/else" not in Config().ecosystem_repos
+        assert Config().ecosystem_repos[-1] == "Jita81/CODEMETRICS"
+    
+    def test_api_key_default_reads_environment(self, monkeypatch):
+        """Test the API key default reflects the environment at construction time"""
+        monkeypatch.setenv('ANTHROPIC_API_KEY', 'late-key')
+        
+        assert Config().anthropic_api_key == 'late-key'
+    
+    def test_config_load_env_overrides(self, tmp_path, monkeypatch):
+        """Test environment variables override file values with typed parsing"""
+        config_path = tmp_path / "config.yml"
+        config_path.write_text(yaml.dump({'model': 'file-model', 'max_tokens': 100, 'cache_enabled': True}))
+        monkeypatch.setenv('CODEMETRICS_MAX_TOKENS', '2048')
+        monkeypatch.setenv('CODEMETRICS_TEMPERATURE', '0.7')
+        monkeypatch.setenv('CODEMETRICS_CACHE_ENABLED', 'off')
+        monkeypatch.delenv('CODEMETRICS_MODEL', raising=False)
+        
+        config = Config.load(str(config_path))
+        
+        assert config.model == 'file-model'
+        assert config.max_tokens == 2048
+        assert config.temperature == 0.7
+        assert config.cache_enabled is False
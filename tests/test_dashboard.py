@@ -0,0 +1,263 @@
+"""
+Tests for the Dashboard web app
+"""
+
+import gzip
+import itertools
+import json
+import threading
+import pytest
+from unittest.mock import patch
+from src.codemetrics.analyzer import AnalysisResult
+from src.codemetrics.config import Config
+from src.codemetrics.dashboard import Dashboard
+from src.codemetrics._client import reset_clients
+
+pytest.importorskip("flask")
+
+class TestDashboard:
+    
+    @pytest.fixture
+    def dashboard(self, tmp_path):
+        """Create a dashboard with a mocked Anthropic client"""
+        reset_clients()
+        config = Config(anthropic_api_key="test-key", cache_dir=str(tmp_path / "cache"))
+        with patch('src.codemetrics.analyzer.anthropic.Anthropic'):
+            yield Dashboard(config)
+        reset_clients()
+    
+    @pytest.fixture
+    def client(self, dashboard):
+        """Flask test client"""
+        return dashboard.app.test_client()
+    
+    def test_ecosystem_health(self, client):
+        """Test the ecosystem health endpoint returns JSON"""
+        response = client.get('/api/ecosystem-health')
+        
+        assert response.status_code == 200
+        assert response.mimetype == 'application/json'
+        data = json.loads(response.data)
+        assert data['overall_health'] == 94
+        assert set(data['components']) == {
+            'standardized_framework', 'codecreate', 'codereview', 'codetest', 'codemetrics'
+        }
+    
+    def test_get_metrics(self, client):
+        """Test the project metrics endpoint"""
+        response = client.get('/api/metrics/demo')
+        
+        data = json.loads(response.data)
+        assert data['project_name'] == 'demo'
+        assert data['metrics']['quality_score'] == 92
+    
+    @staticmethod
+    def _wait_for_job(dashboard, client, response):
+        """Wait for a submitted analysis and fetch its result"""
+        assert response.status_code == 202
+        job_id = json.loads(response.data)['job_id']
+        dashboard._jobs[job_id].result(timeout=10)
+        return client.get(f'/api/analyze/{job_id}')
+    
+    def test_analyze(self, dashboard, client):
+        """Test analysis runs as a job whose results are returned as JSON"""
+        result = AnalysisResult(
+            performance_score=80, quality_score=85, security_score=90,
+            key_findings=["finding"], recommendations=["recommendation"],
+            metrics={'complexity': 'low'}, timestamp=123.0
+        )
+        with patch.object(dashboard.collector, 'collect_project_data', return_value={}), \
+                patch.object(dashboard.analyzer, 'analyze', return_value=result):
+            submitted = client.post('/api/analyze', json={'project_path': '.', 'analysis_type': 'full'})
+            response = self._wait_for_job(dashboard, client, submitted)
+        
+        assert json.loads(submitted.data)['status'] == 'pending'
+        assert response.status_code == 200
+        data = json.loads(response.data)
+        assert data['success'] is True
+        assert data['results']['security_score'] == 90
+        assert data['results'] == result.to_dict()
+    
+    def test_analyze_error(self, dashboard, client):
+        """Test analysis failures return a JSON 500"""
+        with patch.object(dashboard.collector, 'collect_project_data', side_effect=RuntimeError("boom")):
+            response = self._wait_for_job(dashboard, client, client.post('/api/analyze', json={'project_path': '.'}))
+        
+        assert response.status_code == 500
+        assert json.loads(response.data) == {'success': False, 'error': 'boom'}
+    
+    def test_analyze_pending_and_unknown_jobs(self, dashboard, client):
+        """Test polling a running job returns 202 and an unknown job 404"""
+        release = threading.Event()
+        with patch.object(dashboard.collector, 'collect_project_data', side_effect=lambda *args: release.wait(10) and {}), \
+                patch.object(dashboard.analyzer, 'analyze', side_effect=RuntimeError("done")):
+            job_id = json.loads(client.post('/api/analyze', json={}).data)['job_id']
+            pending = client.get(f'/api/analyze/{job_id}')
+            release.set()
+            dashboard._jobs[job_id].result(timeout=10)
+        
+        assert pending.status_code == 202
+        assert json.loads(pending.data) == {'success': True, 'status': 'pending', 'job_id': job_id}
+        assert client.get('/api/analyze/missing').status_code == 404
+    
+    @pytest.mark.parametrize("body", [
+        b"{not json", b"[1, 2]", b'{"project_path": 3}', b'{"analysis_type": "everything"}'
+    ])
+    def test_analyze_rejects_bad_body(self, dashboard, client, body):
+        """Test malformed bodies are rejected before any collection starts"""
+        with patch.object(dashboard.collector, 'collect_project_data') as collect:
+            response = client.post('/api/analyze', data=body, content_type='application/json')
+        
+        assert response.status_code == 400
+        assert json.loads(response.data)['success'] is False
+        collect.assert_not_called()
+    
+    def test_dashboard_page_is_cached(self, dashboard, client):
+        """Test the page is rendered once and revalidates with its ETag"""
+        with patch.object(dashboard, '_render_dashboard', side_effect=AssertionError("re-rendered")):
+            response = client.get('/')
+            revalidated = client.get('/', headers={'If-None-Match': response.headers['ETag']})
+        
+        assert response.status_code == 200
+        assert response.mimetype == 'text/html'
+        assert b'CodeMetrics Dashboard' in response.data
+        assert 'max-age=300' in response.headers['Cache-Control']
+        assert revalidated.status_code == 304
+        assert revalidated.data == b''
+    
+    def test_dashboard_page_is_precompressed(self, dashboard, client):
+        """Test clients accepting gzip get the compressed page with its own ETag"""
+        plain = client.get('/')
+        response = client.get('/', headers={'Accept-Encoding': 'gzip, deflate'})
+        
+        assert response.headers['Content-Encoding'] == 'gzip'
+        assert 'Accept-Encoding' in response.headers['Vary']
+        assert gzip.decompress(response.data) == plain.data
+        assert response.headers['ETag'] != plain.headers['ETag']
+        assert 'Content-Encoding' not in plain.headers
+    
+    def test_static_assets_use_builtin_route(self, dashboard):
+        """Test assets are served by Flask's conditional static handler"""
+        rules = [rule for rule in dashboard.app.url_map.iter_rules() if rule.rule.startswith('/static/')]
+        
+        assert [rule.endpoint for rule in rules] == ['static']
+        assert dashboard.app.config['SEND_FILE_MAX_AGE_DEFAULT'] == 86400
+        assert dashboard.app.use_x_sendfile is False
+    
+    def test_ecosystem_health_is_cached(self, dashboard, client):
+        """Test polls within the TTL reuse the serialized payload"""
+        first = client.get('/api/ecosystem-health')
+        with patch('src.codemetrics.dashboard.time.time', return_value=dashboard._eco_cache[0] + 1):
+            second = client.get('/api/ecosystem-health')
+        
+        assert first.data == second.data
+        
+        dashboard._eco_cache = (0.0, *dashboard._eco_cache[1:])
+        with patch('src.codemetrics.dashboard.time.time', return_value=10000.0):
+            third = json.loads(client.get('/api/ecosystem-health').data)
+        
+        assert third['last_check'] == 10000.0
+    
+    def test_ecosystem_health_payload(self, client):
+        """Test the rendered payload, timestamps included, field for field"""
+        with patch('src.codemetrics.dashboard.time.time', return_value=10000.0):
+            data = json.loads(client.get('/api/ecosystem-health').data)
+        
+        assert data == {
+            'overall_health': 94,
+            'components': {
+                'standardized_framework': {'status': 'active', 'health_score': 95, 'last_activity': 6400.0},
+                'codecreate': {'status': 'active', 'health_score': 92, 'last_activity': 8200.0},
+                'codereview': {'status': 'active', 'health_score': 97, 'last_activity': 9100.0},
+                'codetest': {'status': 'active', 'health_score': 90, 'last_activity': 8800.0},
+                'codemetrics': {'status': 'active', 'health_score': 93, 'last_activity': 10000.0}
+            },
+            'integration_score': 91,
+            'performance_trends': 'improving',
+            'last_check': 10000.0
+        }
+        assert 'last_activity' not in Dashboard._ECO_TEMPLATE['components']['codecreate']
+    
+    def test_static_report(self, dashboard, tmp_path):
+        """Test the static report lists escaped findings and recommendations"""
+        output = tmp_path / "reports" / "report.html"
+        
+        dashboard.generate_static_report({
+            'performance_score': 81,
+            'quality_score': 82,
+            'security_score': 83,
+            'key_findings': ['Uses <script> tags', 'Fast & small'],
+            'recommendations': ['Add tests']
+        }, str(output))
+        
+        html = output.read_text(encoding='utf-8')
+        assert '<li>Uses &lt;script&gt; tags</li><li>Fast &amp; small</li>' in html
+        assert '<li>Add tests</li>' in html
+        assert '<div class="score">83</div>' in html
+        assert '.score { font-size: 3em;' in html
+    
+    def test_static_report_batch_creates_dir_once(self, dashboard, tmp_path):
+        """Test a batch of reports into one directory only creates it once"""
+        results = {'key_findings': [], 'recommendations': []}
+        (tmp_path / "batch").mkdir()
+        with patch('src.codemetrics.dashboard.Path.mkdir') as mkdir:
+            for n in range(3):
+                dashboard.generate_static_report(results, str(tmp_path / "batch" / f"report-{n}.html"))
+        
+        assert mkdir.call_count == 1
+        assert len(list((tmp_path / "batch").iterdir())) == 3
+    
+    def test_run_uses_waitress_outside_debug(self, dashboard):
+        """Test production runs go through waitress and debug runs through Flask"""
+        with patch('src.codemetrics.dashboard.serve') as serve, \
+                patch.object(dashboard.app, 'run') as flask_run:
+            dashboard.run(host='127.0.0.1', port=9000)
+            dashboard.run(host='127.0.0.1', port=9000, debug=True)
+        
+        serve.assert_called_once_with(dashboard.app, host='127.0.0.1', port=9000, threads=8)
+        flask_run.assert_called_once_with(host='127.0.0.1', port=9000, debug=True, threaded=True)
+    
+    def test_ecosystem_health_reads_clock_once(self, dashboard, client):
+        """Test a rebuild stamps the payload and the cache from one clock read"""
+        # Every read returns a later time, so a second read would show up as a mismatch
+        with patch('src.codemetrics.dashboard.time.time', side_effect=itertools.count(10000.0)):
+            data = json.loads(client.get('/api/ecosystem-health').data)
+        
+        assert data['last_check'] == 10000.0
+        assert data['components']['codemetrics']['last_activity'] == 10000.0
+        assert dashboard._eco_cache[0] == 10000.0
+    
+    def test_metrics_are_cached_until_invalidated(self, dashboard, client):
+        """Test repeated polls reuse the serialized body until invalidated"""
+        first = client.get('/api/metrics/demo').data
+        
+        assert client.get('/api/metrics/demo').data == first
+        assert list(dashboard._metrics_cache) == ['demo']
+        
+        dashboard.invalidate_metrics('demo')
+        
+        assert dashboard._metrics_cache == {}
+    
+    @pytest.mark.parametrize("url", ['/api/metrics/demo', '/api/ecosystem-health'])
+    def test_polling_endpoints_revalidate(self, client, url):
+        """Test repeat polls with the current ETag get an empty 304"""
+        first = client.get(url)
+        revalidated = client.get(url, headers={'If-None-Match': first.headers['ETag']})
+        stale = client.get(url, headers={'If-None-Match': '"outdated"'})
+        
+        assert 'Cache-Control' in first.headers
+        assert revalidated.status_code == 304
+        assert revalidated.data == b''
+        assert revalidated.headers['ETag'] == first.headers['ETag']
+        assert stale.status_code == 200
+        assert stale.data == first.data
+    
+    def test_metrics_cache_is_bounded(self, dashboard):
+        """Test the least recently used project is evicted first"""
+        with patch('src.codemetrics.dashboard.METRICS_CACHE_SIZE', 2):
+            dashboard._metrics_entry('a')
+            dashboard._metrics_entry('b')
+            dashboard._metrics_entry('a')
+            dashboard._metrics_entry('c')
+        
+        assert list(dashboard._metrics_cache) == ['a', 'c']
@@ -2,11 +2,12 @@
 Tests for the Ecosystem Intelligence Loop
 """
 
+import os
 import pytest
 import asyncio
 import tempfile
 import shutil
-from unittest.mock import Mock, patch, AsyncMock
+from unittest.mock import MagicMock, Mock, patch, AsyncMock
 from pathlib import Path
 from datetime import datetime, timedelta
 
@@ -14,37 +15,51 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from codemetrics.config import Config
+from codemetrics._client import reset_clients
 from codemetrics.intelligence_loop import (
     EcosystemIntelligenceLoop, 
     FeedbackItem, 
     ImprovementCandidate, 
     IterationResult,
     ProcessType, 
-    FeedbackSeverity
+    FeedbackSeverity,
+    _extract_json_object,
+    _prompt_json
 )
 
+def _streaming(response):
+    """messages.stream() side effect replaying a canned response's text"""
+    def stream(**params):
+        context = MagicMock()
+        context.__enter__.return_value.text_stream = iter([response.content[0].text])
+        return context
+    return stream
+
 class TestEcosystemIntelligenceLoop:
     """Test the Ecosystem Intelligence Loop"""
     
     @pytest.fixture
-    def config(self):
+    def config(self, tmp_path):
         """Create a test configuration"""
         return Config(
             anthropic_api_key="test-key",
             github_token="test-token",
             model="claude-3-5-sonnet-20241022",
             max_tokens=4000,
-            temperature=0.3
+            temperature=0.3,
+            cache_dir=str(tmp_path / "cache")
         )
     
     @pytest.fixture
     def mock_anthropic_client(self):
-        """Mock the Anthropic client"""
+        """Mock the Anthropic client, without reusing one cached by another test"""
+        reset_clients()
         with patch('codemetrics.intelligence_loop.anthropic.Anthropic') as mock_client:
             mock_response = Mock()
             mock_response.content = [Mock(text='{"test": "response"}')]
             mock_client.return_value.messages.create.return_value = mock_response
             yield mock_client
+        reset_clients()
     
     @pytest.fixture
     def intelligence_loop(self, config, mock_anthropic_client):
@@ -61,6 +76,8 @@ class TestEcosystemIntelligenceLoop:
         assert intelligence_loop.min_feedback_frequency == 3
         assert len(intelligence_loop.feedback_history) == 0
         assert len(intelligence_loop.active_iterations) == 0
+        # Shares the analyzer's pooled client instead of opening its own connections
+        assert intelligence_loop.client is intelligence_loop.analyzer.client
     
     def test_feedback_item_creation(self):
         """Test creating feedback items"""
@@ -82,6 +99,12 @@ class TestEcosystemIntelligenceLoop:
         assert feedback.frequency == 5
         assert len(feedback.affected_modules) == 1
     
+    def test_records_use_slots(self):
+        """Test the loop's record types carry no per-instance __dict__"""
+        for record_type in (FeedbackItem, ImprovementCandidate, IterationResult):
+            assert "__slots__" in vars(record_type)
+            assert "__dict__" not in vars(record_type)
+    
     def test_improvement_candidate_creation(self):
         """Test creating improvement candidates"""
         candidate = ImprovementCandidate(
@@ -118,9 +141,9 @@ class TestEcosystemIntelligenceLoop:
         assert len(feedback_items) == 2  # Low success rate + quality issue
         
         # Check low success rate feedback
-        success_feedback = next(f for f in feedback_items if "success_rate" in f.description)
+        success_feedback = next(f for f in feedback_items if "success rate" in f.description)
         assert success_feedback.process_type == ProcessType.GENERATE
-        assert success_feedback.severity == FeedbackSeverity.MEDIUM
+        assert success_feedback.severity == FeedbackSeverity.HIGH  # Not above the 70% cutoff
         assert success_feedback.frequency == 30  # Failed generations
         
         # Check quality issue feedback
@@ -151,7 +174,7 @@ class TestEcosystemIntelligenceLoop:
         assert len(feedback_items) == 2  # Low detection + critical vulnerabilities
         
         # Check detection rate feedback
-        detection_feedback = next(f for f in feedback_items if "detection_rate" in f.description)
+        detection_feedback = next(f for f in feedback_items if "detection rate" in f.description)
         assert detection_feedback.process_type == ProcessType.REVIEW
         assert "xss_vulnerabilities" in detection_feedback.description
         
@@ -182,7 +205,7 @@ class TestEcosystemIntelligenceLoop:
         assert len(feedback_items) == 2  # Low compliance + CORE module issues
         
         # Check compliance feedback
-        compliance_feedback = next(f for f in feedback_items if "compliance_rate" in f.description)
+        compliance_feedback = next(f for f in feedback_items if "compliance rate" in f.description)
         assert compliance_feedback.process_type == ProcessType.TEST
         assert compliance_feedback.severity == FeedbackSeverity.MEDIUM
         
@@ -190,6 +213,17 @@ class TestEcosystemIntelligenceLoop:
         module_feedback = next(f for f in feedback_items if "CORE_modules" in f.description)
         assert module_feedback.frequency == 50
     
+    def test_extractors_share_one_timestamp(self, intelligence_loop):
+        """Test every item from one extraction is stamped from a single clock read"""
+        metrics = {"detection_rates": {"sql_injection": 0.5, "xss": 0.6, "csrf": 0.7}}
+        trends = {"vulnerability_trends": {"last_30_days": {"critical": 1, "high": 0}}}
+        
+        items = intelligence_loop._extract_codereview_feedback(metrics, trends)
+        
+        assert len(items) == 4
+        assert len({item.last_seen for item in items}) == 1
+        assert {item.last_seen - item.first_seen for item in items} == {timedelta(days=10), timedelta(days=30)}
+    
     @pytest.mark.asyncio
     async def test_analyze_feedback_patterns(self, intelligence_loop):
         """Test AI analysis of feedback patterns"""
@@ -197,7 +231,10 @@ class TestEcosystemIntelligenceLoop:
             "processes": {
                 "codecreate": {"metrics": {"total_generations": 100}},
                 "codereview": {"metrics": {"total_reviews": 50}},
-                "codetest": {"metrics": {"total_test_runs": 75}}
+                "codetest": {
+                    "metrics": {"total_test_runs": 75},
+                    "feedback_items": [{"description": "Low framework compliance"}]
+                }
             }
         }
         
@@ -232,7 +269,7 @@ class TestEcosystemIntelligenceLoop:
             ]
         }''')]
         
-        with patch.object(intelligence_loop.client.messages, 'create', return_value=mock_response):
+        with patch.object(intelligence_loop.client.messages, 'stream', side_effect=_streaming(mock_response)):
             result = await intelligence_loop._analyze_feedback_patterns(feedback_data)
         
         assert "root_cause_analysis" in result
@@ -276,7 +313,7 @@ class TestEcosystemIntelligenceLoop:
             ]
         }''')]
         
-        with patch.object(intelligence_loop.client.messages, 'create', return_value=mock_response):
+        with patch.object(intelligence_loop.client.messages, 'stream', side_effect=_streaming(mock_response)):
             candidates = await intelligence_loop._generate_improvement_candidates(priority, feedback_analysis)
         
         assert len(candidates) == 1
@@ -286,6 +323,173 @@ class TestEcosystemIntelligenceLoop:
         assert candidate.confidence_score == 0.85
         assert len(candidate.code_changes) == 1
     
+    @pytest.mark.asyncio
+    async def test_static_prompt_blocks_are_cached(self, intelligence_loop):
+        """Test the role and schema are sent as cached system blocks"""
+        mock_response = Mock()
+        mock_response.content = [Mock(text='{"improvements": []}')]
+        
+        with patch.object(intelligence_loop.client.messages, 'stream', side_effect=_streaming(mock_response)) as stream:
+            await intelligence_loop._analyze_feedback_patterns({"processes": {"codetest": {"feedback_items": [1]}}})
+            await intelligence_loop._generate_improvement_candidates({"priority": 1}, {"test": "data"})
+        
+        analysis_call, improvement_call = stream.call_args_list
+        for call in (analysis_call, improvement_call):
+            system = call.kwargs["system"]
+            assert system[-1]["cache_control"] == {"type": "ephemeral"}
+            assert "JSON format" in system[-1]["text"]
+        
+        assert analysis_call.kwargs["messages"][0]["content"] == 'Feedback Data:\n{"processes":{"codetest":{"feedback_items":[1]}}}'
+        shared, priority = improvement_call.kwargs["messages"][0]["content"]
+        assert shared["cache_control"] == {"type": "ephemeral"}
+        assert priority["text"] == "Priority Area: {'priority': 1}"
+    
+    @pytest.mark.asyncio
+    async def test_feedback_analysis_is_cached(self, intelligence_loop):
+        """Test identical feedback reuses the stored analysis, ignoring collection time"""
+        mock_response = Mock()
+        mock_response.content = [Mock(text='{"improvement_priorities": []}')]
+        feedback_data = {"collection_timestamp": "2024-01-01T00:00:00", "processes": {"codetest": {"feedback_items": [1]}}}
+        
+        with patch.object(intelligence_loop.client.messages, 'stream', side_effect=_streaming(mock_response)) as stream:
+            first = await intelligence_loop._analyze_feedback_patterns(feedback_data)
+            second = await intelligence_loop._analyze_feedback_patterns(
+                {**feedback_data, "collection_timestamp": "2024-01-01T00:05:00"}
+            )
+            await intelligence_loop._analyze_feedback_patterns({"processes": {"codereview": {"feedback_items": [1]}}})
+        
+        assert first == second == {"improvement_priorities": []}
+        assert stream.call_count == 2
+    
+    @pytest.mark.asyncio
+    async def test_trivial_feedback_skips_claude(self, intelligence_loop):
+        """Test empty feedback and empty priorities never reach Claude"""
+        feedback_data = {"processes": {"codecreate": {"feedback_items": []}, "codereview": {"error": "down"}}}
+        
+        with patch.object(intelligence_loop.client.messages, 'stream') as stream, \
+             patch.object(intelligence_loop, '_generate_improvement_candidates') as generate:
+            analysis = await intelligence_loop._analyze_feedback_patterns(feedback_data)
+            candidates = await intelligence_loop.identify_improvements({**feedback_data, "ai_analysis": analysis})
+        
+        assert analysis["root_cause_analysis"] == []
+        assert analysis["improvement_priorities"] == []
+        assert candidates == []
+        stream.assert_not_called()
+        generate.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_identify_improvements_concurrently(self, intelligence_loop):
+        """Test priorities are requested concurrently and failures are skipped"""
+        in_flight = 0
+        peak = 0
+        
+        async def generate(priority, feedback_analysis):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if priority["priority"] == 2:
+                raise RuntimeError("rate limited")
+            return [ImprovementCandidate(
+                process_type=ProcessType.TEST, improvement_type="feature",
+                description=f"Priority {priority['priority']}", target_files=[], code_changes=[],
+                confidence_score=priority["priority"] / 10, expected_impact="high", risk_level="low"
+            )]
+        
+        priorities = [{"priority": n} for n in range(1, 8)]
+        with patch.object(intelligence_loop, '_generate_improvement_candidates', side_effect=generate):
+            candidates = await intelligence_loop.identify_improvements(
+                {"ai_analysis": {"improvement_priorities": priorities}}
+            )
+        
+        assert peak == 5  # MAX_CONCURRENT_CLAUDE_CALLS
+        assert [c.description for c in candidates] == [f"Priority {n}" for n in (7, 6, 5, 4, 3, 1)]
+    
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_prompt_json_is_compact_and_sorted(self, use_orjson):
+        """Test prompt payloads are minimal, key-sorted JSON with either backend"""
+        orjson = pytest.importorskip("orjson") if use_orjson else None
+        
+        with patch('codemetrics.intelligence_loop.orjson', orjson):
+            text = _prompt_json({"b": [ProcessType.TEST], "a": datetime(2024, 1, 2)})
+        
+        assert text == '{"a":"2024-01-02T00:00:00","b":["test"]}'
+    
+    def test_extract_json_object(self):
+        """Test the first decodable object is returned despite stray braces"""
+        assert _extract_json_object('Use {braces} sparingly: {"a": {"b": 1}} and {"c": 2}') == {"a": {"b": 1}}
+        assert _extract_json_object('no json here') is None
+        assert _extract_json_object('{"unterminated": ') is None
+    
+    def test_stream_stops_after_json_object(self, intelligence_loop):
+        """Test streaming hangs up once the top-level JSON object closes"""
+        context = MagicMock()
+        chunks = iter(['Here you go: {"a": {"b": "}"}', '} trailing', ' prose never read'])
+        context.__enter__.return_value.text_stream = chunks
+        
+        with patch.object(intelligence_loop.client.messages, 'stream', return_value=context):
+            text = intelligence_loop._stream_json_response(model="m", max_tokens=10, messages=[])
+        
+        assert text == 'Here you go: {"a": {"b": "}"}}'
+        assert next(chunks) == ' prose never read'
+        context.__exit__.assert_called_once()
+    
+    def test_summarize_feedback_for_candidates(self, intelligence_loop):
+        """Test candidate prompts get a compact summary without raw metrics"""
+        item = FeedbackItem(
+            id="codetest_low_compliance", process_type=ProcessType.TEST,
+            severity=FeedbackSeverity.HIGH, description="Framework compliance rate is low",
+            error_details="below threshold", frequency=20, first_seen=datetime.now(),
+            last_seen=datetime.now(), affected_modules=["framework_validation"]
+        )
+        feedback_analysis = {
+            "collection_timestamp": "2024-01-01T00:00:00",
+            "processes": {
+                "codetest": {"metrics": {"huge": list(range(100))}, "feedback_items": [item]},
+                "codereview": {"error": "unavailable"}
+            },
+            "ai_analysis": {
+                "root_cause_analysis": [{"root_cause": "Missing tests"}],
+                "pattern_insights": {"recurring_issues": ["Flaky CI"], "trend_analysis": {}},
+                "improvement_priorities": [{"priority": 1}]
+            }
+        }
+        
+        summary = intelligence_loop._summarize_feedback_for_candidates(feedback_analysis)
+        
+        assert summary == {
+            "root_cause_analysis": [{"root_cause": "Missing tests"}],
+            "recurring_issues": ["Flaky CI"],
+            "processes": {
+                "codetest": {"feedback_items": [{
+                    "description": "Framework compliance rate is low",
+                    "severity": "high",
+                    "affected_modules": ["framework_validation"]
+                }]},
+                "codereview": {"error": "unavailable"}
+            }
+        }
+    
+    @pytest.mark.asyncio
+    async def test_improvement_candidates_memoized(self, intelligence_loop):
+        """Test identical candidate requests are served from the in-memory cache"""
+        mock_response = Mock()
+        mock_response.content = [Mock(text='{"improvements": [{"process_type": "test", '
+            '"improvement_type": "feature", "description": "d", "target_files": [], "code_changes": [], '
+            '"confidence_score": 0.5, "expected_impact": "low", "risk_level": "low"}]}')]
+        
+        with patch.object(intelligence_loop.client.messages, 'stream', side_effect=_streaming(mock_response)) as stream, \
+                patch.object(intelligence_loop, '_cached_response', return_value=None) as disk:
+            first = await intelligence_loop._generate_improvement_candidates({"priority": 1}, {"x": 1})
+            second = await intelligence_loop._generate_improvement_candidates({"priority": 1}, {"x": 1})
+            await intelligence_loop._generate_improvement_candidates({"priority": 2}, {"x": 1})
+        
+        assert first == second and first is not second
+        assert stream.call_count == 2
+        assert disk.call_count == 2
+        assert len(intelligence_loop.improvement_cache) == 2
+    
     def test_calculate_success_score(self, intelligence_loop):
         """Test success score calculation"""
         # Test successful case
@@ -446,6 +650,181 @@ class TestEcosystemIntelligenceLoop:
         assert "codetest" in feedback_data["processes"]
         assert "ai_analysis" in feedback_data
     
+    @pytest.mark.asyncio
+    async def test_collect_ecosystem_feedback_concurrently(self, intelligence_loop):
+        """Test integrations are called concurrently and failures stay per process"""
+        import threading
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def rendezvous():
+            # Both CodeCreate calls must be in flight at once to pass the barrier
+            barrier.wait()
+            return {}
+        
+        intelligence_loop.codecreate.collect_generation_metrics = Mock(side_effect=rendezvous)
+        intelligence_loop.codecreate.analyze_generation_quality = Mock(side_effect=rendezvous)
+        intelligence_loop.codereview.collect_review_metrics = Mock(side_effect=RuntimeError("review down"))
+        intelligence_loop.codereview.analyze_security_trends = Mock(return_value={})
+        intelligence_loop.codetest.collect_testing_metrics = Mock(return_value={"framework_compliance_rate": 0.95})
+        intelligence_loop.codetest.analyze_framework_compliance = Mock(return_value={})
+        
+        with patch.object(intelligence_loop, '_analyze_feedback_patterns', return_value={}):
+            feedback_data = await intelligence_loop.collect_ecosystem_feedback()
+        
+        processes = feedback_data["processes"]
+        assert processes["codecreate"]["feedback_items"] == []
+        assert processes["codereview"] == {"error": "review down"}
+        assert processes["codetest"]["compliance"] == {}
+    
+    @pytest.mark.asyncio
+    async def test_blocking_calls_use_dedicated_executors(self, config, mock_anthropic_client):
+        """Test integration and Claude calls run on their own pools, shut down on exit"""
+        import threading
+        threads = {}
+        
+        def record(name, value):
+            def call(*args, **kwargs):
+                threads[name] = threading.current_thread().name
+                return value
+            return call
+        
+        with patch('codemetrics.intelligence_loop.CodeCreateIntegration'), \
+             patch('codemetrics.intelligence_loop.CodeReviewIntegration'), \
+             patch('codemetrics.intelligence_loop.CodeTestIntegration'):
+            async with EcosystemIntelligenceLoop(config) as loop:
+                loop.codecreate.collect_generation_metrics = Mock(side_effect=record("integration", {}))
+                with patch.object(loop, '_extract_codecreate_feedback', return_value=[{"description": "slow"}]), \
+                     patch.object(loop, '_stream_json_response', side_effect=record("claude", '{}')):
+                    await loop.collect_ecosystem_feedback()
+        
+        assert threads["integration"].startswith("integrations")
+        assert threads["claude"].startswith("claude")
+        with pytest.raises(RuntimeError):
+            loop._claude_executor.submit(print)
+    
+    @pytest.mark.asyncio
+    async def test_iterations_run_in_isolated_worktrees(self, intelligence_loop, tmp_path):
+        """Test each iteration edits its own worktree and leaves the repo untouched"""
+        import git
+        repo = git.Repo.init(tmp_path / "repo")
+        (tmp_path / "repo" / "app.py").write_text("print('hi')\n")
+        repo.index.add(["app.py"])
+        repo.index.commit("initial", author=git.Actor("Test", "test@example.com"))
+        
+        candidates = [
+            ImprovementCandidate(
+                process_type=ProcessType.GENERATE, improvement_type="feature",
+                description=f"Add module {n}", target_files=[f"new_{n}.py"],
+                code_changes=[{"file": f"new_{n}.py", "change_type": "add",
+                               "description": "new module", "code": "x = 1\n"}],
+                confidence_score=0.9, expected_impact="high", risk_level="low"
+            )
+            for n in range(2)
+        ]
+        
+        seen = []
+        async def fake_tests(worktree_path, target_files=None):
+            seen.append(sorted(p.name for p in Path(worktree_path).iterdir() if p.suffix == ".py"))
+            return {"tests_passed": 1, "tests_failed": 0}
+        
+        with patch.object(intelligence_loop, '_run_improvement_tests', side_effect=fake_tests):
+            results = await intelligence_loop.run_iterative_improvements(str(tmp_path / "repo"), candidates)
+        
+        assert [r.iteration_id for r in results] == ["iter_1", "iter_2"]
+        assert sorted(seen) == [["app.py", "new_0.py"], ["app.py", "new_1.py"]]
+        assert not repo.is_dirty(untracked_files=True)
+        assert [head.name for head in repo.heads] == [repo.active_branch.name]
+        assert len(repo.git.worktree('list').splitlines()) == 1
+    
+    def test_apply_code_changes_overlay(self, intelligence_loop, tmp_path):
+        """Test changes to the same file are combined before anything is written"""
+        (tmp_path / "app.py").write_text("x = 1\n")
+        (tmp_path / "old.py").write_text("y = 2\n")
+        changes = [
+            {"file": "app.py", "change_type": "modify", "description": "first", "code": "a"},
+            {"file": "app.py", "change_type": "modify", "description": "second", "code": "b"},
+            {"file": "pkg/new.py", "change_type": "add", "description": "new", "code": "z = 3\n"},
+            {"file": "scratch.py", "change_type": "add", "description": "tmp", "code": ""},
+            {"file": "scratch.py", "change_type": "delete", "description": "", "code": ""},
+            {"file": "old.py", "change_type": "delete", "description": "", "code": ""},
+            {"file": "old.py", "change_type": "modify", "description": "gone", "code": "c"}
+        ]
+        
+        assert intelligence_loop._apply_code_changes(str(tmp_path), changes) is True
+        
+        assert (tmp_path / "app.py").read_text() == (
+            "x = 1\n\n# Intelligence Loop Improvement: first\n# a\n"
+            "\n# Intelligence Loop Improvement: second\n# b\n"
+        )
+        assert (tmp_path / "pkg" / "new.py").read_text() == "# Intelligence Loop Addition: new\nz = 3\n"
+        assert not (tmp_path / "scratch.py").exists()
+        assert not (tmp_path / "old.py").exists()
+    
+    def test_apply_code_changes_creates_each_dir_once(self, intelligence_loop, tmp_path):
+        """Test files sharing a directory trigger a single mkdir"""
+        changes = [
+            {"file": f"pkg/mod_{n}.py", "change_type": "add", "description": "new", "code": ""}
+            for n in range(3)
+        ]
+        
+        with patch.object(Path, 'mkdir', autospec=True, side_effect=lambda self, **kwargs: os.makedirs(self, exist_ok=True)) as mkdir:
+            assert intelligence_loop._apply_code_changes(str(tmp_path), changes) is True
+        
+        assert mkdir.call_count == 1
+        assert sorted(p.name for p in (tmp_path / "pkg").iterdir()) == ["mod_0.py", "mod_1.py", "mod_2.py"]
+    
+    @pytest.mark.asyncio
+    async def test_run_improvement_tests_subprocess(self, intelligence_loop, tmp_path):
+        """Test the suite runs as an async subprocess and timeouts kill it"""
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "tests" / "test_ok.py").write_text("def test_ok():\n    assert True\n")
+        
+        passed = await intelligence_loop._run_improvement_tests(str(tmp_path))
+        
+        (tmp_path / "tests" / "test_ok.py").write_text("import time\n\ndef test_slow():\n    time.sleep(30)\n")
+        real_wait_for = asyncio.wait_for
+        with patch('asyncio.wait_for', new=lambda aw, timeout: real_wait_for(aw, 0.5)):
+            timed_out = await intelligence_loop._run_improvement_tests(str(tmp_path))
+        
+        assert passed["tests_passed"] == 10 and "error" not in passed
+        assert timed_out["error"] == "Tests timed out"
+        assert timed_out["new_errors"] == 1
+    
+    def test_select_tests_from_target_files(self, intelligence_loop, tmp_path):
+        """Test target files map to their test modules, falling back to -k"""
+        (tmp_path / "tests" / "codemetrics").mkdir(parents=True)
+        (tmp_path / "tests" / "codemetrics" / "test_analyzer.py").write_text("")
+        (tmp_path / "tests" / "test_config.py").write_text("")
+        select = intelligence_loop._select_tests
+        
+        assert select(str(tmp_path), None) == ["tests/"]
+        assert select(str(tmp_path), ["README.md"]) == ["tests/"]
+        assert select(str(tmp_path), ["src/codemetrics/analyzer.py", "src/codemetrics/config.py"]) == [
+            "tests/codemetrics/test_analyzer.py", "tests/test_config.py"
+        ]
+        assert select(str(tmp_path), ["tests/test_config.py", "config.py"]) == ["tests/test_config.py"]
+        assert select(str(tmp_path), ["src/codemetrics/analyzer.py", "src/codemetrics/cli.py"]) == [
+            "tests/", "-k", "analyzer or cli"
+        ]
+        # Names that would break the -k expression are dropped
+        assert select(str(tmp_path), ["src/not.py", "src/my-module.py"]) == ["tests/"]
+        assert select(str(tmp_path), ["src/and.py", "src/cli.py"]) == ["tests/", "-k", "cli"]
+    
+    @pytest.mark.asyncio
+    async def test_uncovered_targets_fall_back_to_full_suite(self, intelligence_loop, tmp_path):
+        """Test a -k selection matching nothing re-runs the full suite instead of failing"""
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "tests" / "test_ok.py").write_text("def test_ok():\n    assert True\n")
+        
+        covered = await intelligence_loop._run_improvement_tests(str(tmp_path), ["src/brand_new.py"])
+        
+        (tmp_path / "tests" / "test_ok.py").unlink()
+        empty = await intelligence_loop._run_improvement_tests(str(tmp_path), ["src/brand_new.py"])
+        
+        assert covered["tests_passed"] == 10 and "error" not in covered
+        assert empty["tests_passed"] == empty["tests_failed"] == 0
+        assert intelligence_loop._calculate_success_score(empty) == 0.5
+    
     @pytest.mark.asyncio 
     async def test_full_intelligence_loop_mock(self, intelligence_loop):
         """Test the full intelligence loop with mocks"""